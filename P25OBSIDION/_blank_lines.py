@@ -44,9 +44,11 @@ def main():
     for pfad in glob.glob(os.path.join(skript_dir, '*.md')):
         with open(pfad, 'r', encoding='utf-8') as f:
             lines = f.readlines()
-        neu = format_md(lines)
+        neu = '\n'.join(format_md(lines))
+        if neu == ''.join(lines):
+            continue  # bereits formatiert
         with open(pfad, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(neu))
+            f.write(neu)
         print(f"{os.path.basename(pfad)} formatiert")
 
 if __name__ == '__main__':
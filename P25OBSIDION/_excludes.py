@@ -0,0 +1,12 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+_excludes.py – Gemeinsame Ordner-Ausschlüsse der P25OBSIDION-Skripte.
+
+COMMON_EXCLUDE_DIRS sind Werkzeug- und Systemordner, die kein Skript betritt. Eigene
+Ausschlüsse ergänzt jedes Skript in seinen Einstellungen:
+
+    EXCLUDE_DIRS = {"Wiki", *COMMON_EXCLUDE_DIRS}
+"""
+
+COMMON_EXCLUDE_DIRS = frozenset({".git", ".obsidian", ".archive", "__pycache__", "node_modules"})
@@ -9,8 +9,11 @@ Funktion:
 2. Ignoriert Ordner, deren Namen in EXCLUDE_DIRS stehen.
 3. Legt pro Ordner eine MD-Datei <PfadSegmenteOhneTrenner>.md an
    (z. B. IUFSSE1BWL01Lektion1.md).
-4. Überschreibt vorhandene MD-Dateien gleichen Namens.
-5. Entfernt sonstige *.md im selben Ordner (manuell umbenannte Reste).
+4. Überschreibt vorhandene MD-Dateien gleichen Namens – aber nur, wenn sich der
+   erzeugte Inhalt vom Stand auf der Platte unterscheidet.
+5. Entfernt sonstige *.md im selben Ordner (manuell umbenannte Reste); die
+   Löschungen werden gesammelt und am Ende in einem Schritt ausgeführt
+   (--dry-run zeigt sie nur an).
 6. Front-Matter enthält:
    - Projekt   = erstes Segment
    - Semester  = zweites Segment (falls vorhanden)
@@ -19,19 +22,34 @@ Funktion:
    - link1     = Referenz auf den aktuellen Ordner
 7. Anhängt anschließend Em­beds (![[…]]) aller Nicht-MD-Dateien im Ordner.
 
+Ordner werden während des Durchlaufs an einen Thread-Pool gereicht (WORKERS, höchstens
+2×WORKERS Ordner gleichzeitig offen). Eine vorhandene Ordner-MD wird nur gelesen, wenn
+der billige Fingerprint nicht passt: Sie gilt als aktuell, wenn sie nach der letzten
+Änderung der Ordnerliste geschrieben wurde (mtime der MD > mtime des Ordners) und die
+erwartete Größe hat. Ein erneuter Lauf auf einem unveränderten Baum kostet damit nur
+Verzeichnis-Scan und stat.
+
 Anpassbar über die Konstanten unten.
 """
 from __future__ import annotations
 
+import argparse
 import os
-from typing import List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from _excludes import COMMON_EXCLUDE_DIRS
 
 # --------------------------------------------------------------------------- #
 # Einstellungen                                                               #
 # --------------------------------------------------------------------------- #
-EXCLUDE_DIRS: set[str] = {"Wiki", ".git", "__pycache__"}  # auszuschließende Ordner
+EXCLUDE_DIRS: set[str] = {"Wiki", *COMMON_EXCLUDE_DIRS}  # auszuschließende Ordner (+ _excludes.py)
 DELETE_OLD_MD: bool = True        # veraltete/umbenannte *.md löschen?
 EMBED_EXTENSIONS: tuple[str, ...] = ()  # leer = alle Dateien einbetten
+WORKERS: int = 4                  # parallele Ordner (1 = seriell)
+VERBOSE_DELETE: bool = False      # jede gelöschte Datei einzeln ausgeben?
 
 # --------------------------------------------------------------------------- #
 # Hilfsfunktionen                                                             #
@@ -72,43 +90,193 @@ def _embed_lines(files: List[str]) -> str:
     return "\n".join(embeds) + ("\n" if embeds else "")
 
 
-# --------------------------------------------------------------------------- #
-# Hauptlogik                                                                  #
-# --------------------------------------------------------------------------- #
-def main() -> None:
-    base_dir = os.getcwd()
+def render(parts: List[str], rel_path: str, files: List[str]) -> str:
+    """Kompletter Soll-Inhalt der Ordner-MD (Front-Matter + Embeds)."""
+    return _front_matter(parts, rel_path) + _embed_lines(files)
+
+
+def _needs_write(md_path: str, content: str, dir_mtime_ns: Optional[int] = None) -> Optional[str]:
+    """
+    None = identisch; sonst "neu" oder "aktualisiert". Erst der Fingerprint (Größe, mtime
+    gegenüber dir_mtime_ns = mtime des Ordners), gelesen wird nur, wenn er nicht passt.
+    """
+    data = content.encode("utf-8")
+    try:
+        st = os.stat(md_path)
+        if st.st_size != len(data):
+            return "aktualisiert"
+        if dir_mtime_ns is not None and st.st_mtime_ns > dir_mtime_ns:
+            return None  # nach der letzten Änderung der Ordnerliste geschrieben
+        with open(md_path, "rb") as f:
+            return None if f.read() == data else "aktualisiert"
+    except FileNotFoundError:
+        return "neu"
+
+
+@dataclass
+class DirResult:
+    md_path: str
+    action: Optional[str]            # None = unverändert, sonst "neu"/"aktualisiert"
+    stale: List[str] = field(default_factory=list)
 
+
+def process_dir(root: str, files: List[str], base_dir: str, dry_run: bool = False) -> DirResult:
+    """Rendert die MD eines Ordners, schreibt nur bei Abweichung, sammelt Lösch-Kandidaten."""
+    rel_path = os.path.relpath(root, base_dir)
+    parts = rel_path.split(os.sep)
+    md_name = _md_filename(parts)
+    md_path = os.path.join(root, md_name)
+
+    content = render(parts, rel_path, files)
+    try:
+        dir_mtime_ns: Optional[int] = os.stat(root).st_mtime_ns
+    except OSError:
+        dir_mtime_ns = None
+    action = _needs_write(md_path, content, dir_mtime_ns)
+    if action and not dry_run:
+        with open(md_path, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+
+    stale = []
+    if DELETE_OLD_MD:
+        stale = [os.path.join(root, f) for f in sorted(files)
+                 if f.lower().endswith(".md") and f != md_name]
+    return DirResult(md_path, action, stale)
+
+
+def iter_dirs(base_dir: str):
+    """(Ordner, Dateien) aller Unterordner außer dem Startordner selbst."""
     for root, dirs, files in os.walk(base_dir):
         # Unterordner, die nicht weiter untersucht werden sollen, aussortieren
         dirs[:] = [d for d in dirs if d not in EXCLUDE_DIRS]
+        if root != base_dir:  # für das Start­verzeichnis selbst keine MD erzeugen
+            yield root, files
 
-        rel_path = os.path.relpath(root, base_dir)
-        if rel_path == ".":
-            continue  # für das Start­verzeichnis selbst keine MD erzeugen
 
-        parts = rel_path.split(os.sep)
-        md_name = _md_filename(parts)
-        md_path = os.path.join(root, md_name)
+def delete_batch(paths: List[str], dry_run: bool) -> Tuple[int, int]:
+    """Löscht gesammelte Dateien in einem Schritt; liefert (gelöscht, Fehler)."""
+    if dry_run:
+        for p in paths:
+            print(f"würde löschen: {p}")
+        return len(paths), 0
+    deleted = errors = 0
+    for p in paths:
+        try:
+            os.remove(p)
+        except OSError as err:
+            errors += 1
+            print(f"WARN: {err}")
+            continue
+        deleted += 1
+        if VERBOSE_DELETE:
+            print(f"gelöscht:     {p}")
+    return deleted, errors
 
-        # Front-Matter + Embeds erzeugen
-        content = _front_matter(parts, rel_path) + _embed_lines(files)
 
-        # Datei (über-)schreiben
-        with open(md_path, "w", encoding="utf-8") as f:
-            f.write(content)
-        print(f"aktualisiert: {md_path}")
-
-        # Veraltete MD-Dateien löschen
-        if DELETE_OLD_MD:
-            for fname in files:
-                if fname.lower().endswith(".md") and fname != md_name:
-                    try:
-                        os.remove(os.path.join(root, fname))
-                        print(f"gelöscht:     {os.path.join(root, fname)}")
-                    except OSError as err:
-                        print(f"WARN: {err}")
-
-    print("MD-Generierung abgeschlossen.")
+def print_summary(counts: Dict[str, int], dry_run: bool) -> None:
+    """Abschlusszeile aus den Zählern (neu/aktualisiert/unverändert/gelöscht/Fehler)."""
+    done = "Trockenlauf abgeschlossen" if dry_run else "MD-Generierung abgeschlossen"
+    print(f"{done}. neu: {counts['neu']}, aktualisiert: {counts['aktualisiert']}, "
+          f"unverändert: {counts['unverändert']}, gelöscht: {counts['gelöscht']}"
+          + (f", Fehler: {counts['Fehler']}" if counts["Fehler"] else "") + ".")
+
+
+def new_counts() -> Dict[str, int]:
+    return {"neu": 0, "aktualisiert": 0, "unverändert": 0, "gelöscht": 0, "Fehler": 0}
+
+
+def _pooled(run: Callable[[Tuple[str, List[str]]], DirResult],
+            items: Iterable[Tuple[str, List[str]]], workers: int) -> Iterator[DirResult]:
+    """run je Element im Pool, Ergebnisse in Eingabereihenfolge; höchstens 2×workers offen."""
+    if workers <= 1:
+        yield from map(run, items)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        pending: Deque = deque()
+        for item in items:
+            pending.append(ex.submit(run, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def process_dirs(dirs: Iterable[Tuple[str, List[str]]], base_dir: str, dry_run: bool = False,
+                 workers: int = WORKERS, totals: Optional[Dict[str, int]] = None,
+                 keep_results: bool = True) -> List[DirResult]:
+    """
+    Verarbeitet (Ordner, Dateien)-Paare im Pool, gibt Aktionen aus und löscht gesammelt.
+    dirs darf ein Generator sein (z. B. iter_dirs); er wird während der Verarbeitung gelesen.
+    totals: Zähler über mehrere Aufrufe hinweg fortschreiben, statt am Ende die
+    Abschlusszeile auszugeben (dann print_summary(totals, ...) selbst aufrufen).
+    keep_results=False: keine DirResults sammeln (Rückgabe leer, Speicher unabhängig
+    von der Zahl der Ordner).
+    """
+    def run(item: Tuple[str, List[str]]) -> DirResult:
+        return process_dir(item[0], item[1], base_dir, dry_run)
+
+    counts = new_counts() if totals is None else totals
+    results: List[DirResult] = []
+    stale: List[str] = []
+    prefix = "würde " if dry_run else ""
+    for res in _pooled(run, dirs, workers):  # Ausgabe in Traversierungsreihenfolge
+        counts[res.action or "unverändert"] += 1
+        if res.action:
+            print(f"{prefix}{res.action}: {res.md_path}")
+        stale.extend(res.stale)
+        if keep_results:
+            results.append(res)
+
+    deleted, errors = delete_batch(stale, dry_run)
+    counts["gelöscht"] += deleted
+    counts["Fehler"] += errors
+    if totals is None:
+        print_summary(counts, dry_run)
+    return results
+
+
+_hook_totals: Dict[str, int] = new_counts()
+
+
+def rename_data_hook(listing, base_dir: str, dry_run: bool = False) -> None:
+    """
+    In-Process-Hook für _rename_data.py: nutzt dessen bereits gelesene Ordnerliste
+    (Einträge mit .root, .rel_parts, .files) statt eines eigenen os.walk und führt
+    die Dateilisten nach (neue Ordner-MD rein, gelöschte Reste raus). Die Ordner-MD
+    steht zusätzlich in .generated, damit _rename_data sie nicht umbenennt.
+    _rename_data ruft den Hook blockweise auf; die Abschlusszeile kommt erst mit
+    rename_data_finish().
+    """
+    entries = [e for e in listing
+               if e.rel_parts and not any(p in EXCLUDE_DIRS for p in e.rel_parts)]
+    results = process_dirs([(e.root, list(e.files)) for e in entries], base_dir,
+                           dry_run, totals=_hook_totals)
+    for entry, res in zip(entries, results):
+        md_name = os.path.basename(res.md_path)
+        gone = {os.path.basename(p) for p in res.stale if dry_run or not os.path.exists(p)}
+        entry.files[:] = [f for f in entry.files if f not in gone]
+        if md_name not in entry.files:
+            entry.files.append(md_name)
+        entry.generated.add(md_name)
+
+
+def rename_data_finish(base_dir: str, dry_run: bool = False) -> None:
+    """Nach dem letzten Block: Abschlusszeile über alle Blöcke, Zähler zurücksetzen."""
+    print_summary(_hook_totals, dry_run)
+    _hook_totals.update(new_counts())
+
+
+# --------------------------------------------------------------------------- #
+# Hauptlogik                                                                  #
+# --------------------------------------------------------------------------- #
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Ordner-MD-Dateien erzeugen/aktualisieren und Reste aufräumen.")
+    parser.add_argument("--dry-run", action="store_true", help="Nur anzeigen, nichts schreiben/löschen.")
+    parser.add_argument("--workers", type=int, default=WORKERS, help=f"Parallele Ordner (Default: {WORKERS}).")
+    args = parser.parse_args(argv)
+
+    base_dir = os.getcwd()
+    process_dirs(iter_dirs(base_dir), base_dir, args.dry_run, args.workers, keep_results=False)
 
 
 if __name__ == "__main__":
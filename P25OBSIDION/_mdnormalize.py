@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+_mdnormalize.py – Ein Durchlauf für mehrere Markdown-Normalisierungen.
+
+Statt dass _remove_quotes.py, _mdwiki.py und _blank_lines.py jede Notiz einzeln
+öffnen und neu schreiben, wird jede Datei hier genau einmal gelesen, alle gewählten
+Regeln werden nacheinander auf den Inhalt angewandt und geschrieben wird nur, wenn
+sich etwas geändert hat.
+
+Regeln (Reihenfolge fest, Auswahl per --rules):
+- quotes : "123" → 123 (wie _remove_quotes.py)
+- wiki   : Datum/SETTINGS im Front-Matter setzen, nur in Ordnern namens 'wiki' (wie _mdwiki.py)
+- blank  : Leerzeilen um Überschriften/Trenner/Tabellen normalisieren (wie _blank_lines.py,
+           aber nur im Text nach dem Front-Matter – die YAML-Trenner bleiben unangetastet)
+
+Rekursiv ab dem Ausführungsordner mit EXCLUDE_DIRS; Dateien werden im Thread-Pool
+verarbeitet, die Ausgabe bleibt in Traversierungsreihenfolge.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from _blank_lines import format_md
+from _excludes import COMMON_EXCLUDE_DIRS
+from _mdwiki import get_creation_date, in_wiki, update_frontmatter
+from _remove_quotes import remove_quotes
+
+# --------------------------------------------------------------------------- #
+# Einstellungen                                                               #
+# --------------------------------------------------------------------------- #
+EXCLUDE_DIRS: set[str] = set(COMMON_EXCLUDE_DIRS)  # gemeinsame Ausschlüsse (_excludes.py)
+DEFAULT_RULES: List[str] = ["quotes", "wiki", "blank"]
+WORKERS: int = 4
+
+
+@dataclass
+class Note:
+    path: Path
+    rel_parts: List[str]  # Ordnerteile relativ zum Startordner
+
+
+@dataclass
+class Rule:
+    name: str
+    apply: Callable[[str, Note], str]
+    applies_to: Callable[[Note], bool] = lambda note: True
+    body_only: bool = False  # nur auf den Text nach dem Front-Matter anwenden
+
+
+def split_frontmatter(text: str) -> Tuple[str, str]:
+    """(Front-Matter inkl. beider '---'-Zeilen, Rest); ohne Front-Matter ("", text)."""
+    lines = text.splitlines(keepends=True)
+    if not lines or lines[0].strip() != "---":
+        return "", text
+    for i in range(1, len(lines)):
+        if lines[i].strip() == "---":
+            head = "".join(lines[:i + 1])
+            return head, text[len(head):]
+    return "", text
+
+
+def _rule_wiki(text: str, note: Note) -> str:
+    lines = text.splitlines(keepends=True)
+    new_lines = update_frontmatter(lines, get_creation_date(note.path))
+    return text if new_lines is lines else "".join(new_lines)
+
+
+def _rule_blank(text: str, note: Note) -> str:
+    return "\n".join(format_md(text.splitlines(keepends=True)))
+
+
+RULES: List[Rule] = [
+    Rule("quotes", lambda text, note: remove_quotes(text)),
+    Rule("wiki", _rule_wiki, lambda note: in_wiki(note.rel_parts)),
+    Rule("blank", _rule_blank, body_only=True),
+]
+
+
+def select_rules(names: List[str]) -> List[Rule]:
+    unknown = set(names) - {r.name for r in RULES}
+    if unknown:
+        raise SystemExit(f"Unbekannte Regel(n): {', '.join(sorted(unknown))}")
+    return [r for r in RULES if r.name in names]
+
+
+def normalize(text: str, note: Note, rules: List[Rule]) -> Tuple[str, List[str]]:
+    """Wendet alle passenden Regeln an; liefert (neuer Text, Namen der wirksamen Regeln)."""
+    applied = []
+    for rule in rules:
+        if not rule.applies_to(note):
+            continue
+        if rule.body_only:
+            head, body = split_frontmatter(text)
+            new_body = rule.apply(body, note)
+            new_text = head + new_body if new_body != body else text
+        else:
+            new_text = rule.apply(text, note)
+        if new_text != text:
+            applied.append(rule.name)
+            text = new_text
+    return text, applied
+
+
+def process_note(note: Note, rules: List[Rule], dry_run: bool = False) -> Optional[List[str]]:
+    """Liest die Notiz einmal, schreibt nur bei Änderung; liefert die wirksamen Regeln oder None."""
+    try:
+        text = note.path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError) as err:
+        print(f"WARN: {note.path}: {err}")
+        return None
+    new_text, applied = normalize(text, note, rules)
+    if new_text == text:
+        return None
+    if not dry_run:
+        note.path.write_text(new_text, encoding="utf-8")
+    return applied
+
+
+def iter_notes(base_dir: Path):
+    for root, dirs, files in os.walk(base_dir):
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDE_DIRS)
+        rel_parts = list(Path(root).relative_to(base_dir).parts)
+        for fname in sorted(files):
+            if fname.lower().endswith(".md"):
+                yield Note(Path(root) / fname, rel_parts)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Markdown-Normalisierungen in einem Durchlauf anwenden.")
+    parser.add_argument("--rules", default=",".join(DEFAULT_RULES),
+                        help=f"Komma-getrennte Regeln aus {', '.join(r.name for r in RULES)} "
+                             f"(Default: {','.join(DEFAULT_RULES)}).")
+    parser.add_argument("--dry-run", action="store_true", help="Nur anzeigen, nichts schreiben.")
+    parser.add_argument("--workers", type=int, default=WORKERS, help=f"Parallele Dateien (Default: {WORKERS}).")
+    args = parser.parse_args(argv)
+
+    rules = select_rules([n.strip() for n in args.rules.split(",") if n.strip()])
+    notes = list(iter_notes(Path.cwd()))
+
+    def run(note: Note) -> Optional[List[str]]:
+        return process_note(note, rules, args.dry_run)
+
+    if args.workers > 1:
+        with ThreadPoolExecutor(max_workers=args.workers) as ex:
+            results = list(ex.map(run, notes))
+    else:
+        results = [run(n) for n in notes]
+
+    changed = 0
+    for note, applied in zip(notes, results):
+        if applied:
+            changed += 1
+            print(f"{'würde ändern' if args.dry_run else 'geändert'} [{','.join(applied)}]: {note.path}")
+    print(f"Normalisierung abgeschlossen. Dateien: {len(notes)}, geändert: {changed}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List
 
 # ========== Einstellungen (anpassen oder erweitern) ==========
 SETTINGS = {
@@ -21,81 +22,93 @@ def get_creation_date(file_path: Path) -> str:
     return datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
 
 
-def process_md_file(file_path: Path):
-    """Fügt oder aktualisiert Front-Matter-Einträge in einer Markdown-Datei"""
-    lines = file_path.read_text(encoding='utf-8').splitlines(keepends=True)
+def _frontmatter_end(lines: List[str]) -> int:
+    """Index der schließenden '---'-Zeile (oder len(lines), falls sie fehlt)."""
+    for i in range(1, len(lines)):
+        if lines[i].strip() == '---':
+            return i
+    return len(lines)
+
+
+def update_frontmatter(lines: List[str], creation_date: str) -> List[str]:
+    """
+    Setzt Datum und SETTINGS-Einträge im Front-Matter (Zeilen mit Zeilenende).
+    Ein Durchlauf indiziert alle vorhandenen Keys, danach wird die Liste einmal
+    neu zusammengesetzt (statt Suche je Key und list.insert).
+    """
     if not lines or lines[0].strip() != '---':
-        return  # keine Front Matter vorhanden
+        return lines  # keine Front Matter vorhanden
 
-    # Erstellungsdatum ermitteln
-    creation_date = get_creation_date(file_path)
+    end = _frontmatter_end(lines)
+    first: Dict[str, int] = {}
+    for i in range(1, end):
+        key, sep, _ = lines[i].strip().lower().partition(':')
+        if sep:
+            first.setdefault(key, i)
 
+    out = list(lines)
     # Datum separat verarbeiten, immer direkt unter '---'
-    date_inserted = False
-    for i, l in enumerate(lines[1:], start=1):
-        if l.strip().lower().startswith('datum:'):
-            lines[i] = f'Datum: {creation_date}\n'
-            date_inserted = True
-            break
-    if not date_inserted:
-        lines.insert(1, f'Datum: {creation_date}\n')
-
-    # Suche nach tags:-Zeile
-    tags_idx = None
-    for idx, line in enumerate(lines[1:], start=1):
-        if line.strip().lower().startswith('tags:'):
-            tags_idx = idx
-            break
-
-    # Einfügeposition für die anderen Einstellungen: direkt nach Datum
-    # Datum ist immer an Index 1
-    insert_at = 2
-    if tags_idx is not None and insert_at > tags_idx:
-        insert_at = tags_idx
-
-    # Aktualisiere oder füge übrige SETTINGS-Einträge ein
+    head: List[str] = []
+    if 'datum' in first:
+        out[first['datum']] = f'Datum: {creation_date}\n'
+    else:
+        head = [f'Datum: {creation_date}\n']
+
+    # Aktualisiere übrige SETTINGS-Einträge, fehlende werden gesammelt
+    missing = []
     for key, val in SETTINGS.items():
-        found = False
-        for i, l in enumerate(lines[1:], start=1):
-            if l.strip().lower().startswith(f'{key.lower()}:'):
-                lines[i] = f'{key}: {val}\n'
-                found = True
-                break
-        if not found:
-            lines.insert(insert_at, f'{key}: {val}\n')
-            insert_at += 1
+        idx = first.get(key.lower())
+        if idx is not None:
+            out[idx] = f'{key}: {val}\n'
+        else:
+            missing.append(f'{key}: {val}\n')
 
     # Falls tags:-Block fehlt, hinzufügen
+    tags_idx = first.get('tags')
     if tags_idx is None:
-        lines.insert(insert_at, 'tags:\n')
+        missing.append('tags:\n')
+
+    # Einfügeposition: direkt nach Datum (Index 2), höchstens vor tags:
+    out = out[:1] + head + out[1:]
+    insert_at = 2
+    if tags_idx is not None and tags_idx + len(head) < insert_at:
+        insert_at = tags_idx + len(head)
+    return out[:insert_at] + missing + out[insert_at:]
 
-    # Zurückschreiben
-    file_path.write_text(''.join(lines), encoding='utf-8')
+
+def process_md_file(file_path: Path) -> bool:
+    """Fügt oder aktualisiert Front-Matter-Einträge; schreibt nur bei Änderung."""
+    text = file_path.read_text(encoding='utf-8')
+    lines = text.splitlines(keepends=True)
+    new_lines = update_frontmatter(lines, get_creation_date(file_path))
+    if new_lines == lines:
+        return False
+    file_path.write_text(''.join(new_lines), encoding='utf-8')
+    return True
+
+
+def in_wiki(rel_parts: List[str]) -> bool:
+    """Liegt der Pfad (Ordnerteile relativ zum Start) in einem Ordner namens 'wiki'?"""
+    return any(p.lower() == 'wiki' for p in rel_parts)
 
 
 def main():
-    # Starte Suche im aktuellen Arbeitsverzeichnis
+    # Starte Suche im aktuellen Arbeitsverzeichnis; ein einziger Durchlauf
     base_dir = Path.cwd()
-    wiki_dirs = []
-
-    # Rekursive Suche nach Ordnern namens 'wiki' (case-insensitive)
-    for root, dirs, _ in os.walk(base_dir):
-        for d in dirs:
-            if d.lower() == 'wiki':
-                wiki_dirs.append(Path(root) / d)
+    found_wiki = False
+    for root, _, files in os.walk(base_dir):
+        rel_parts = Path(root).relative_to(base_dir).parts
+        if not in_wiki(list(rel_parts)):
+            continue
+        found_wiki = True
+        for f in files:
+            if f.lower().endswith('.md'):
+                fp = Path(root) / f
+                if process_md_file(fp):
+                    print(f'Bearbeitet: {fp}')
 
-    if not wiki_dirs:
+    if not found_wiki:
         print('Keine Wiki-Ordner gefunden!')
-        return
-
-    # Prozessiere alle Markdown-Dateien in gefundenen Wiki-Ordnern
-    for wiki_dir in wiki_dirs:
-        for root, _, files in os.walk(wiki_dir):
-            for f in files:
-                if f.lower().endswith('.md'):
-                    fp = Path(root) / f
-                    process_md_file(fp)
-                    print(f'Bearbeitet: {fp}')
 
 
 if __name__ == '__main__':
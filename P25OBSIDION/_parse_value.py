@@ -1,13 +1,47 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
+"""
+_parse_value.py – Klausurpunkte auswerten (rekursiv ab dem Ausführungsordner).
 
+1. Liest je Klausur-Notiz die Punkte (MuiChoi, Textaufgabe1, Textaufgabe2, Trans)
+   mit *einem* vorkompilierten Scanner für alle Keys.
+2. Setzt die Zeilen "Ergebnis:" und "Prozent:" direkt vor "MuiChoi:" neu und
+   schreibt die Datei nur, wenn sich diese Zeilen tatsächlich ändern.
+3. Erstellt in einem Durchgang eine Auswertung je Ordner und Semester
+   (Anzahl, offen, Ø, Median, Bestehensquote, Notenverteilung) und schreibt sie
+   nach REPORT_FILE (nur bei Änderung).
+
+Als Klausur-Notiz gilt jede .md mit einer "MuiChoi:"-Zeile; andere Notizen bleiben
+unangetastet.
+"""
+
+import argparse
 import os
 import re
+from collections import defaultdict
+from statistics import median
+from typing import Dict, List, Optional, Tuple
+
+from _excludes import COMMON_EXCLUDE_DIRS
+
+# ========== Einstellungen ==========
+KEYS = ["MuiChoi", "Textaufgabe1", "Textaufgabe2", "Trans"]
+MAX_POINTS = 45
+EXCLUDE_DIRS = set(COMMON_EXCLUDE_DIRS)  # gemeinsame Ausschlüsse (_excludes.py)
+# Auswertung im Startordner ("" = keine Datei schreiben)
+REPORT_FILE = "Klausur-Auswertung.md"
+# ===================================
+
+# Ein Scanner für alle Keys: "  Key: 12" oder 'Key: "12"'
+VALUE_RE = re.compile(r'\s*(' + "|".join(map(re.escape, KEYS)) + r'):\s*"?(\d+)"?')
+RESULT_RE = re.compile(r'\s*(?:Ergebnis|Prozent):')
+ANCHOR_RE = re.compile(r'\s*MuiChoi\s*:')
+GRADES = (1, 2, 3, 4, 5, 6)
 
 # Parsen eines numerischen Werts (mit oder ohne Anführungszeichen)
 def parse_value(line, key):
-    match = re.match(rf'\s*{key}:\s*"?(\d+)"?', line)
-    return int(match.group(1)) if match else None
+    match = VALUE_RE.match(line)
+    return int(match.group(2)) if match and match.group(1) == key else None
 
 # Status-Icon (ab 50 % bestanden)
 def get_status_icon(percent):
@@ -31,55 +65,174 @@ def get_grade_icon_and_number(percent):
     else:
         return "⚫", 6
 
-def process_file(path):
-    with open(path, 'r', encoding='utf-8') as f:
-        original_lines = f.readlines()
+def result_lines(total: int) -> Tuple[str, str, int, Optional[int]]:
+    """(Ergebnis-Zeile, Prozent-Zeile, Prozent, Note oder None = nicht begonnen)."""
+    percent = round((total / MAX_POINTS) * 100) if total > 0 else 0
 
-    keys = ["MuiChoi", "Textaufgabe1", "Textaufgabe2", "Trans"]
-    values = {}
-    new_lines = []
-    inserted = False
+    # Spezieller Fall: noch nicht begonnen (0 Punkte, 0 %)
+    if total == 0 and percent == 0:
+        return 'Ergebnis: 0 | 🚫 Nicht begonnen\n', 'Prozent: 0% | ⚪ 0\n', 0, None
+    status_icon, status_text = get_status_icon(percent)
+    grade_icon, grade_number = get_grade_icon_and_number(percent)
+    return (f'Ergebnis: {total} | {status_icon} {status_text}\n',
+            f'Prozent: {percent}% | {grade_icon} {grade_number}\n', percent, grade_number)
 
-    # Zunächst alle Werte sammeln (unabhängig von Position)
-    for line in original_lines:
-        for key in keys:
-            val = parse_value(line, key)
-            if val is not None:
-                values[key] = val
+def rewrite_lines(original_lines: List[str]) -> Optional[Tuple[List[str], int, int, Optional[int]]]:
+    """
+    Baut die Zeilen neu auf. None, wenn die Notiz keine Klausur ist (keine MuiChoi-Zeile).
+    Sonst (neue Zeilen, Punkte, Prozent, Note).
+    """
+    values: Dict[str, int] = {}
+    anchor = None
+    for i, line in enumerate(original_lines):
+        m = VALUE_RE.match(line)
+        if m:
+            values[m.group(1)] = int(m.group(2))
+        if anchor is None and ANCHOR_RE.match(line):
+            anchor = i
+    if anchor is None:
+        return None
 
-    total = sum(values.get(k, 0) for k in keys)
-    percent = round((total / 45) * 100) if total > 0 else 0
+    total = sum(values.get(k, 0) for k in KEYS)
+    ergebnis_zeile, prozent_zeile, percent, grade = result_lines(total)
 
-    # Spezieller Fall: noch nicht begonnen (0 Punkte, 0 %)
-    if total == 0 and percent == 0:
-        ergebnis_zeile = f'Ergebnis: 0 | 🚫 Nicht begonnen\n'
-        prozent_zeile  = f'Prozent: 0% | ⚪ 0\n'
-    else:
-        status_icon, status_text = get_status_icon(percent)
-        grade_icon, grade_number = get_grade_icon_and_number(percent)
-        ergebnis_zeile = f'Ergebnis: {total} | {status_icon} {status_text}\n'
-        prozent_zeile  = f'Prozent: {percent}% | {grade_icon} {grade_number}\n'
-
-    # Jetzt Zeile für Zeile neu aufbauen und alte Ergebnis/Prozent überspringen
-    for line in original_lines:
-        if re.match(r'\s*Ergebnis:', line) or re.match(r'\s*Prozent:', line):
+    # alte Ergebnis/Prozent-Zeilen überspringen, neue vor der ersten MuiChoi-Zeile einfügen
+    new_lines = []
+    for i, line in enumerate(original_lines):
+        if RESULT_RE.match(line):
             continue
-
-        if not inserted and re.match(r'\s*MuiChoi\s*:', line):
+        if i == anchor:
             new_lines.append(ergebnis_zeile)
             new_lines.append(prozent_zeile)
-            inserted = True
-
         new_lines.append(line)
+    return new_lines, total, percent, grade
 
-    # Datei mit aktualisierten Zeilen überschreiben
-    with open(path, 'w', encoding='utf-8') as f:
-        f.writelines(new_lines)
+def process_file(path, dry_run=False):
+    """Aktualisiert eine Notiz; liefert (geändert, Punkte, Prozent, Note) oder None."""
+    with open(path, 'r', encoding='utf-8') as f:
+        original_lines = f.readlines()
+    result = rewrite_lines(original_lines)
+    if result is None:
+        return None
+    new_lines, total, percent, grade = result
+    changed = new_lines != original_lines
+    if changed and not dry_run:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.writelines(new_lines)
+    return changed, total, percent, grade
+
+def iter_notes(base_dir: str):
+    for root, dirs, files in os.walk(base_dir):
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDE_DIRS and not d.startswith('.'))
+        for fname in sorted(files):
+            if fname.lower().endswith('.md') and fname != REPORT_FILE:
+                yield root, fname
+
+# ---------- Auswertung ----------
+
+class ScoreTable:
+    """
+    Spaltenorientierte Sammlung aller Klausuren (ein Eintrag je Notiz). Die Kennzahlen
+    werden danach gruppenweise über die Spalten berechnet, nicht Notiz für Notiz.
+    """
+
+    def __init__(self):
+        self.folder: List[str] = []
+        self.semester: List[str] = []
+        self.percent: List[int] = []
+        self.grade: List[int] = []  # 0 = nicht begonnen
+
+    def add(self, folder: str, semester: str, percent: int, grade: Optional[int]) -> None:
+        self.folder.append(folder)
+        self.semester.append(semester)
+        self.percent.append(percent)
+        self.grade.append(grade or 0)
+
+    def __len__(self) -> int:
+        return len(self.percent)
+
+    def groups(self, column: List[str]) -> Dict[str, List[int]]:
+        idx: Dict[str, List[int]] = defaultdict(list)
+        for i, key in enumerate(column):
+            idx[key].append(i)
+        return dict(sorted(idx.items(), key=lambda kv: kv[0].lower()))
+
+    def summarize(self, rows: List[int]) -> Dict[str, object]:
+        started = [self.percent[i] for i in rows if self.grade[i]]
+        dist = [0] * 7
+        for i in rows:
+            dist[self.grade[i]] += 1
+        passed = sum(1 for p in started if p >= 50)
+        return {
+            "n": len(rows),
+            "open": dist[0],
+            "mean": round(sum(started) / len(started), 1) if started else None,
+            "median": round(float(median(started)), 1) if started else None,
+            "pass_rate": round(100 * passed / len(started)) if started else None,
+            "dist": dist[1:],
+        }
+
+def _fmt(v, suffix=""):
+    return "–" if v is None else f"{v}{suffix}"
+
+def render_table(title: str, key_name: str, table: ScoreTable, column: List[str]) -> List[str]:
+    out = [f"## {title}", "",
+           f"| {key_name} | Klausuren | offen | Ø % | Median % | bestanden | "
+           + " | ".join(str(g) for g in GRADES) + " |",
+           "|---" * (6 + len(GRADES)) + "|"]
+    for key, rows in table.groups(column).items():
+        s = table.summarize(rows)
+        out.append(f"| {key or '–'} | {s['n']} | {s['open']} | {_fmt(s['mean'])} | {_fmt(s['median'])} | "
+                   f"{_fmt(s['pass_rate'], '%')} | " + " | ".join(str(d) for d in s["dist"]) + " |")
+    out.append("")
+    return out
+
+def render_report(table: ScoreTable) -> str:
+    total = table.summarize(list(range(len(table))))
+    lines = ["# Klausur-Auswertung", "",
+             f"Klausuren: {total['n']} | offen: {total['open']} | Ø {_fmt(total['mean'], '%')} | "
+             f"bestanden: {_fmt(total['pass_rate'], '%')}", ""]
+    lines += render_table("Je Semester", "Semester", table, table.semester)
+    lines += render_table("Je Ordner", "Ordner", table, table.folder)
+    return "\n".join(lines)
+
+def write_if_changed(path: str, content: str) -> bool:
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(content)
+    return True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Klausurpunkte rekursiv auswerten und Ergebnis/Prozent aktualisieren.")
+    parser.add_argument("--dry-run", action="store_true", help="Nur anzeigen, keine Datei schreiben.")
+    args = parser.parse_args(argv)
+
+    base_dir = os.getcwd()
+    table = ScoreTable()
+    changed = 0
+    for root, fname in iter_notes(base_dir):
+        res = process_file(os.path.join(root, fname), dry_run=args.dry_run)
+        if res is None:
+            continue
+        was_changed, _, percent, grade = res
+        rel_dir = os.path.relpath(root, base_dir)
+        parts = [] if rel_dir == "." else rel_dir.split(os.sep)
+        # Semester wie in _mdconfig: zweites Pfadsegment
+        table.add("/".join(parts) or ".", parts[1] if len(parts) > 1 else "", percent, grade)
+        if was_changed:
+            changed += 1
+            print(f"{'würde aktualisieren' if args.dry_run else 'aktualisiert'}: {os.path.join(root, fname)}")
 
-def main():
-    for filename in os.listdir('.'):
-        if filename.lower().endswith('.md'):
-            process_file(filename)
+    report = render_report(table)
+    if REPORT_FILE and not args.dry_run and len(table):
+        if write_if_changed(os.path.join(base_dir, REPORT_FILE), report):
+            print(f"Auswertung geschrieben: {REPORT_FILE}")
+    print(f"Klausuren: {len(table)}, geändert: {changed}.")
 
 if __name__ == "__main__":
     main()
@@ -4,11 +4,16 @@
 import os
 import re
 
+QUOTED_NUMBER_RE = re.compile(r'"(\d+)"')
+
+def remove_quotes(text):
+    # Alle Vorkommen von "123" → 123
+    return QUOTED_NUMBER_RE.sub(r'\1', text)
+
 def remove_quotes_from_numbers(path):
     with open(path, 'r', encoding='utf-8') as f:
         text = f.read()
-    # Alle Vorkommen von "123" → 123
-    new_text = re.sub(r'"(\d+)"', r'\1', text)
+    new_text = remove_quotes(text)
     if new_text != text:
         with open(path, 'w', encoding='utf-8') as f:
             f.write(new_text)
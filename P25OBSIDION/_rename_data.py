@@ -4,17 +4,48 @@
 Ausführung zusätzlicher Skripte.
 
 Erweitert um explizite Ausschlusslisten für Ordner- und Dateinamen.
+
+Zusätzliche Skripte, die eine Funktion ``rename_data_hook(listing, base_dir)``
+anbieten (z. B. _mdconfig.py), laufen im selben Prozess und erhalten die bereits
+gelesene Ordnerliste – kein zweiter Interpreter, kein zweiter Verzeichnis-Durchlauf.
+Skripte ohne Hook werden wie bisher als Subprozess gestartet. ``--dry-run`` zeigt
+nur an, was umbenannt würde, und reicht den Trockenlauf an die Hooks weiter.
+
+Der Vault wird ordnerweise gestreamt: Blöcke von BATCH_DIRS Ordnern laufen durch
+Hooks und Umbenennen, ein Hintergrund-Thread (P25ObisCore/stages.py) liest höchstens
+QUEUE_BATCHES Blöcke voraus. Ordner, deren Präfix gleich ausfällt (z. B. "Kurs",
+"Kurs/_anhang" und "01_Kurs"), teilen sich die Nummerierung; der Durchlauf liefert sie
+direkt nacheinander, eine Gruppe ist also vollständig, sobald der nächste Ordner einen
+anderen Präfix-Stamm hat. Der Speicher hängt so von der Blockgröße und dem größten
+Ordner ab, nicht von der Größe des Vaults.
 """
 
 from __future__ import annotations
 
 import os
 import re
+import argparse
 import datetime
+import importlib.util
 import subprocess
 import sys
 from collections import defaultdict
-from typing import Callable, List, Tuple
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from _excludes import COMMON_EXCLUDE_DIRS
+
+
+def _use_core() -> None:
+    """P25ObisCore (gemeinsame Module) in den Suchpfad."""
+    core = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "P25ObisCore")
+    if core not in sys.path:
+        sys.path.insert(0, core)
+
+
+_use_core()
+from safewrite import is_scratch  # noqa: E402
+from stages import bounded  # noqa: E402
 
 # =============================================================================
 # SETTINGS – Hier nach Belieben anpassen
@@ -22,11 +53,13 @@ from typing import Callable, List, Tuple
 USE_DATE_PREFIX: bool = False          # jjmmdd Datum als Präfix verwenden?
 USE_CREATION_DATE: bool = False        # True → Dateierstellungs­datum, False → Änderungsdatum
 EXECUTE_ADDITIONAL_SCRIPTS: bool = True   # Weitere Skripte ausführen?
-SCRIPT_FILES: List[str] = ["mdconfig.py"]       # Namen der auszuführenden Skripte
+SCRIPT_FILES: List[str] = ["_mdconfig.py"]      # Namen der auszuführenden Skripte
 FOLDER_JOIN: str = "-"              # Trenner zwischen Ordnerteilen
+BATCH_DIRS: int = 32                # Ordner je Block (Hooks + Umbenennen)
+QUEUE_BATCHES: int = 2              # Blöcke, die der Durchlauf vorauslesen darf (0 = ohne Thread)
 
 # Ausschlusslisten
-EXCLUDE_DIRS: List[str] = [".archive", "temp", "Wiki"]
+EXCLUDE_DIRS: List[str] = sorted(COMMON_EXCLUDE_DIRS | {"temp", "Wiki"})  # + _excludes.py
 EXCLUDE_FILES: List[str] = ["README.md", "config.yaml"]
 
 # für fallunabhängige Vergleiche
@@ -53,78 +86,214 @@ def _clean_folder_name(name: str) -> str:
     return re.sub(r"^\d+_", "", name).strip()
 
 
-def _build_prefix(date_str: str, rel_parts: List[str], base_name: str) -> str:
-    """Setzt den individuellen Präfix für *eine* Datei zusammen."""
-    date_part = f"{date_str}_" if USE_DATE_PREFIX else ""
-
+def _prefix_parts(rel_parts: List[str]) -> Tuple[str, ...]:
+    """Ordnerteile, die in den Präfix eingehen – gleiche Teile = gemeinsame Nummerierung."""
     # nur Ordner nutzen, die nicht mit "_" beginnen und nicht in EXCLUDE_DIRS
-    cleaned = [
+    return tuple(
         _clean_folder_name(p)
         for p in rel_parts
         if not p.startswith("_") and p.lower() not in EXCLUDE_DIRS_LOWER
-    ]
-    middle = FOLDER_JOIN.join(cleaned)
+    )
+
+
+def _build_prefix(date_str: str, rel_parts: List[str], base_name: str) -> str:
+    """Setzt den individuellen Präfix für *eine* Datei zusammen."""
+    date_part = f"{date_str}_" if USE_DATE_PREFIX else ""
+    middle = FOLDER_JOIN.join(_prefix_parts(rel_parts))
 
     return f"{date_part}{base_name}{FOLDER_JOIN + middle if middle else ''}"
 
 
-def _execute_scripts(script_files: List[str]) -> None:
-    """Führt externe Python‑Skripte im gleichen Ordner wie dieses Skript aus.
+# =============================================================================
+# Hook-API
+# =============================================================================
+
+@dataclass
+class DirListing:
+    """Ein Ordner aus dem einzigen Verzeichnis-Durchlauf (Listen dürfen Hooks nachführen)."""
+    root: str
+    rel_parts: List[str]
+    dirs: List[str] = field(default_factory=list)
+    files: List[str] = field(default_factory=list)
+    generated: Set[str] = field(default_factory=set)  # von Hooks erzeugt -> nicht umbenennen
+
 
-    Existiert ein angegebenes Skript nicht, wird eine WARN‑Meldung ausgegeben,
-    die Hauptlogik läuft ohne Abbruch weiter.
+Hook = Callable[[List[DirListing], str, bool], None]
+# (Hook, Ordnernamen die der Hook selbst ausschließt; None = braucht alle Ordner)
+HOOKS: List[Tuple[Hook, Optional[Set[str]]]] = []
+# Nach dem letzten Block aufgerufen (z. B. für eine Abschlusszeile über alle Blöcke)
+FINISHERS: List[Callable[[str, bool], None]] = []
+
+
+def register_hook(hook: Hook, exclude_dirs: Optional[Set[str]] = None,
+                  finish: Optional[Callable[[str, bool], None]] = None) -> None:
+    """Registriert einen Hook, der vor dem Umbenennen mit der Ordnerliste aufgerufen wird.
+
+    Aufruf hook(listing, base_dir, dry_run) je Block (bis zu BATCH_DIRS Ordner), nie mit
+    dem ganzen Vault; finish(base_dir, dry_run) läuft einmal nach dem letzten Block.
+    Hooks, die Dateien anlegen oder löschen, müssen ``files`` der Einträge nachführen;
+    selbst erzeugte Dateien gehören zusätzlich in ``generated`` (sonst benennt der
+    Renamer sie um und der nächste Lauf erzeugt sie neu).
     """
+    HOOKS.append((hook, set(exclude_dirs) if exclude_dirs is not None else None))
+    if finish is not None:
+        FINISHERS.append(finish)
+
+
+def _load_hooks(script_files: List[str]) -> List[str]:
+    """Registriert Hooks der Skripte; liefert die Pfade der Skripte ohne Hook."""
     base_dir = os.path.dirname(os.path.abspath(__file__))
+    external: List[str] = []
 
     for fname in script_files:
         script_path = os.path.join(base_dir, fname)
-        if os.path.isfile(script_path):
-            print(f"Starte zusätzliches Skript: {fname}")
-            try:
-                subprocess.run([sys.executable, script_path], check=True)
-            except subprocess.CalledProcessError as exc:
-                print(f"WARN: Skript '{fname}' beendet mit Exit-Code {exc.returncode}")
-        else:
+        if not os.path.isfile(script_path):
             print(f"WARN: Skript '{fname}' nicht gefunden – überspringe")
+            continue
+        name = os.path.splitext(os.path.basename(script_path))[0]
+        spec = importlib.util.spec_from_file_location(name, script_path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module  # u. a. für dataclasses im Skript nötig
+        try:
+            spec.loader.exec_module(module)
+        except Exception as exc:
+            sys.modules.pop(name, None)  # Skript nicht importierbar -> wie bisher separat starten
+            print(f"WARN: Skript '{fname}' nicht importierbar ({exc}) – starte als Subprozess")
+            external.append(script_path)
+            continue
+        hook = getattr(module, "rename_data_hook", None)
+        if callable(hook):
+            print(f"Registriere Hook: {fname}")
+            register_hook(hook, getattr(module, "EXCLUDE_DIRS", None),
+                          getattr(module, "rename_data_finish", None))
+        else:
+            external.append(script_path)
+    return external
 
-# =============================================================================
-# Hauptlogik
-# =============================================================================
 
-def main() -> None:
-    # Optionale Ausführung zusätzlicher Skripte
-    if EXECUTE_ADDITIONAL_SCRIPTS:
-        _execute_scripts(SCRIPT_FILES)
+def _execute_scripts(script_paths: List[str]) -> None:
+    """Führt externe Python‑Skripte (ohne Hook) als Subprozess aus.
 
-    base_dir: str = os.getcwd()
-    base_name: str = os.path.basename(base_dir)
+    Ein Fehler im Skript wird als WARN‑Meldung ausgegeben, die Hauptlogik läuft
+    ohne Abbruch weiter.
+    """
+    for script_path in script_paths:
+        fname = os.path.basename(script_path)
+        print(f"Starte zusätzliches Skript: {fname}")
+        try:
+            subprocess.run([sys.executable, script_path], check=True)
+        except subprocess.CalledProcessError as exc:
+            print(f"WARN: Skript '{fname}' beendet mit Exit-Code {exc.returncode}")
+
+
+def _scan(root: str) -> Optional[Tuple[List[str], List[str], List[str]]]:
+    """Eine Ebene wie os.walk: (Ordner, Dateien, zu betretende Ordner ohne Symlinks);
+    None, wenn der Ordner nicht lesbar ist."""
+    dirs: List[str] = []
+    files: List[str] = []
+    descend: List[str] = []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(entry.name)
+                    continue
+                dirs.append(entry.name)
+                if not entry.is_symlink():
+                    descend.append(entry.name)
+    except OSError:
+        return None
+    return dirs, files, descend
+
+
+def iter_listing(base_dir: str) -> Iterator[DirListing]:
+    """Ein Durchlauf für Renamer *und* Hooks, ein Eintrag je Ordner (Eltern vor Kindern).
+
+    Ordner mit gleichem Präfix-Stamm (_prefix_parts) kommen direkt nacheinander: erst ein
+    Ordner samt seiner "_"- und ausgeschlossenen Unterordner, danach je bereinigtem Namen
+    alle übrigen Unterordner dieser Gruppe ("Kurs", "01_Kurs", "_x/Kurs" zusammen).
+    Ein Ordner wird nur ausgelassen, wenn ihn der Renamer und alle Hooks ausschließen;
+    jeder Verbraucher filtert danach selbst nach seinen Ausschlüssen.
+    """
+    def pruned(d: str) -> bool:
+        return d.lower() in EXCLUDE_DIRS_LOWER and all(
+            excl is not None and d in excl for _, excl in HOOKS)
+
+    # Stapel offener Gruppen; je Gruppe ein Stapel (root, rel_parts)
+    groups: List[List[Tuple[str, List[str]]]] = [[(base_dir, [])]]
+    while groups:
+        todo = groups.pop()
+        children: Dict[str, List[Tuple[str, List[str]]]] = {}
+        while todo:
+            root, rel_parts = todo.pop()
+            scan = _scan(root)
+            if scan is None:
+                continue
+            dirs, files, descend = scan
+            dirs = [d for d in dirs if not pruned(d)]
+            yield DirListing(root, rel_parts, dirs, files)
 
-    files_to_rename: List[Tuple[str, str, str]] = []
+            same_stem = any(p.lower() in EXCLUDE_DIRS_LOWER for p in rel_parts)
+            for d in reversed([d for d in descend if not pruned(d)]):
+                item = (os.path.join(root, d), rel_parts + [d])
+                if same_stem or d.startswith("_") or d.lower() in EXCLUDE_DIRS_LOWER:
+                    todo.append(item)  # gleicher Präfix-Stamm -> in dieser Gruppe
+                else:
+                    children.setdefault(_clean_folder_name(d), []).append(item)
+        groups.extend(reversed(list(children.values())))
 
-    for root, dirs, files in os.walk(base_dir):
-        # Verzeichnisbaum anpassen: keine Abstiege in EXCLUDE_DIRS
-        dirs[:] = [d for d in dirs if d.lower() not in EXCLUDE_DIRS_LOWER]
 
-        rel_dir = os.path.relpath(root, base_dir)
-        rel_parts = [] if rel_dir == "." else rel_dir.split(os.sep)
+def walk_listing(base_dir: str) -> List[DirListing]:
+    """Wie iter_listing, aber als Liste (ganzer Vault im Speicher)."""
+    return list(iter_listing(base_dir))
 
-        # falls doch ein EXCLUDE_DIR im Pfad steckt, überspringen
-        if any(part.lower() in EXCLUDE_DIRS_LOWER for part in rel_parts):
-            continue
 
-        for file in files:
-            # Exclude: Skriptdateien und konfigurierte Ausnahmen
-            if file.lower().endswith(".py") or file.lower() in EXCLUDE_FILES_LOWER:
+def _batches(entries: Iterable[DirListing], size: int) -> Iterator[List[DirListing]]:
+    batch: List[DirListing] = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _excluded(entry: DirListing) -> bool:
+    # falls ein EXCLUDE_DIR im Pfad steckt, überspringen
+    return any(part.lower() in EXCLUDE_DIRS_LOWER for part in entry.rel_parts)
+
+
+def rename_group(entries: List[DirListing], base_name: str, dry_run: bool = False) -> None:
+    """Benennt die Dateien von Ordnern mit gleichem Präfix-Stamm um (gemeinsame Sequenz)."""
+    files_to_rename: List[Tuple[str, str, str]] = []
+    # Belegte Namen je Ordner (Dateien + Unterordner) für die Konfliktprüfung im Speicher
+    taken: Dict[str, Set[str]] = {}
+
+    for entry in entries:
+        taken[entry.root] = set(entry.files) | set(entry.dirs)
+
+        for file in entry.files:
+            # Exclude: Skriptdateien, konfigurierte Ausnahmen, von Hooks erzeugte Dateien,
+            # Sperr-/Temp-Dateien der Obis-Tools
+            if (file.lower().endswith(".py") or file.lower() in EXCLUDE_FILES_LOWER
+                    or file in entry.generated or is_scratch(file)):
                 continue
 
-            full_path = os.path.join(root, file)
-            timestamp = get_timestamp(full_path)
-            date_str = datetime.datetime.fromtimestamp(timestamp).strftime("%y%m%d")
+            full_path = os.path.join(entry.root, file)
+            date_str = ""
+            if USE_DATE_PREFIX:  # Zeitstempel nur bei Bedarf lesen
+                timestamp = get_timestamp(full_path)
+                date_str = datetime.datetime.fromtimestamp(timestamp).strftime("%y%m%d")
 
-            prefix = _build_prefix(date_str, rel_parts, base_name)
+            prefix = _build_prefix(date_str, entry.rel_parts, base_name)
             files_to_rename.append((full_path, prefix, file))
 
-    # Schritt 2: pro Präfix sortieren & mit Sequenz versehen
+    # pro Präfix sortieren & mit Sequenz versehen
     by_prefix: defaultdict[str, List[Tuple[str, str]]] = defaultdict(list)
     for full, pre, orig in files_to_rename:
         by_prefix[pre].append((full, orig))
@@ -134,22 +303,72 @@ def main() -> None:
 
         for seq, (full_path, orig_file) in enumerate(file_list, start=1):
             _, ext = os.path.splitext(orig_file)
+            folder = os.path.dirname(full_path)
+            names = taken[folder]
             new_name = f"{prefix}_{seq:02d}{ext}"
-            new_full_path = os.path.join(os.path.dirname(full_path), new_name)
 
-            # bei Konflikten Sequenz hochzählen
-            while os.path.exists(new_full_path) and os.path.abspath(full_path) != os.path.abspath(new_full_path):
+            # bei Konflikten Sequenz hochzählen (Prüfung gegen die Namensmenge statt os.path.exists)
+            while new_name in names and new_name != orig_file:
                 seq += 1
                 new_name = f"{prefix}_{seq:02d}{ext}"
-                new_full_path = os.path.join(os.path.dirname(full_path), new_name)
+            new_full_path = os.path.join(folder, new_name)
 
             # umbenennen
-            if os.path.abspath(full_path) != os.path.abspath(new_full_path):
-                print(f"{full_path}  →  {new_full_path}")
-                os.rename(full_path, new_full_path)
+            if new_name != orig_file:
+                print(f"{'würde umbenennen: ' if dry_run else ''}{full_path}  →  {new_full_path}")
+                if not dry_run:
+                    os.rename(full_path, new_full_path)
+                names.discard(orig_file)
+                names.add(new_name)
             else:
                 print(f"{full_path} bereits korrekt benannt.")
 
+# =============================================================================
+# Hauptlogik
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Dateien nach Ordnerpfad umbenennen (plus Hooks/Skripte).")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Nur anzeigen, nichts umbenennen (auch an Hooks weitergereicht).")
+    args = parser.parse_args(argv)
+    dry_run: bool = args.dry_run
+
+    # Optionale zusätzliche Skripte: Hooks registrieren, übrige als Subprozess starten
+    # (Subprozesse kennen keinen Trockenlauf und werden dann nicht gestartet)
+    if EXECUTE_ADDITIONAL_SCRIPTS:
+        external = _load_hooks(SCRIPT_FILES)
+        if dry_run:
+            for script_path in external:
+                print(f"würde starten: {os.path.basename(script_path)}")
+        else:
+            _execute_scripts(external)
+
+    base_dir: str = os.getcwd()
+    base_name: str = os.path.basename(base_dir)
+
+    # Ordner des aktuellen Präfix-Stamms (iter_listing liefert jeden Stamm am Stück)
+    group: List[DirListing] = []
+    key: Tuple[str, ...] = ()
+
+    # Blockweise: Hooks auf dem Block, dann umbenennen, sobald ein Präfix-Stamm vollständig ist
+    for batch in bounded(_batches(iter_listing(base_dir), BATCH_DIRS), QUEUE_BATCHES):
+        for hook, _ in HOOKS:
+            hook(batch, base_dir, dry_run)
+        for entry in batch:
+            if _excluded(entry):
+                continue
+            entry_key = _prefix_parts(entry.rel_parts)
+            if group and entry_key != key:
+                rename_group(group, base_name, dry_run)
+                group = []
+            key = entry_key
+            group.append(entry)
+    if group:
+        rename_group(group, base_name, dry_run)
+    for finish in FINISHERS:
+        finish(base_dir, dry_run)
+
     print("Fertig – alle Dateien wurden überprüft und ggf. umbenannt!")
 
 
@@ -0,0 +1,672 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ObisBench – End-to-End-Benchmarks der Obis Tools auf synthetischen Vaults.
+
+    python ObisBench.py run --sizes 1k,10k           # messen, Ergebnis an Historie anhängen
+    python ObisBench.py compare                       # letzte zwei Läufe vergleichen
+    python ObisBench.py compare 0 -1 --threshold 15   # erster gegen letzten Lauf
+    python ObisBench.py startup                       # Startzeit von `obis links --dry-run` prüfen
+    python ObisBench.py memory --sizes 2k,8k,32k      # Spitzen-RSS bei wachsendem Vault prüfen
+    python ObisBench.py roundtrips --latency-ms 2     # Dateisystem-Aufrufe je Ordner (Netzlaufwerk)
+
+Gemessen werden (je Größe auf einem frisch erzeugten Vault, siehe vaultgen.py):
+- placeholders : placeholders.expand() für jede Datei mit dem Pattern ihrer Ebene
+- renamer      : ObisRenamer.run() als Trockenlauf (Plan inkl. expand, ohne Umbenennen –
+                 so bleibt der Vault für die folgenden Messungen unverändert)
+- links        : P25ObisLinks.run() (erster Lauf schreibt alle Indexe)
+- database     : ObisDatabase.run() (erster Lauf schreibt alle Frontmatter)
+
+Jede Messung läuft in einem eigenen Python-Prozess: "kalt" ist der erste Aufruf (frischer
+Prozess, keine Tool-Caches im Vault, mit --drop-caches auch leerer Page-Cache), "warm"
+der direkt folgende zweite Aufruf im selben Prozess. Die Ergebnisse landen in einer
+JSON-Historie; `compare` meldet Verschlechterungen oberhalb einer Schwelle (Exit-Code 1).
+
+`startup` misst die Startzeit der obis-Unterbefehle auf einem kleinen Vault (Prozessstart
+inkl. Imports und Lauf) und prüft `obis links --dry-run` gegen STARTUP_BUDGET_MS.
+
+`memory` lässt die CLIs (wie ein Nutzer sie aufruft) auf Vaults wachsender Größe bei gleicher
+Ordnergröße laufen und misst je Lauf den RSS-Zuwachs über den Stand nach Import und
+Vorbereitung. Da alle Tools ordnerweise streamen, darf der Zuwachs nicht mit der Zahl der
+Dateien steigen; mehr als MEMORY_TOLERANCE_KB Unterschied zwischen kleinster und größter
+Größe gilt als Fehler (Exit-Code 1).
+
+`roundtrips` lädt einen erzeugten Vault in ein MemoryFileSystem (P25ObisCore/fsbackend.py)
+und lässt die Tools darauf über ein LatencyFileSystem laufen: gezählt wird jeder Aufruf
+an das Dateisystem (scandir, stat, read, write, rename, …) – auf einem Netzlaufwerk je
+ein Round-Trip. Mit --latency-ms wird jede Operation zusätzlich verzögert, die Laufzeit
+zeigt dann, was die Round-Trips auf einem Share kosten. Die Platte wird nur beim Laden
+gelesen, die Messung selbst ist unabhängig vom Page-Cache.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import vaultgen
+
+# Geschwister-Module (eigene Ordner, keine Pakete) importierbar machen
+_BASE = Path(__file__).resolve().parent.parent
+for _sub in ("P25ObisRenamer", "P25ObisDatabase", "P25ObisLinks", "P25ObisPipeline", "P25ObisCore"):
+    if str(_BASE / _sub) not in sys.path:
+        sys.path.insert(0, str(_BASE / _sub))
+
+# ========== Einstellungen ==========
+HISTORY_FILE = Path(__file__).resolve().parent / "bench-history.json"
+DEFAULT_SIZES = "1k,10k"  # 100k/1M explizit anfordern (Laufzeit, Plattenplatz)
+DEFAULT_THRESHOLD = 10.0  # Prozent
+MIN_SECONDS = 0.05  # kürzere Messungen gelten beim Vergleich nie als Regression
+CACHE_PREFIX = ".p25obislinks-"  # Zustands-/Header-Cache von P25ObisLinks im Root
+STARTUP_BUDGET_MS = 100.0  # `obis links --dry-run` auf einem kleinen Ordner
+STARTUP_FILES = 50  # Größe des Vaults für `startup`
+MEMORY_SIZES = "2k,8k,32k"  # gleiche Ordnergröße (--per-dir), nur mehr Ordner
+MEMORY_TOLERANCE_KB = 4096  # erlaubter RSS-Mehrbedarf der größten gegenüber der kleinsten Größe
+ROUNDTRIP_FILES = "2k"  # Größe des Vaults für `roundtrips`
+# Unterbefehl -> (Ordner, Modul) für die Import-Aufschlüsselung
+STARTUP_MODULES = {
+    "links": ("P25ObisLinks", "P25ObisLinks"),
+    "rename": ("P25ObisRenamer", "ObisRenamer"),
+    "database": ("P25ObisDatabase", "ObisDatabase"),
+}
+# ===================================
+
+
+# ---------- Benchmarks (laufen im Kindprozess) ----------
+
+def _bench_placeholders(root: Path) -> Callable[[], None]:
+    import ObisRenamer as renamer
+    import placeholders
+
+    patterns = renamer.load_config(root / "ObisRenamer.ini").patterns
+    jobs = []
+    for curr, dirs, files in os.walk(root):
+        dirs.sort()
+        depth = len(Path(curr).relative_to(root).parts)
+        pattern = patterns.get(depth, "")
+        if pattern:
+            jobs += [(pattern, placeholders.Context(start_root=root, file_path=Path(curr) / f))
+                     for f in sorted(files)]
+
+    def call() -> None:
+        for pattern, ctx in jobs:
+            placeholders.expand(pattern, ctx)
+    return call
+
+
+def _bench_renamer(root: Path) -> Callable[[], None]:
+    import ObisRenamer as renamer
+
+    cfg = renamer.load_config(root / "ObisRenamer.ini")
+    return lambda: renamer.run(root, cfg, dry_run=True)
+
+
+def _bench_links(root: Path) -> Callable[[], None]:
+    import P25ObisLinks as links
+
+    return lambda: links.run(root)
+
+
+def _bench_database(root: Path) -> Callable[[], None]:
+    import ObisDatabase as database
+
+    return lambda: database.run(root)
+
+
+# Reihenfolge = Ausführungsreihenfolge: lesende Benchmarks vor schreibenden
+BENCHES: Dict[str, Callable[[Path], Callable[[], None]]] = {
+    "placeholders": _bench_placeholders,
+    "renamer": _bench_renamer,
+    "links": _bench_links,
+    "database": _bench_database,
+}
+
+
+def _peak_rss_kb() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def measure(bench: str, root: Path) -> Dict[str, object]:
+    """Kindprozess: Vorbereitung (ungemessen), dann kalter und warmer Aufruf."""
+    times = []
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        call = BENCHES[bench](root)
+        for _ in range(2):
+            t0 = time.perf_counter()
+            call()
+            times.append(time.perf_counter() - t0)
+    return {"cold": times[0], "warm": times[1], "peak_rss_kb": _peak_rss_kb()}
+
+
+def _memory_call(tool: str, root: Path) -> Callable[[], object]:
+    """CLI-Aufruf eines Tools als Trockenlauf; _rename_data (ohne Trockenlauf) schreibt."""
+    if tool == "renamer":
+        import ObisRenamer as renamer
+        return lambda: renamer.main([str(root), "--config", str(root / "ObisRenamer.ini"), "--dry-run"])
+    if tool == "database":
+        import ObisDatabase as database
+        return lambda: database.main([str(root), "--dry-run"])
+    if tool == "links":
+        import P25ObisLinks as links
+        return lambda: links.main([str(root), "--dry-run"])
+    import importlib.util
+
+    scripts = str(_BASE / "P25OBSIDION")
+    if scripts not in sys.path:
+        sys.path.insert(0, scripts)  # wie beim Start als Skript: _excludes.py, _mdconfig.py daneben
+    spec = importlib.util.spec_from_file_location("_rename_data", _BASE / "P25OBSIDION" / "_rename_data.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["_rename_data"] = module
+    spec.loader.exec_module(module)
+    os.chdir(root)  # _rename_data arbeitet im aktuellen Verzeichnis
+    return lambda: module.main([])
+
+
+# Reihenfolge = Ausführungsreihenfolge: _rename_data benennt um, daher zuletzt
+MEMORY_TOOLS = ("renamer", "database", "links", "rename_data")
+
+
+def _proc_status_kb(field: str) -> Optional[int]:
+    """VmRSS/VmHWM aus /proc/self/status (nur Linux)."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as fh:
+            for line in fh:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    """Spitzen-RSS (VmHWM) auf den aktuellen Stand zurücksetzen (Linux); False, wenn nicht möglich."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5\n")
+    except OSError:
+        return False
+    return _proc_status_kb("VmHWM") is not None
+
+
+def measure_memory(tool: str, root: Path) -> Dict[str, object]:
+    """
+    Kindprozess: RSS nach Import/Vorbereitung und Spitzen-RSS des Laufs. Unter Linux wird
+    die Spitze vorher zurückgesetzt, sonst zählt ru_maxrss (auch Spitzen beim Import).
+    """
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        call = _memory_call(tool, root)
+        exact = _reset_peak_rss()
+        base = _proc_status_kb("VmRSS") if exact else _peak_rss_kb()
+        t0 = time.perf_counter()
+        call()
+        seconds = time.perf_counter() - t0
+    peak = _proc_status_kb("VmHWM") if exact else _peak_rss_kb()
+    return {"base_kb": base, "peak_kb": peak, "seconds": seconds}
+
+
+# ---------- Harness ----------
+
+def drop_os_caches() -> bool:
+    """Page-Cache leeren (nur Linux als root); False, wenn nicht möglich."""
+    try:
+        os.sync()
+        Path("/proc/sys/vm/drop_caches").write_text("3\n")
+        return True
+    except OSError:
+        return False
+
+
+def run_child(bench: str, root: Path, drop_caches: bool) -> Dict[str, object]:
+    for cache in root.glob(CACHE_PREFIX + "*"):
+        cache.unlink()
+    if drop_caches and not drop_os_caches():
+        print("[WARN] Page-Cache konnte nicht geleert werden (root unter Linux nötig).")
+    proc = subprocess.run([sys.executable, str(Path(__file__).resolve()), "_measure", bench, str(root)],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Benchmark {bench} fehlgeschlagen:\n{proc.stderr.strip()}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def git_commit() -> Optional[str]:
+    try:
+        proc = subprocess.run(["git", "-C", str(_BASE), "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True)
+    except FileNotFoundError:
+        return None
+    return proc.stdout.strip() or None
+
+
+def load_history(path: Path) -> List[dict]:
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding="utf-8")).get("runs", [])
+
+
+def save_history(path: Path, runs: List[dict]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"runs": runs}, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def run_suite(sizes: List[int], benches: List[str], base_spec: vaultgen.VaultSpec, workdir: Path,
+              repeat: int, drop_caches: bool, keep: bool) -> List[dict]:
+    results = []
+    for size in sizes:
+        samples: Dict[Tuple[str, str], List[float]] = {}
+        rss: Dict[str, int] = {}
+        files = 0
+        for r in range(repeat):
+            spec = vaultgen.VaultSpec(**{**asdict(base_spec), "files": size})
+            root = workdir / f"{size}-{r}" / "vault"  # gleicher Root-Name für alle Läufe
+            if root.exists():
+                shutil.rmtree(root)
+            t0 = time.perf_counter()
+            stats = vaultgen.generate(root, spec)
+            files = stats.files
+            print(f"Vault {size} Dateien ({stats.dirs} Ordner) erzeugt in {time.perf_counter() - t0:.1f}s")
+            for bench in benches:
+                res = run_child(bench, root, drop_caches)
+                for mode in ("cold", "warm"):
+                    samples.setdefault((bench, mode), []).append(res[mode])
+                if res["peak_rss_kb"] is not None:
+                    rss[bench] = max(rss.get(bench, 0), res["peak_rss_kb"])
+                print(f"  {bench:<12} kalt {res['cold']:8.3f}s  warm {res['warm']:8.3f}s")
+            if not keep:
+                shutil.rmtree(root.parent)
+        for bench in benches:
+            for mode in ("cold", "warm"):
+                seconds = statistics.median(samples[(bench, mode)])
+                results.append({
+                    "bench": bench, "files": files, "mode": mode, "seconds": round(seconds, 6),
+                    "files_per_s": round(files / seconds, 1) if seconds > 0 else None,
+                    "peak_rss_kb": rss.get(bench),
+                })
+    return results
+
+
+def _select_run(runs: List[dict], ref: str) -> dict:
+    """Run per Index (auch negativ), Commit-Präfix oder Label."""
+    try:
+        return runs[int(ref)]
+    except ValueError:
+        pass
+    except IndexError:
+        raise ValueError(f"Kein Lauf mit Index {ref} (Historie: {len(runs)} Läufe)") from None
+    for run in reversed(runs):
+        if (run.get("commit") or "").startswith(ref) or run.get("label") == ref:
+            return run
+    raise ValueError(f"Kein Lauf zu '{ref}' gefunden")
+
+
+def compare_runs(base: dict, head: dict, threshold: float,
+                 min_seconds: float = MIN_SECONDS) -> Tuple[List[str], int]:
+    """Tabellenzeilen + Anzahl Regressionen (head langsamer als base um > threshold %)."""
+    old = {(r["bench"], r["files"], r["mode"]): r["seconds"] for r in base["results"]}
+    lines = [f"{'Benchmark':<12} {'Dateien':>9} {'Modus':<5} {'Basis':>10} {'Neu':>10} {'Δ':>8}"]
+    regressions = 0
+    for r in head["results"]:
+        key = (r["bench"], r["files"], r["mode"])
+        if key not in old:
+            continue
+        before, after = old[key], r["seconds"]
+        delta = (after - before) / before * 100 if before > 0 else 0.0
+        flag = ""
+        if delta > threshold and max(before, after) >= min_seconds:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif delta < -threshold:
+            flag = "  schneller"
+        lines.append(f"{r['bench']:<12} {r['files']:>9} {r['mode']:<5} {before:>9.3f}s {after:>9.3f}s "
+                     f"{delta:>+7.1f}%{flag}")
+    return lines, regressions
+
+
+def _describe(run: dict) -> str:
+    return f"{run['time']} commit {run.get('commit') or '–'}" + (f" [{run['label']}]" if run.get("label") else "")
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    benches = [b.strip() for b in args.benches.split(",") if b.strip()]
+    unknown = set(benches) - set(BENCHES)
+    if unknown:
+        print(f"Unbekannte Benchmarks: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+    benches = [b for b in BENCHES if b in benches]
+    try:
+        sizes = [vaultgen.parse_count(s) for s in args.sizes.split(",") if s.strip()]
+        spec = vaultgen.spec_from_args(args, files=0)
+    except ValueError as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 2
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="obisbench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    try:
+        results = run_suite(sizes, benches, spec, workdir, max(1, args.repeat), args.drop_caches, args.keep)
+    except RuntimeError as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.workdir is None and not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    spec_info = asdict(spec)
+    spec_info.pop("files")
+    run = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "label": args.label,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "spec": spec_info,
+        "results": results,
+    }
+    runs = load_history(args.history)
+    runs.append(run)
+    save_history(args.history, runs)
+    print(f"Ergebnis gespeichert: {args.history} (Lauf {len(runs) - 1})")
+    if len(runs) > 1:
+        lines, regressions = compare_runs(runs[-2], run, args.threshold)
+        print(f"\nVergleich mit vorherigem Lauf ({_describe(runs[-2])}):")
+        print("\n".join(lines))
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    runs = load_history(args.history)
+    if len(runs) < 2 and (args.base is None or args.head is None):
+        print(f"Zu wenige Läufe in {args.history} für einen Vergleich.", file=sys.stderr)
+        return 2
+    try:
+        base = _select_run(runs, args.base if args.base is not None else "-2")
+        head = _select_run(runs, args.head if args.head is not None else "-1")
+    except ValueError as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 2
+    lines, regressions = compare_runs(base, head, args.threshold, args.min_seconds)
+    print(f"Basis: {_describe(base)}\nNeu:   {_describe(head)}\n")
+    print("\n".join(lines))
+    print(f"\nRegressionen (> {args.threshold:g} %): {regressions}")
+    return 1 if regressions else 0
+
+
+def _median_ms(cmd: List[str], runs: int) -> float:
+    # Bytecode-Cache immer zulassen – gemessen wird der Start, wie ihn Nutzer erleben
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+
+def import_profile(folder: str, module: str) -> List[Tuple[str, float]]:
+    """(Modul, kumulierte Importzeit in ms) der direkten Imports von module, teuerste zuerst."""
+    code = f"import sys; sys.path.insert(0, {str(_BASE / folder)!r}); import {module}"
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True,
+                          text=True, env=env)
+    rows: List[Tuple[str, float]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        indent = len(name) - len(name.lstrip(" ")) - 1  # zwei Leerzeichen je Ebene
+        if indent == 2:
+            rows.append((name.strip(), int(cumulative) / 1000))
+        elif indent == 0:
+            # Unterimporte stehen vor ihrem Modul -> beim Modul selbst ist die Liste komplett
+            if name.strip() == module:
+                return sorted(rows, key=lambda row: -row[1])
+            rows = []
+    return []
+
+
+def cmd_startup(args: argparse.Namespace) -> int:
+    obis = str(_BASE / "obis.py")
+    with tempfile.TemporaryDirectory(prefix="obisbench-startup-") as tmp:
+        root = Path(tmp) / "vault"
+        vaultgen.generate(root, vaultgen.VaultSpec(files=args.files, depth=2))
+        commands = {
+            "links": [obis, "links", str(root), "--dry-run"],
+            "rename": [obis, "rename", str(root), "--config", str(root / "ObisRenamer.ini"), "--dry-run"],
+            "database": [obis, "database", str(root), "--dry-run"],
+        }
+        baseline = _median_ms([sys.executable, "-c", "pass"], args.runs)
+        print(f"Python-Start (python -c pass): {baseline:6.1f} ms")
+        over = False
+        for name, cmd in commands.items():
+            _median_ms([sys.executable, *cmd], 1)  # Bytecode-Cache anlegen
+            ms = _median_ms([sys.executable, *cmd], args.runs)
+            flag = ""
+            if name == "links":
+                over = ms > args.budget_ms
+                flag = f"  (Budget {args.budget_ms:g} ms: {'ÜBERSCHRITTEN' if over else 'ok'})"
+            print(f"obis {name:<9} --dry-run:   {ms:6.1f} ms{flag}")
+    if args.imports:
+        for name, (folder, module) in STARTUP_MODULES.items():
+            print(f"\nImportzeit {module} (kumuliert, ms):")
+            for mod, ms in import_profile(folder, module)[:args.imports]:
+                print(f"  {mod:<28} {ms:6.1f}")
+    return 1 if over else 0
+
+
+def cmd_memory(args: argparse.Namespace) -> int:
+    tools = [t.strip() for t in args.tools.split(",") if t.strip()]
+    unknown = set(tools) - set(MEMORY_TOOLS)
+    if unknown:
+        print(f"Unbekannte Tools: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+    if _peak_rss_kb() is None:
+        print("RSS-Messung wird auf dieser Plattform nicht unterstützt.", file=sys.stderr)
+        return 2
+    tools = [t for t in MEMORY_TOOLS if t in tools]
+    try:
+        sizes = sorted(vaultgen.parse_count(s) for s in args.sizes.split(",") if s.strip())
+        base_spec = vaultgen.spec_from_args(args, files=0)
+    except ValueError as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 2
+
+    growth: Dict[str, List[Tuple[int, int]]] = {tool: [] for tool in tools}  # (Dateien, KiB)
+    with tempfile.TemporaryDirectory(prefix="obisbench-memory-") as tmp:
+        for size in sizes:
+            root = Path(tmp) / str(size) / "vault"
+            spec = vaultgen.VaultSpec(**{**asdict(base_spec), "files": size})
+            if not spec.fanout:  # auf volle Ordner aufrunden -> gleiche Dateizahl je Ordner
+                fanout = spec.resolved_fanout()
+                spec.files = spec.per_dir * sum(fanout ** k for k in range(1, spec.depth + 1))
+            stats = vaultgen.generate(root, spec)
+            print(f"Vault {stats.files} Dateien ({stats.dirs} Ordner, ~{stats.files // max(1, stats.dirs)} je Ordner)")
+            for tool in tools:
+                proc = subprocess.run([sys.executable, str(Path(__file__).resolve()), "_memory", tool, str(root)],
+                                      capture_output=True, text=True)
+                if proc.returncode != 0:
+                    print(f"Fehler: {tool} fehlgeschlagen:\n{proc.stderr.strip()}", file=sys.stderr)
+                    return 1
+                res = json.loads(proc.stdout.strip().splitlines()[-1])
+                delta = res["peak_kb"] - res["base_kb"]
+                growth[tool].append((stats.files, delta))
+                print(f"  {tool:<12} Spitze {res['peak_kb'] / 1024:7.1f} MiB  Zuwachs {delta / 1024:7.1f} MiB"
+                      f"  ({res['seconds']:.2f}s)")
+            shutil.rmtree(root.parent)
+
+    print(f"\nRSS-Zuwachs kleinste → größte Größe (Toleranz {args.tolerance_kb / 1024:g} MiB):")
+    failed = False
+    for tool, points in growth.items():
+        (files_lo, lo), (files_hi, hi) = points[0], points[-1]
+        grows = hi - lo > args.tolerance_kb
+        failed = failed or grows
+        print(f"  {tool:<12} {files_lo:>8} → {files_hi:>8} Dateien: {lo / 1024:6.1f} → {hi / 1024:6.1f} MiB"
+              f"  {'WÄCHST MIT DEM VAULT' if grows else 'konstant'}")
+    return 1 if failed else 0
+
+
+def _renamer_config(root: Path, fs):
+    import ObisRenamer as renamer
+
+    saved, renamer.FS = renamer.FS, fs  # INI aus dem Speicher lesen
+    try:
+        return renamer.load_config(root / "ObisRenamer.ini")
+    finally:
+        renamer.FS = saved
+
+
+def _roundtrip_call(tool: str, root: Path, fs) -> Callable[[], object]:
+    """Ein schreibender Lauf von tool auf fs (der Vault liegt dort nur im Speicher)."""
+    if tool == "renamer":
+        import ObisRenamer as renamer
+
+        cfg = _renamer_config(root, fs)
+        return lambda: renamer.run(root, cfg, keep_files=False, fs=fs)
+    if tool == "database":
+        import ObisDatabase as database
+
+        return lambda: database.run(root, keep_files=False, fs=fs)
+    if tool == "links":
+        import P25ObisLinks as links
+
+        return lambda: links.run(root, keep_actions=False, fs=fs)
+    import ObisPipeline as pipeline
+
+    cfg = _renamer_config(root, fs)
+
+    def call() -> object:
+        with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+            return pipeline.Pipeline(root, cfg, fs=fs).run()
+    return call
+
+
+ROUNDTRIP_TOOLS = ("renamer", "database", "links", "pipeline")
+
+
+def cmd_roundtrips(args: argparse.Namespace) -> int:
+    from fsbackend import LatencyFileSystem, MemoryFileSystem
+
+    tools = [t.strip() for t in args.tools.split(",") if t.strip()]
+    unknown = set(tools) - set(ROUNDTRIP_TOOLS)
+    if unknown:
+        print(f"Unbekannte Tools: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+    try:
+        spec = vaultgen.spec_from_args(args, files=vaultgen.parse_count(args.files))
+    except ValueError as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 2
+    results: Dict[str, Dict[str, object]] = {}
+    with tempfile.TemporaryDirectory(prefix="obisbench-roundtrips-") as tmp:
+        root = Path(tmp) / "vault"
+        stats = vaultgen.generate(root, spec)
+        root = root.resolve()
+        print(f"Vault {stats.files} Dateien, {stats.dirs} Ordner; Latenz {args.latency_ms:g} ms je Operation")
+        for tool in [t for t in ROUNDTRIP_TOOLS if t in tools]:
+            fs = LatencyFileSystem(MemoryFileSystem.load(root), latency=args.latency_ms / 1000)
+            call = _roundtrip_call(tool, root, fs)
+            fs.reset()  # nur den Lauf zählen, nicht das Laden der INI
+            t0 = time.perf_counter()
+            call()
+            seconds = time.perf_counter() - t0
+            summary = fs.summary()
+            results[tool] = {**summary, "seconds": round(seconds, 3)}
+            ops = ", ".join(f"{op} {n}" for op, n in sorted(summary["calls"].items(), key=lambda kv: -kv[1]))
+            print(f"  {tool:<9} {summary['total']:>8} Aufrufe  {summary['per_dir'] or 0:6.1f} je Ordner"
+                  f"  {seconds:7.2f}s  ({ops})")
+    if args.json:
+        print(json.dumps(results, indent=2))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["_measure"]:  # interner Kindprozess
+        print(json.dumps(measure(argv[1], Path(argv[2]))))
+        return 0
+    if argv[:1] == ["_memory"]:  # interner Kindprozess
+        print(json.dumps(measure_memory(argv[1], Path(argv[2]))))
+        return 0
+
+    parser = argparse.ArgumentParser(prog=prog, description="Benchmarks der Obis Tools auf synthetischen Vaults.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Benchmarks ausführen und an die Historie anhängen")
+    p_run.add_argument("--sizes", default=DEFAULT_SIZES,
+                       help=f"Vault-Größen in Dateien, z. B. 1k,10k,100k,1M (Default: {DEFAULT_SIZES})")
+    p_run.add_argument("--benches", default=",".join(BENCHES),
+                       help=f"Auswahl aus {', '.join(BENCHES)} (Default: alle)")
+    p_run.add_argument("--repeat", type=int, default=1, help="Wiederholungen je Größe, Median zählt (Default: 1)")
+    p_run.add_argument("--workdir", type=Path, default=None,
+                       help="Ordner für die erzeugten Vaults (Default: temporär)")
+    p_run.add_argument("--keep", action="store_true", help="erzeugte Vaults nicht löschen")
+    p_run.add_argument("--drop-caches", action="store_true",
+                       help="vor jeder Messung den Page-Cache leeren (Linux, root)")
+    p_run.add_argument("--label", default=None, help="Bezeichnung des Laufs in der Historie")
+    p_run.add_argument("--history", type=Path, default=HISTORY_FILE, help="JSON-Historie")
+    p_run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help="Schwelle für den Vergleich mit dem vorherigen Lauf in Prozent")
+    vaultgen.add_spec_args(p_run)
+
+    p_cmp = sub.add_parser("compare", help="zwei Läufe der Historie vergleichen")
+    p_cmp.add_argument("base", nargs="?", default=None,
+                       help="Basislauf: Index (auch negativ), Commit-Präfix oder Label (Default: vorletzter)")
+    p_cmp.add_argument("head", nargs="?", default=None, help="Vergleichslauf (Default: letzter)")
+    p_cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help=f"Verschlechterung in Prozent, ab der gemeldet wird (Default: {DEFAULT_THRESHOLD:g})")
+    p_cmp.add_argument("--min-seconds", type=float, default=MIN_SECONDS,
+                       help=f"kürzere Messungen nie als Regression werten (Default: {MIN_SECONDS})")
+    p_cmp.add_argument("--history", type=Path, default=HISTORY_FILE, help="JSON-Historie")
+
+    p_start = sub.add_parser("startup", help="Startzeit der obis-Unterbefehle messen (Budget-Prüfung)")
+    p_start.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                         help=f"Budget für `obis links --dry-run` (Default: {STARTUP_BUDGET_MS:g} ms) → Exit-Code 1")
+    p_start.add_argument("--runs", type=int, default=7, help="Messungen je Befehl, Median zählt (Default: 7)")
+    p_start.add_argument("--files", type=int, default=STARTUP_FILES,
+                         help=f"Dateien im Test-Vault (Default: {STARTUP_FILES})")
+    p_start.add_argument("--imports", type=int, default=0, metavar="N",
+                         help="zusätzlich die N teuersten Imports je Tool anzeigen")
+
+    p_mem = sub.add_parser("memory", help="Spitzen-RSS bei wachsendem Vault messen (konstanter Speicher?)")
+    p_mem.add_argument("--sizes", default=MEMORY_SIZES,
+                       help=f"Vault-Größen in Dateien, gleiche Ordnergröße (Default: {MEMORY_SIZES})")
+    p_mem.add_argument("--tools", default=",".join(MEMORY_TOOLS),
+                       help=f"Auswahl aus {', '.join(MEMORY_TOOLS)} (Default: alle)")
+    p_mem.add_argument("--tolerance-kb", type=int, default=MEMORY_TOLERANCE_KB,
+                       help=f"erlaubter Mehrbedarf der größten gegenüber der kleinsten Größe "
+                            f"(Default: {MEMORY_TOLERANCE_KB}) → Exit-Code 1")
+    vaultgen.add_spec_args(p_mem)
+
+    p_rt = sub.add_parser("roundtrips", help="Dateisystem-Aufrufe (Round-Trips) je Ordner zählen, "
+                                             "optional mit simulierter Latenz")
+    p_rt.add_argument("--files", default=ROUNDTRIP_FILES,
+                      help=f"Dateien im Test-Vault (Default: {ROUNDTRIP_FILES})")
+    p_rt.add_argument("--latency-ms", type=float, default=0.0,
+                      help="Verzögerung je Dateisystem-Operation in ms, z. B. 2 für ein SMB-Share (Default: 0)")
+    p_rt.add_argument("--tools", default=",".join(ROUNDTRIP_TOOLS),
+                      help=f"Auswahl aus {', '.join(ROUNDTRIP_TOOLS)} (Default: alle)")
+    p_rt.add_argument("--json", action="store_true", help="Ergebnis zusätzlich als JSON ausgeben")
+    vaultgen.add_spec_args(p_rt)
+
+    args = parser.parse_args(argv)
+    handlers = {"run": cmd_run, "compare": cmd_compare, "startup": cmd_startup, "memory": cmd_memory,
+                "roundtrips": cmd_roundtrips}
+    return handlers[args.command](args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
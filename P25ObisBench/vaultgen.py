@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+vaultgen – deterministischer synthetischer Vault für Benchmarks der Obis Tools.
+
+Gleiche VaultSpec (inkl. Seed) → byte-identischer Vault: Namen, Inhalte, Anhänge und
+mtimes (fest, damit %date%/%datum% reproduzierbar sind) hängen nur vom Seed ab.
+
+Aufbau:
+- Baum mit `depth` Ebenen und `fanout` Unterordnern je Ordner (Ebene 1 "SE1"…,
+  Ebene 2 "Modul01 (Teil A)"… – die Klammern prüfen %rootN()% –, darunter "Thema01"…).
+- `files` Dateien gleichmäßig auf alle Ordner unterhalb des Roots verteilt, davon der
+  Anteil `attachments` als Anhänge (.png/.pdf/.jpg), der Rest Notizen (.md).
+- Notizen: Text der Größe `note_size`, Wiki-Links auf Nachbarnotizen und Einbettungen
+  der Anhänge; Frontmatter je nach `frontmatter` (none/flat/nested/list/mixed).
+- Im Root: ObisRenamer.ini (levelN aus `levels`) und ObisDatabase.ini (Vorlage).
+
+    python vaultgen.py ./bench-vault --files 10000 --depth 3 --seed 1
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# ========== Einstellungen ==========
+FRONTMATTER_SHAPES = ("none", "flat", "nested", "list")
+ATTACHMENT_TYPES = (".png", ".pdf", ".jpg")
+ATTACHMENT_SIZE = (64, 2048)  # Bytes (min, max)
+BASE_MTIME = 1_700_000_000  # feste Zeitbasis für mtimes (2023-11-14)
+DEFAULT_LEVELS: Dict[int, str] = {
+    1: "%root1%",
+    2: "%root2()%",
+    3: "%date%%root1%%root2%%root3B%",
+    4: "%root2()%-%root3%-%root4%",
+}
+WORDS = ("Klausur", "Übung", "Skript", "Lösung", "Modell", "Daten", "Analyse", "Prozess",
+         "System", "Beispiel", "Aufgabe", "Theorie", "Praxis", "Notiz", "Quelle", "Methode")
+# ===================================
+
+
+@dataclass
+class VaultSpec:
+    files: int = 1000
+    depth: int = 3
+    fanout: Optional[int] = None  # None = aus per_dir berechnet
+    per_dir: int = 40  # angestrebte Dateien je Ordner bei automatischem fanout
+    note_size: Tuple[int, int] = (200, 4000)  # Textlänge in Zeichen (min, max)
+    frontmatter: str = "mixed"  # none/flat/nested/list/mixed
+    attachments: float = 0.3  # Anteil Anhänge an allen Dateien
+    levels: Dict[int, str] = field(default_factory=lambda: dict(DEFAULT_LEVELS))
+    seed: int = 1
+
+    def resolved_fanout(self) -> int:
+        """Kleinster fanout, bei dem alle Ordner zusammen höchstens per_dir Dateien tragen."""
+        if self.fanout:
+            return self.fanout
+        need = max(1, math.ceil(self.files / max(1, self.per_dir)))
+        fanout = 1
+        while sum(fanout ** k for k in range(1, self.depth + 1)) < need:
+            fanout += 1
+        return fanout
+
+
+@dataclass
+class VaultStats:
+    dirs: int = 0
+    notes: int = 0
+    attachments: int = 0
+    bytes: int = 0
+
+    @property
+    def files(self) -> int:
+        return self.notes + self.attachments
+
+
+def _dir_name(level: int, index: int) -> str:
+    if level == 1:
+        return f"SE{index + 1}"
+    if level == 2:
+        return f"Modul{index + 1:02d} (Teil {chr(ord('A') + index % 26)})"
+    return f"Thema{index + 1:02d}"
+
+
+def iter_dirs(root: Path, depth: int, fanout: int) -> List[Path]:
+    """Alle Ordner unterhalb von root in Pre-Order (deterministisch)."""
+    out: List[Path] = []
+
+    def walk(parent: Path, level: int) -> None:
+        for i in range(fanout):
+            d = parent / _dir_name(level, i)
+            out.append(d)
+            if level < depth:
+                walk(d, level + 1)
+
+    walk(root, 1)
+    return out
+
+
+def _text(rng: random.Random, size: int) -> str:
+    words: List[str] = []
+    length = 0
+    while length < size:
+        w = rng.choice(WORDS)
+        words.append(w)
+        length += len(w) + 1
+    lines = [" ".join(words[i:i + 12]) for i in range(0, len(words), 12)]
+    return "\n".join(lines) + "\n"
+
+
+def _frontmatter(rng: random.Random, shape: str, index: int) -> str:
+    if shape == "none":
+        return ""
+    if shape == "flat":
+        body = (f"Titel: Notiz {index}\nPunkte: {rng.randint(0, 45)}\n"
+                f"Status: {rng.choice(('offen', 'fertig'))}\n")
+    elif shape == "nested":
+        body = (f"Titel: Notiz {index}\nMeta:\n  Autor: {rng.choice(WORDS)}\n"
+                f"  Version: {rng.randint(1, 9)}\n")
+    else:
+        tags = rng.sample(WORDS, 3)
+        body = f"Titel: Notiz {index}\ntags:\n" + "".join(f"  - {t}\n" for t in tags)
+    return f"---\n{body}---\n"
+
+
+def note_content(rng: random.Random, spec: VaultSpec, index: int,
+                 siblings: List[str], attachments: List[str]) -> str:
+    shape = rng.choice(FRONTMATTER_SHAPES) if spec.frontmatter == "mixed" else spec.frontmatter
+    links = "".join(f"[[{n}]] " for n in rng.sample(siblings, min(2, len(siblings))))
+    embeds = "".join(f"![[{a}]]\n" for a in attachments[:2])
+    size = rng.randint(*spec.note_size)
+    return f"{_frontmatter(rng, shape, index)}# Notiz {index}\n\n{links}\n{embeds}\n{_text(rng, size)}"
+
+
+def renamer_ini(levels: Dict[int, str]) -> str:
+    patterns = "".join(f"level{lvl} = {pat}\n" for lvl, pat in sorted(levels.items()))
+    return ("; erzeugt von vaultgen.py\n"
+            f"[patterns]\n{patterns}\n"
+            "[options]\nnumbering_width = 2\nuse_birthtime = false\n\n"
+            "[excludes]\nfolders =\n    .git,\n    .obsidian,\n"
+            "filetypes =\n    .md,\n    .ini,\n    .json\n")
+
+
+DATABASE_INI = """# erzeugt von vaultgen.py
+_settings:
+  key_mode: merge
+  selective_processing_active: false
+  exclude_folders:
+    - .git
+    - .obsidian
+Name: "%data%"
+Semester: "%root1%"
+Modul: "%root2%"
+Ordner: "%folder1%"
+Punkte: "%wert%"
+tags:
+  - "Benchmark"
+"""
+
+
+def generate(root: Path, spec: VaultSpec) -> VaultStats:
+    """Erzeugt den Vault unter root (root muss leer sein oder fehlen)."""
+    if root.exists() and any(root.iterdir()):
+        raise FileExistsError(f"Zielordner ist nicht leer: {root}")
+    rng = random.Random(spec.seed)
+    stats = VaultStats()
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "ObisRenamer.ini").write_text(renamer_ini(spec.levels), encoding="utf-8")
+    (root / "ObisDatabase.ini").write_text(DATABASE_INI, encoding="utf-8")
+
+    dirs = iter_dirs(root, spec.depth, spec.resolved_fanout())
+    per_dir, extra = divmod(spec.files, len(dirs))
+    counter = 0
+    for i, d in enumerate(dirs):
+        d.mkdir()
+        stats.dirs += 1
+        count = per_dir + (1 if i < extra else 0)
+        n_att = round(count * spec.attachments)
+        attachments = [f"bild{k:04d}{rng.choice(ATTACHMENT_TYPES)}" for k in range(n_att)]
+        notes = [f"Notiz {k:04d}" for k in range(count - n_att)]
+        written: List[Path] = []
+        for name in attachments:
+            data = rng.randbytes(rng.randint(*ATTACHMENT_SIZE))
+            (d / name).write_bytes(data)
+            written.append(d / name)
+            stats.attachments += 1
+            stats.bytes += len(data)
+        for k, name in enumerate(notes):
+            content = note_content(rng, spec, counter + k, notes, attachments[k:k + 2])
+            data = content.encode("utf-8")
+            (d / f"{name}.md").write_bytes(data)
+            written.append(d / f"{name}.md")
+            stats.notes += 1
+            stats.bytes += len(data)
+        for path in written:
+            counter += 1
+            os.utime(path, (BASE_MTIME + counter, BASE_MTIME + counter))
+    return stats
+
+
+def parse_levels(values: List[str]) -> Dict[int, str]:
+    """['1=%root1%', '3=%date%'] -> {1: '%root1%', 3: '%date%'}"""
+    levels: Dict[int, str] = {}
+    for v in values:
+        lvl, sep, pattern = v.partition("=")
+        if not sep or not lvl.strip().isdigit():
+            raise ValueError(f"Ungültiges Ebenen-Pattern (erwartet N=PATTERN): {v}")
+        levels[int(lvl)] = pattern.strip()
+    return levels
+
+
+def parse_count(text: str) -> int:
+    """'10k' -> 10000, '1M' -> 1000000."""
+    text = text.strip()
+    factor = {"k": 1_000, "m": 1_000_000}.get(text[-1:].lower(), 1)
+    return int(float(text[:-1] if factor > 1 else text) * factor)
+
+
+def add_spec_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--depth", type=int, default=VaultSpec.depth, help="Ordnerebenen (Default: 3)")
+    parser.add_argument("--fanout", type=int, default=None,
+                        help="Unterordner je Ordner (Default: automatisch aus --per-dir)")
+    parser.add_argument("--per-dir", type=int, default=VaultSpec.per_dir,
+                        help="angestrebte Dateien je Ordner bei automatischem --fanout (Default: 40)")
+    parser.add_argument("--note-size", default="200-4000", metavar="MIN-MAX",
+                        help="Textlänge der Notizen in Zeichen (Default: 200-4000)")
+    parser.add_argument("--frontmatter", choices=FRONTMATTER_SHAPES + ("mixed",), default="mixed",
+                        help="Frontmatter-Form der Notizen (Default: mixed)")
+    parser.add_argument("--attachments", type=float, default=VaultSpec.attachments,
+                        help="Anteil Anhänge an allen Dateien, 0..1 (Default: 0.3)")
+    parser.add_argument("--level", action="append", default=[], metavar="N=PATTERN",
+                        help="Renamer-Pattern je Ebene (mehrfach; Default: wie ObisRenamer.ini)")
+    parser.add_argument("--seed", type=int, default=VaultSpec.seed, help="Zufalls-Seed (Default: 1)")
+
+
+def spec_from_args(args: argparse.Namespace, files: int) -> VaultSpec:
+    lo, _, hi = args.note_size.partition("-")
+    return VaultSpec(
+        files=files, depth=args.depth, fanout=args.fanout, per_dir=args.per_dir,
+        note_size=(int(lo), int(hi or lo)), frontmatter=args.frontmatter,
+        attachments=args.attachments,
+        levels=parse_levels(args.level) if args.level else dict(DEFAULT_LEVELS),
+        seed=args.seed,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Deterministischen synthetischen Vault erzeugen.")
+    parser.add_argument("target", type=Path, help="Zielordner (leer oder nicht vorhanden)")
+    parser.add_argument("--files", default="1k", help="Anzahl Dateien, z. B. 1000, 10k, 1M (Default: 1k)")
+    add_spec_args(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        spec = spec_from_args(args, parse_count(args.files))
+        stats = generate(args.target, spec)
+    except (ValueError, FileExistsError) as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 2
+    print(f"Vault erzeugt: {args.target} – Ordner: {stats.dirs}, Notizen: {stats.notes}, "
+          f"Anhänge: {stats.attachments}, {stats.bytes / 1e6:.1f} MB (fanout {spec.resolved_fanout()}).")
+    print(f"Spezifikation: {asdict(spec)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
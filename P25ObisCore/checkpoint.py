@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Checkpoints für lange Läufe: wie weit ist die (deterministische) Traversierung gekommen?
+
+Die Tools gehen den Vault in Pre-Order mit nach Namen (ohne Groß-/Kleinschreibung)
+sortierten Unterordnern durch. In dieser Reihenfolge ist jeder Ordner durch seinen
+Schlüssel – die Liste der relativen Pfadteile in Kleinbuchstaben – total geordnet:
+("a",) < ("a", "b") < ("b",). Ein Checkpoint merkt sich daher nur den Schlüssel des
+zuletzt *vollständig* verarbeiteten Ordners plus Zähler, nicht die Menge aller Ordner.
+
+    cp = Checkpoint.load(path, options, root) if resume else None
+    writer = CheckpointWriter(path, options, root)
+    for d in walk(root, prune=lambda d: cp is not None and cp.subtree_done(d)):
+        if cp is not None and cp.done(d):
+            continue
+        process(d)
+        writer.reached(d, {"files": n})  # speichert höchstens alle `every` Sekunden
+    writer.clear()                        # Lauf vollständig -> Checkpoint löschen
+
+- Ein abgebrochener Ordner wird beim Fortsetzen komplett neu verarbeitet (die Tools
+  sind idempotent). Ordner, die seitdem neu hinzugekommen sind und vor der Position
+  liegen, werden erst beim nächsten vollständigen Lauf erfasst.
+- options: die Aufrufoptionen des Laufs; passen sie beim Fortsetzen nicht, wird der
+  Checkpoint ignoriert (load() liefert None).
+- Geschrieben wird atomar (temporäre Datei + replace) über das Dateisystem-Backend fs
+  (fsbackend; Standard: echtes Dateisystem).
+
+Genutzt von ObisDatabase und P25ObisLinks (--resume).
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from fsbackend import OS, FileSystem
+
+CHECKPOINT_VERSION = 1
+CHECKPOINT_SECONDS = 30.0  # Standard: höchstens alle N Sekunden schreiben
+
+
+def dir_key(root: Path, path: Path) -> List[str]:
+    """Schlüssel eines Ordners in Traversierungsreihenfolge (Root = [])."""
+    return [part.lower() for part in path.relative_to(root).parts]
+
+
+class Checkpoint:
+    """Gelesener Checkpoint: Position (zuletzt fertiger Ordner) und Zähler bis dorthin."""
+
+    def __init__(self, root: Path, position: Sequence[str], where: str, counters: Dict[str, int]):
+        self.root = root
+        self.position = list(position)
+        self.where = where  # Position als relativer Pfad (für Meldungen)
+        self.counters = counters
+
+    @classmethod
+    def load(cls, path: Path, options: Dict[str, Any], root: Path,
+             fs: FileSystem = OS) -> Optional["Checkpoint"]:
+        """None, wenn es keinen (lesbaren, passenden) Checkpoint gibt."""
+        try:
+            data = json.loads(fs.read_text(path, encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if (not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION
+                or data.get("options") != options or not isinstance(data.get("position"), list)):
+            return None
+        return cls(root, data["position"], str(data.get("where") or "."),
+                   {k: int(v) for k, v in (data.get("counters") or {}).items()})
+
+    def done(self, folder: Path) -> bool:
+        """Ordner liegt vor der Position oder ist sie selbst -> bereits erledigt."""
+        return dir_key(self.root, folder) <= self.position
+
+    def subtree_done(self, folder: Path) -> bool:
+        """Ordner *samt* Unterordnern erledigt (Position liegt nicht darunter) -> gar nicht betreten."""
+        key = dir_key(self.root, folder)
+        return key < self.position and self.position[:len(key)] != key
+
+
+class CheckpointWriter:
+    """Schreibt den Fortschritt periodisch; clear() nach erfolgreichem Lauf."""
+
+    def __init__(self, path: Path, options: Dict[str, Any], root: Path,
+                 every: float = CHECKPOINT_SECONDS, fs: FileSystem = OS):
+        self.path = path
+        self.fs = fs
+        self.options = options
+        self.root = root
+        self.every = every
+        self._last = time.monotonic()
+        self._folder: Optional[Path] = None  # zuletzt fertiger Ordner
+        self._counters: Dict[str, int] = {}  # Zähler bis einschließlich _folder
+        self.saved = 0  # Anzahl geschriebener Checkpoints
+
+    def reached(self, folder: Path, counters: Dict[str, int]) -> None:
+        """folder ist vollständig verarbeitet; speichert, wenn every abgelaufen ist."""
+        self._folder = folder
+        self._counters = dict(counters)
+        now = time.monotonic()
+        if now - self._last >= self.every:
+            self._last = now
+            self.save()
+
+    def save(self) -> None:
+        """Stand des zuletzt fertigen Ordners sofort schreiben (z. B. beim Abbruch)."""
+        if self._folder is None:
+            return
+        rel = self._folder.relative_to(self.root).as_posix()
+        payload = json.dumps({"version": CHECKPOINT_VERSION, "options": self.options,
+                              "position": dir_key(self.root, self._folder),
+                              "where": rel, "counters": self._counters,
+                              "saved": time.strftime("%Y-%m-%dT%H:%M:%S")},
+                             ensure_ascii=False, indent=1)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        self.fs.write_text(tmp, payload + "\n", encoding="utf-8")
+        self.fs.replace(tmp, self.path)
+        self.saved += 1
+
+    def clear(self) -> None:
+        try:
+            self.fs.unlink(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,876 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Austauschbares Dateisystem für die Obis-Tools (Durchlauf, stat, lesen, schreiben, umbenennen).
+
+    fs = MemoryFileSystem.load(Path("Vault"))         # Vault einmal in den Speicher laden
+    slow = LatencyFileSystem(fs, latency=0.002)       # 2 ms je Aufruf, wie ein SMB-Share
+    ObisDatabase.run(Path("Vault").resolve(), fs=slow)
+    print(slow.summary())                             # Aufrufe je Operation und je Ordner
+
+- OSFileSystem: das echte Dateisystem (Standard, OS); reicht an os/pathlib durch.
+- MemoryFileSystem: Baum im Speicher, deterministische mtimes (eigene Uhr, 1 ms je
+  Schreibvorgang) – für schnelle, reproduzierbare Tests und Benchmarks ohne Platten-Cache.
+- LatencyFileSystem: Hülle um ein anderes Dateisystem; wartet je Operation eine
+  einstellbare Zeit (simuliert Netzlaufwerke) und zählt die Aufrufe, d. h. die Round-Trips,
+  die auf einem Share anfielen.
+- OverlayFileSystem: Copy-on-Write über einem anderen Dateisystem (meist dem echten
+  Vault). Gelesen wird aus der Basis, geschrieben/umbenannt/gelöscht nur im Speicher;
+  changes() und diff() beschreiben danach, was ein echter Lauf geändert hätte.
+
+Pfade sind Path-Objekte wie in den Tools (in der Regel absolut). scandir() liefert eine
+Liste von Einträgen mit name, path, is_dir(), is_file(), is_symlink() und stat() wie
+os.DirEntry; stat() liefert mindestens st_size, st_mtime, st_mtime_ns.
+
+Genutzt von ObisRenamer, ObisDatabase, P25ObisLinks und ObisPipeline (Modulvariable FS,
+run(..., fs=...)); ObisBench misst damit Round-Trips je Ordner (`bench roundtrips`),
+der Trockenlauf der Pipeline läuft auf einem OverlayFileSystem.
+"""
+
+import errno
+import io
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+# Operationen der Schnittstelle (für Zählung/Latenz); walk() besteht aus scandir-Aufrufen
+OPS = ("scandir", "stat", "exists", "is_file", "is_dir", "is_symlink", "read", "write",
+       "create", "rename", "replace", "unlink", "mkdir", "resolve")
+
+
+def _error(code: int, path: Any) -> OSError:
+    exc_type = {errno.ENOENT: FileNotFoundError, errno.EEXIST: FileExistsError,
+                errno.EISDIR: IsADirectoryError, errno.ENOTDIR: NotADirectoryError}.get(code, OSError)
+    return exc_type(code, os.strerror(code), str(path))
+
+
+class FileSystem:
+    """Schnittstelle. walk() ist generisch über scandir() implementiert."""
+
+    def scandir(self, path: Path) -> List[Any]:
+        raise NotImplementedError
+
+    def stat(self, path: Path) -> Any:
+        raise NotImplementedError
+
+    def exists(self, path: Path) -> bool:
+        raise NotImplementedError
+
+    def is_file(self, path: Path) -> bool:
+        raise NotImplementedError
+
+    def is_dir(self, path: Path) -> bool:
+        raise NotImplementedError
+
+    def is_symlink(self, path: Path) -> bool:
+        raise NotImplementedError
+
+    def read_bytes(self, path: Path) -> bytes:
+        raise NotImplementedError
+
+    def open_read(self, path: Path) -> BinaryIO:
+        """Binär lesen (z. B. nur den Anfang oder in Blöcken); mit `with` schließen."""
+        raise NotImplementedError
+
+    def write_bytes(self, path: Path, data: bytes) -> None:
+        raise NotImplementedError
+
+    def create(self, path: Path, data: bytes) -> None:
+        """Datei nur anlegen, wenn es sie noch nicht gibt (sonst FileExistsError) – Sperrdateien."""
+        raise NotImplementedError
+
+    def rename(self, src: Path, dst: Path) -> None:
+        raise NotImplementedError
+
+    def replace(self, src: Path, dst: Path) -> None:
+        raise NotImplementedError
+
+    def unlink(self, path: Path) -> None:
+        raise NotImplementedError
+
+    def mkdir(self, path: Path, parents: bool = False, exist_ok: bool = False) -> None:
+        raise NotImplementedError
+
+    def resolve(self, path: Path) -> Path:
+        raise NotImplementedError
+
+    # ---------- abgeleitet ----------
+
+    def read_text(self, path: Path, encoding: str = "utf-8", errors: str = "strict") -> str:
+        """Wie Path.read_text: universelle Zeilenenden (\\r\\n/\\r -> \\n)."""
+        text = self.read_bytes(path).decode(encoding, errors)
+        return text.replace("\r\n", "\n").replace("\r", "\n") if "\r" in text else text
+
+    def write_text(self, path: Path, text: str, encoding: str = "utf-8",
+                   newline: Optional[str] = None) -> None:
+        """Wie Path.write_text (newline=None -> os.linesep)."""
+        nl = os.linesep if newline is None else newline
+        if nl not in ("", "\n"):
+            text = text.replace("\n", nl)
+        self.write_bytes(path, text.encode(encoding))
+
+    def walk(self, top: Path) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """Wie os.walk(top) (topdown, ohne Symlinks zu folgen, unlesbare Ordner still übersprungen)."""
+        try:
+            entries = self.scandir(Path(top))
+        except OSError:
+            return
+        dirs: List[str] = []
+        files: List[str] = []
+        links: set = set()
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                dirs.append(entry.name)
+                if entry.is_symlink():
+                    links.add(entry.name)
+            else:
+                files.append(entry.name)
+        yield str(top), dirs, files
+        for name in dirs:
+            if name not in links:
+                yield from self.walk(Path(top, name))
+
+
+class OSFileSystem(FileSystem):
+    """Das echte Dateisystem."""
+
+    def scandir(self, path: Path) -> List[os.DirEntry]:
+        with os.scandir(path) as it:
+            return list(it)
+
+    def walk(self, top: Path) -> Iterator[Tuple[str, List[str], List[str]]]:
+        return os.walk(top)
+
+    def stat(self, path: Path) -> os.stat_result:
+        return os.stat(path)
+
+    def exists(self, path: Path) -> bool:
+        return os.path.exists(path)
+
+    def is_file(self, path: Path) -> bool:
+        return os.path.isfile(path)
+
+    def is_dir(self, path: Path) -> bool:
+        return os.path.isdir(path)
+
+    def is_symlink(self, path: Path) -> bool:
+        return os.path.islink(path)
+
+    def read_bytes(self, path: Path) -> bytes:
+        with open(path, "rb") as fh:
+            return fh.read()
+
+    def read_text(self, path: Path, encoding: str = "utf-8", errors: str = "strict") -> str:
+        with open(path, "r", encoding=encoding, errors=errors) as fh:
+            return fh.read()
+
+    def open_read(self, path: Path) -> BinaryIO:
+        return open(path, "rb")
+
+    def write_bytes(self, path: Path, data: bytes) -> None:
+        with open(path, "wb") as fh:
+            fh.write(data)
+
+    def create(self, path: Path, data: bytes) -> None:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+
+    def write_text(self, path: Path, text: str, encoding: str = "utf-8",
+                   newline: Optional[str] = None) -> None:
+        with open(path, "w", encoding=encoding, newline=newline) as fh:
+            fh.write(text)
+
+    def rename(self, src: Path, dst: Path) -> None:
+        os.rename(src, dst)
+
+    def replace(self, src: Path, dst: Path) -> None:
+        os.replace(src, dst)
+
+    def unlink(self, path: Path) -> None:
+        os.unlink(path)
+
+    def mkdir(self, path: Path, parents: bool = False, exist_ok: bool = False) -> None:
+        Path(path).mkdir(parents=parents, exist_ok=exist_ok)
+
+    def resolve(self, path: Path) -> Path:
+        return Path(path).resolve()
+
+
+OS = OSFileSystem()  # Standard-Backend aller Tools
+
+
+# ---------- Speicher ----------
+
+class MemoryStat:
+    """stat-Ergebnis eines Eintrags im Speicher-Dateisystem."""
+    __slots__ = ("st_size", "st_mtime_ns", "st_mode")
+
+    def __init__(self, size: int, mtime_ns: int, is_dir: bool):
+        self.st_size = size
+        self.st_mtime_ns = mtime_ns
+        self.st_mode = 0o40755 if is_dir else 0o100644
+
+    @property
+    def st_mtime(self) -> float:
+        return self.st_mtime_ns / 1e9
+
+    @property
+    def st_ctime(self) -> float:
+        return self.st_mtime
+
+
+class _Node:
+    __slots__ = ("data", "children", "mtime_ns")
+
+    def __init__(self, data: Optional[bytes], mtime_ns: int):
+        self.data = data  # None = Ordner
+        self.children: Optional[Dict[str, "_Node"]] = {} if data is None else None
+        self.mtime_ns = mtime_ns
+
+
+class MemoryEntry:
+    """Eintrag aus MemoryFileSystem.scandir (Schnittstelle wie os.DirEntry)."""
+    __slots__ = ("name", "path", "_node")
+
+    def __init__(self, parent: str, name: str, node: _Node):
+        self.name = name
+        self.path = os.path.join(parent, name)
+        self._node = node
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        return self._node.data is None
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        return self._node.data is not None
+
+    def is_symlink(self) -> bool:
+        return False
+
+    def stat(self, follow_symlinks: bool = True) -> MemoryStat:
+        node = self._node
+        return MemoryStat(0 if node.data is None else len(node.data), node.mtime_ns, node.data is None)
+
+
+class MemoryFileSystem(FileSystem):
+    """
+    Dateibaum im Speicher (keine Symlinks). Einträge eines Ordners behalten die Reihenfolge
+    ihres Anlegens (wie scandir ein festes, aber unsortiertes Listing liefert).
+    """
+
+    EPOCH_NS = 1_700_000_000 * 10**9  # Startwert der eigenen Uhr
+    TICK_NS = 10**6  # 1 ms je Schreibvorgang
+
+    def __init__(self) -> None:
+        self._roots: Dict[str, _Node] = {}
+        import threading  # nur für Speicher/Latenz – nicht beim Start der Tools laden
+
+        self._clock = self.EPOCH_NS
+        self._lock = threading.RLock()
+
+    @classmethod
+    def load(cls, root: Path, source: Optional[FileSystem] = None) -> "MemoryFileSystem":
+        """Kopiert den Baum unter root (aus source, Standard: echtes Dateisystem) unter demselben Pfad."""
+        source = source if source is not None else OS
+        root = source.resolve(Path(root))
+        fs = cls()
+        fs.mkdir(root, parents=True, exist_ok=True)
+        for curr, dirs, files in source.walk(root):
+            base = Path(curr)
+            for name in dirs:
+                if not source.is_symlink(base / name):
+                    fs.mkdir(base / name, exist_ok=True)
+            for name in files:
+                p = base / name
+                try:
+                    fs._put(p, source.read_bytes(p), source.stat(p).st_mtime_ns)
+                except OSError:
+                    continue  # Symlink ins Leere, unlesbar
+        return fs
+
+    # ---------- intern ----------
+
+    def _tick(self) -> int:
+        self._clock += self.TICK_NS
+        return self._clock
+
+    @staticmethod
+    def _parts(path: Path) -> Tuple[str, List[str]]:
+        norm = os.path.normpath(str(path))
+        p = Path(norm)
+        anchor = p.anchor
+        parts = list(p.parts[1:] if anchor else p.parts)
+        return anchor, [part for part in parts if part not in ("", ".")]
+
+    def _find(self, path: Path) -> Optional[_Node]:
+        anchor, parts = self._parts(path)
+        node = self._roots.get(anchor)
+        for part in parts:
+            if node is None or node.children is None:
+                return None
+            node = node.children.get(part)
+        return node
+
+    def _parent(self, path: Path) -> Tuple[_Node, str]:
+        """(Elternordner, Name); Fehler wie das OS, wenn der Elternordner fehlt."""
+        anchor, parts = self._parts(path)
+        if not parts:
+            raise _error(errno.EEXIST, path)
+        node = self._roots.get(anchor)
+        for part in parts[:-1]:
+            if node is None:
+                break
+            if node.children is None:
+                raise _error(errno.ENOTDIR, path)
+            node = node.children.get(part)
+        if node is None:
+            raise _error(errno.ENOENT, path)
+        if node.children is None:
+            raise _error(errno.ENOTDIR, path)
+        return node, parts[-1]
+
+    def _get(self, path: Path) -> _Node:
+        node = self._find(path)
+        if node is None:
+            raise _error(errno.ENOENT, path)
+        return node
+
+    def _put(self, path: Path, data: bytes, mtime_ns: Optional[int] = None) -> None:
+        with self._lock:
+            parent, name = self._parent(path)
+            existing = parent.children.get(name)
+            if existing is not None and existing.data is None:
+                raise _error(errno.EISDIR, path)
+            parent.children[name] = _Node(bytes(data), self._tick() if mtime_ns is None else mtime_ns)
+            parent.mtime_ns = self._clock
+
+    # ---------- Schnittstelle ----------
+
+    def scandir(self, path: Path) -> List[MemoryEntry]:
+        node = self._get(path)
+        if node.children is None:
+            raise _error(errno.ENOTDIR, path)
+        with self._lock:
+            items = list(node.children.items())
+        parent = str(path)
+        return [MemoryEntry(parent, name, child) for name, child in items]
+
+    def stat(self, path: Path) -> MemoryStat:
+        node = self._get(path)
+        return MemoryStat(0 if node.data is None else len(node.data), node.mtime_ns, node.data is None)
+
+    def exists(self, path: Path) -> bool:
+        return self._find(path) is not None
+
+    def is_file(self, path: Path) -> bool:
+        node = self._find(path)
+        return node is not None and node.data is not None
+
+    def is_dir(self, path: Path) -> bool:
+        node = self._find(path)
+        return node is not None and node.data is None
+
+    def is_symlink(self, path: Path) -> bool:
+        return False
+
+    def read_bytes(self, path: Path) -> bytes:
+        node = self._get(path)
+        if node.data is None:
+            raise _error(errno.EISDIR, path)
+        return node.data
+
+    def open_read(self, path: Path) -> BinaryIO:
+        return io.BytesIO(self.read_bytes(path))
+
+    def write_bytes(self, path: Path, data: bytes) -> None:
+        self._put(path, data)
+
+    def create(self, path: Path, data: bytes) -> None:
+        with self._lock:
+            if self.exists(path):
+                raise _error(errno.EEXIST, path)
+            self._put(path, data)
+
+    def rename(self, src: Path, dst: Path) -> None:
+        with self._lock:
+            src_parent, src_name = self._parent(src)
+            node = src_parent.children.get(src_name)
+            if node is None:
+                raise _error(errno.ENOENT, src)
+            dst_parent, dst_name = self._parent(dst)
+            target = dst_parent.children.get(dst_name)
+            if target is not None and target is not node:
+                if target.data is None:
+                    raise _error(errno.EISDIR if node.data is not None else errno.EEXIST, dst)
+                if node.data is None:
+                    raise _error(errno.ENOTDIR, dst)
+            del src_parent.children[src_name]
+            dst_parent.children[dst_name] = node
+            src_parent.mtime_ns = dst_parent.mtime_ns = self._tick()
+
+    def replace(self, src: Path, dst: Path) -> None:
+        self.rename(src, dst)
+
+    def unlink(self, path: Path) -> None:
+        with self._lock:
+            parent, name = self._parent(path)
+            node = parent.children.get(name)
+            if node is None:
+                raise _error(errno.ENOENT, path)
+            if node.data is None:
+                raise _error(errno.EISDIR, path)
+            del parent.children[name]
+            parent.mtime_ns = self._tick()
+
+    def mkdir(self, path: Path, parents: bool = False, exist_ok: bool = False) -> None:
+        with self._lock:
+            anchor, parts = self._parts(path)
+            if anchor not in self._roots:
+                if parts and not parents:
+                    raise _error(errno.ENOENT, path)
+                self._roots[anchor] = _Node(None, self._clock)
+                if not parts:
+                    return
+            node = self._roots[anchor]
+            for i, part in enumerate(parts):
+                child = node.children.get(part)
+                last = i == len(parts) - 1
+                if child is None:
+                    if not last and not parents:
+                        raise _error(errno.ENOENT, path)
+                    child = _Node(None, self._tick())
+                    node.children[part] = child
+                    node.mtime_ns = self._clock
+                elif child.data is not None:
+                    raise _error(errno.ENOTDIR if not last else errno.EEXIST, path)
+                elif last and not exist_ok:
+                    raise _error(errno.EEXIST, path)
+                node = child
+
+    def resolve(self, path: Path) -> Path:
+        return Path(os.path.normpath(os.path.join(os.getcwd(), str(path))))
+
+
+# ---------- Overlay (Copy-on-Write) ----------
+
+class OverlayChange:
+    """
+    Eine Änderung des Overlays gegenüber der Basis.
+    kind: created, modified, deleted, renamed (old_path -> path; changed = Inhalt ebenfalls geändert).
+    """
+    __slots__ = ("kind", "path", "old_path", "changed")
+
+    def __init__(self, kind: str, path: Path, old_path: Optional[Path] = None, changed: bool = True):
+        self.kind = kind
+        self.path = path
+        self.old_path = old_path
+        self.changed = changed
+
+    def __repr__(self) -> str:
+        return f"OverlayChange({self.kind!r}, {str(self.path)!r}, old_path={self.old_path!r}, changed={self.changed})"
+
+
+class _OverlayEntry:
+    """Listing-Eintrag einer im Overlay geschriebenen Datei bzw. angelegten Ordners."""
+    __slots__ = ("name", "path", "_fs")
+
+    def __init__(self, parent: str, name: str, fs: "OverlayFileSystem"):
+        self.name = name
+        self.path = os.path.join(parent, name)
+        self._fs = fs
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        return self._fs.is_dir(Path(self.path))
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        return self._fs.is_file(Path(self.path))
+
+    def is_symlink(self) -> bool:
+        return False
+
+    def stat(self, follow_symlinks: bool = True) -> MemoryStat:
+        return self._fs.stat(Path(self.path))
+
+
+class OverlayFileSystem(FileSystem):
+    """
+    Copy-on-Write über base: Schreiben, Umbenennen (mtime bleibt wie beim echten rename),
+    Löschen und mkdir landen nur im Speicher; alles Übrige liest base. Die Basis wird nie
+    verändert. Nur Dateien lassen sich umbenennen/löschen, keine Ordner.
+
+        overlay = OverlayFileSystem(OS)
+        pipeline.Pipeline(root, cfg, fs=overlay).run()   # schreibt nur ins Overlay
+        for change in overlay.changes(): ...              # was auf der Platte passiert wäre
+    """
+
+    def __init__(self, base: FileSystem = OS):
+        import threading  # nur für den Trockenlauf – nicht beim Start der Tools laden
+
+        self.base = base
+        self._files: Dict[str, Tuple[bytes, int]] = {}  # Pfad -> (Inhalt, mtime_ns)
+        self._dirs: set = set()  # im Overlay angelegte Ordner
+        self._deleted: set = set()  # in der Basis vorhandene, im Overlay gelöschte Dateien
+        self._added: Dict[str, Dict[str, None]] = {}  # Ordner -> im Overlay hinzugekommene Namen
+        self._origin: Dict[str, str] = {}  # umbenannte Datei -> ursprünglicher Pfad in der Basis
+        self._clock = MemoryFileSystem.EPOCH_NS
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return os.path.normpath(str(path))
+
+    def _shadowed(self, key: str) -> bool:
+        """Eintrag gehört dem Overlay (Basis nicht fragen)."""
+        return key in self._files or key in self._dirs or key in self._deleted
+
+    def _track(self, key: str, present: bool) -> None:
+        parent, name = os.path.split(key)
+        names = self._added.setdefault(parent, {})
+        if present:
+            names[name] = None
+        else:
+            names.pop(name, None)
+
+    # ---------- lesen ----------
+
+    def scandir(self, path: Path) -> List[Any]:
+        key = self._key(path)
+        if key in self._deleted or key in self._files:
+            raise _error(errno.ENOENT if key in self._deleted else errno.ENOTDIR, path)
+        try:
+            base_entries = self.base.scandir(path) if key not in self._dirs else []
+        except FileNotFoundError:
+            base_entries = []
+            if key not in self._dirs:
+                raise
+        with self._lock:
+            added = list(self._added.get(key, {}))
+            entries: List[Any] = []
+            seen = set()
+            for entry in base_entries:
+                child = os.path.join(key, entry.name)
+                seen.add(entry.name)
+                if child in self._deleted and child not in self._files:
+                    continue
+                entries.append(_OverlayEntry(key, entry.name, self) if self._shadowed(child) else entry)
+            entries += [_OverlayEntry(key, name, self) for name in added if name not in seen]
+        return entries
+
+    def stat(self, path: Path) -> Any:
+        key = self._key(path)
+        hit = self._files.get(key)
+        if hit is not None:
+            return MemoryStat(len(hit[0]), hit[1], False)
+        if key in self._dirs:
+            return MemoryStat(0, self._clock, True)
+        if key in self._deleted:
+            raise _error(errno.ENOENT, path)
+        return self.base.stat(path)
+
+    def exists(self, path: Path) -> bool:
+        key = self._key(path)
+        if key in self._files or key in self._dirs:
+            return True
+        return key not in self._deleted and self.base.exists(path)
+
+    def is_file(self, path: Path) -> bool:
+        key = self._key(path)
+        if self._shadowed(key):
+            return key in self._files
+        return self.base.is_file(path)
+
+    def is_dir(self, path: Path) -> bool:
+        key = self._key(path)
+        if self._shadowed(key):
+            return key in self._dirs
+        return self.base.is_dir(path)
+
+    def is_symlink(self, path: Path) -> bool:
+        return False if self._shadowed(self._key(path)) else self.base.is_symlink(path)
+
+    def read_bytes(self, path: Path) -> bytes:
+        key = self._key(path)
+        hit = self._files.get(key)
+        if hit is not None:
+            return hit[0]
+        if key in self._deleted:
+            raise _error(errno.ENOENT, path)
+        return self.base.read_bytes(path)
+
+    def read_text(self, path: Path, encoding: str = "utf-8", errors: str = "strict") -> str:
+        if self._shadowed(self._key(path)):
+            return FileSystem.read_text(self, path, encoding, errors)
+        return self.base.read_text(path, encoding, errors)
+
+    def open_read(self, path: Path) -> BinaryIO:
+        if self._shadowed(self._key(path)):
+            return io.BytesIO(self.read_bytes(path))
+        return self.base.open_read(path)
+
+    def resolve(self, path: Path) -> Path:
+        return self.base.resolve(path)
+
+    # ---------- schreiben (nur im Speicher) ----------
+
+    def _check_parent(self, path: Path) -> None:
+        parent = Path(path).parent
+        if not self.is_dir(parent):
+            raise _error(errno.ENOENT, path)
+
+    def write_bytes(self, path: Path, data: bytes) -> None:
+        key = self._key(path)
+        with self._lock:
+            self._check_parent(path)
+            if self.is_dir(path):
+                raise _error(errno.EISDIR, path)
+            self._clock += MemoryFileSystem.TICK_NS
+            self._files[key] = (bytes(data), self._clock)
+            self._track(key, True)
+
+    def create(self, path: Path, data: bytes) -> None:
+        with self._lock:
+            if self.exists(path):
+                raise _error(errno.EEXIST, path)
+            self.write_bytes(path, data)
+
+    def rename(self, src: Path, dst: Path) -> None:
+        src_key, dst_key = self._key(src), self._key(dst)
+        with self._lock:
+            if self.is_dir(src):
+                raise _error(errno.EISDIR, src)  # Ordner umbenennen kann das Overlay nicht
+            data, mtime_ns = self.read_bytes(src), self.stat(src).st_mtime_ns
+            self._check_parent(dst)
+            if self.is_dir(dst):
+                raise _error(errno.EISDIR, dst)
+            if src_key == dst_key:
+                return
+            origin = self._origin.pop(src_key, None)
+            if origin is None and src_key not in self._files:
+                origin = src_key  # Datei stammt aus der Basis
+            self._remove(src_key)
+            self._files[dst_key] = (data, mtime_ns)
+            self._track(dst_key, True)
+            if origin is not None:
+                self._origin[dst_key] = origin
+
+    def replace(self, src: Path, dst: Path) -> None:
+        self.rename(src, dst)
+
+    def unlink(self, path: Path) -> None:
+        key = self._key(path)
+        with self._lock:
+            if self.is_dir(path):
+                raise _error(errno.EISDIR, path)
+            if not self.is_file(path):
+                raise _error(errno.ENOENT, path)
+            self._origin.pop(key, None)
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        self._files.pop(key, None)
+        self._track(key, False)
+        if self.base.exists(Path(key)):
+            self._deleted.add(key)
+
+    def mkdir(self, path: Path, parents: bool = False, exist_ok: bool = False) -> None:
+        with self._lock:
+            if self.is_dir(path):
+                if not exist_ok:
+                    raise _error(errno.EEXIST, path)
+                return
+            if self.exists(path):
+                raise _error(errno.EEXIST, path)
+            parent = Path(path).parent
+            if not self.is_dir(parent):
+                if not parents or parent == Path(path):
+                    raise _error(errno.ENOENT, path)
+                self.mkdir(parent, parents=True, exist_ok=True)
+            key = self._key(path)
+            self._dirs.add(key)
+            self._deleted.discard(key)
+            self._track(key, True)
+
+    # ---------- Ergebnis ----------
+
+    def changes(self) -> List[OverlayChange]:
+        """Änderungen gegenüber der Basis, nach Pfad sortiert; unverändert Geschriebenes fehlt."""
+        with self._lock:
+            files = dict(self._files)
+            deleted = set(self._deleted)
+            origin = dict(self._origin)
+        moved_from = set(origin.values())
+        out: List[OverlayChange] = []
+        for key, (data, _) in files.items():
+            old = origin.get(key)
+            if old is not None:
+                out.append(OverlayChange("renamed", Path(key), Path(old),
+                                         changed=data != self.base.read_bytes(Path(old))))
+            elif key in deleted or not self.base.is_file(Path(key)):
+                out.append(OverlayChange("created", Path(key)))
+            elif data != self.base.read_bytes(Path(key)):
+                out.append(OverlayChange("modified", Path(key)))
+        out += [OverlayChange("deleted", Path(key)) for key in deleted
+                if key not in files and key not in moved_from]
+        return sorted(out, key=lambda c: str(c.path))
+
+    def diff(self, change: OverlayChange, root: Optional[Path] = None, context: int = 3) -> str:
+        """Unified Diff einer Änderung (Text, UTF-8); Pfade relativ zu root, falls angegeben."""
+        import difflib
+
+        def label(p: Path) -> str:
+            return os.path.relpath(p, root) if root is not None else str(p)
+
+        old_path = change.old_path if change.kind == "renamed" else change.path
+        before = b"" if change.kind == "created" else self.base.read_bytes(old_path)
+        after = b"" if change.kind == "deleted" else self.read_bytes(change.path)
+        if b"\0" in before or b"\0" in after:
+            return f"Binärdatei {label(change.path)} unterscheidet sich\n"
+
+        def lines(data: bytes) -> List[str]:
+            text = data.decode("utf-8", errors="replace")
+            return text.replace("\r\n", "\n").splitlines(keepends=True)
+
+        return "".join(difflib.unified_diff(lines(before), lines(after), label(old_path),
+                                            label(change.path), n=context))
+
+
+# ---------- Latenz/Zählung ----------
+
+class _TimedEntry:
+    """Eintrag, dessen stat() als eigener Round-Trip zählt (Typ kommt mit dem Listing)."""
+    __slots__ = ("_entry", "_fs", "name", "path")
+
+    def __init__(self, entry: Any, fs: "LatencyFileSystem"):
+        self._entry = entry
+        self._fs = fs
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        return self._entry.is_dir()
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        return self._entry.is_file()
+
+    def is_symlink(self) -> bool:
+        return self._entry.is_symlink()
+
+    def stat(self, follow_symlinks: bool = True) -> Any:
+        self._fs._call("stat")
+        return self._entry.stat()
+
+
+class LatencyFileSystem(FileSystem):
+    """
+    Wartet vor jeder Operation latency Sekunden (je Operation überschreibbar per per_op,
+    z. B. {"scandir": 0.01}) und zählt die Aufrufe. walk() läuft über das eigene scandir,
+    zählt also ein Listing je Ordner.
+    """
+
+    def __init__(self, inner: FileSystem, latency: float = 0.0,
+                 per_op: Optional[Dict[str, float]] = None):
+        unknown = sorted(set(per_op or {}) - set(OPS))
+        if unknown:
+            raise ValueError(f"Unbekannte Operation(en): {', '.join(unknown)} (erlaubt: {', '.join(OPS)})")
+        self.inner = inner
+        self.latency = latency
+        self.per_op = dict(per_op or {})
+        import threading
+
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _call(self, op: str) -> None:
+        with self._lock:
+            self.calls[op] += 1
+        delay = self.per_op.get(op, self.latency)
+        if delay > 0:
+            time.sleep(delay)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """Aufrufe je Operation, gesamt und je gelistetem Ordner."""
+        with self._lock:
+            calls = dict(sorted(self.calls.items()))
+        total = sum(calls.values())
+        dirs = calls.get("scandir", 0)
+        return {"calls": calls, "total": total, "dirs": dirs,
+                "per_dir": round(total / dirs, 2) if dirs else None}
+
+    def scandir(self, path: Path) -> List[Any]:
+        self._call("scandir")
+        return [_TimedEntry(e, self) for e in self.inner.scandir(path)]
+
+    def stat(self, path: Path) -> Any:
+        self._call("stat")
+        return self.inner.stat(path)
+
+    def exists(self, path: Path) -> bool:
+        self._call("exists")
+        return self.inner.exists(path)
+
+    def is_file(self, path: Path) -> bool:
+        self._call("is_file")
+        return self.inner.is_file(path)
+
+    def is_dir(self, path: Path) -> bool:
+        self._call("is_dir")
+        return self.inner.is_dir(path)
+
+    def is_symlink(self, path: Path) -> bool:
+        self._call("is_symlink")
+        return self.inner.is_symlink(path)
+
+    def read_bytes(self, path: Path) -> bytes:
+        self._call("read")
+        return self.inner.read_bytes(path)
+
+    def read_text(self, path: Path, encoding: str = "utf-8", errors: str = "strict") -> str:
+        self._call("read")
+        return self.inner.read_text(path, encoding, errors)
+
+    def open_read(self, path: Path) -> BinaryIO:
+        self._call("read")
+        return self.inner.open_read(path)
+
+    def write_bytes(self, path: Path, data: bytes) -> None:
+        self._call("write")
+        self.inner.write_bytes(path, data)
+
+    def create(self, path: Path, data: bytes) -> None:
+        self._call("create")
+        self.inner.create(path, data)
+
+    def write_text(self, path: Path, text: str, encoding: str = "utf-8",
+                   newline: Optional[str] = None) -> None:
+        self._call("write")
+        self.inner.write_text(path, text, encoding, newline)
+
+    def rename(self, src: Path, dst: Path) -> None:
+        self._call("rename")
+        self.inner.rename(src, dst)
+
+    def replace(self, src: Path, dst: Path) -> None:
+        self._call("replace")
+        self.inner.replace(src, dst)
+
+    def unlink(self, path: Path) -> None:
+        self._call("unlink")
+        self.inner.unlink(path)
+
+    def mkdir(self, path: Path, parents: bool = False, exist_ok: bool = False) -> None:
+        self._call("mkdir")
+        self.inner.mkdir(path, parents, exist_ok)
+
+    def resolve(self, path: Path) -> Path:
+        self._call("resolve")
+        return self.inner.resolve(path)
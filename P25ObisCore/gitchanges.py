@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Geänderte Pfade eines Vaults seit einer Git-Revision (nur lokales Repository, kein Netz).
+
+- `git diff --name-status -M <rev>`: Arbeitsverzeichnis (inkl. Index) gegen <rev>,
+  Umbenennungen als (alt, neu).
+- `git ls-files --others --exclude-standard`: neue, noch nicht versionierte Dateien.
+- Neu entstandene/verschwundene Ordner werden per `git cat-file --batch-check` gegen
+  <rev> geprüft (ein Prozess für alle Kandidaten), damit auch der Elternordner als
+  geändert gilt.
+
+Alle Pfade sind relativ zum übergebenen Root und mit '/' getrennt ("" = Root).
+Genutzt von ObisRenamer, ObisDatabase und P25ObisLinks (--changed-since).
+"""
+
+import os
+import posixpath
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Set
+
+
+class GitError(RuntimeError):
+    """Git fehlt, kein Repository oder ungültige Revision."""
+
+
+def _git(top: Path, args: List[str], stdin: str = "") -> str:
+    try:
+        proc = subprocess.run(["git", "-C", str(top), *args], input=stdin, capture_output=True,
+                              text=True, encoding="utf-8", errors="surrogateescape")
+    except FileNotFoundError as exc:
+        raise GitError("git ist nicht installiert bzw. nicht im PATH") from exc
+    if proc.returncode != 0:
+        raise GitError(f"git {' '.join(args[:2])} fehlgeschlagen: {proc.stderr.strip()}")
+    return proc.stdout
+
+
+def _parents(paths: Iterable[str]) -> Set[str]:
+    return {posixpath.dirname(p) for p in paths}
+
+
+def _ancestors(rel_dir: str) -> List[str]:
+    """'a/b/c' -> ['a/b/c', 'a/b', 'a'] (ohne Root)."""
+    out = []
+    while rel_dir:
+        out.append(rel_dir)
+        rel_dir = posixpath.dirname(rel_dir)
+    return out
+
+
+@dataclass
+class ChangeSet:
+    root: Path
+    rev: str
+    changed: Set[str] = field(default_factory=set)  # existierende neue/geänderte Dateien
+    added: Set[str] = field(default_factory=set)  # davon neu (inkl. Ziel von Umbenennungen)
+    removed: Set[str] = field(default_factory=set)  # gelöscht (inkl. Quelle von Umbenennungen)
+    structure: Set[str] = field(default_factory=set)  # Ordner mit neuem/verschwundenem Unterordner
+
+    def paths(self, rels: Iterable[str]) -> List[Path]:
+        return [self.root / rel if rel else self.root for rel in sorted(rels)]
+
+    def parent_dirs(self) -> Set[str]:
+        """Ordner, in denen sich irgendeine Datei geändert hat."""
+        return _parents(self.changed | self.removed) | self.structure
+
+    def membership_dirs(self) -> Set[str]:
+        """Ordner, deren Dateibestand sich geändert hat (hinzugefügt/entfernt/umbenannt)."""
+        return _parents(self.added | self.removed)
+
+    def touches(self, rel: str) -> bool:
+        return rel in self.changed or rel in self.removed
+
+
+def changed_since(root: Path, rev: str) -> ChangeSet:
+    """Ermittelt alle Änderungen unterhalb von root seit rev (Commit, Tag, Branch, HEAD~3, ...)."""
+    root = root.resolve()
+    top = Path(_git(root, ["rev-parse", "--show-toplevel"]).strip()).resolve()
+    try:
+        _git(top, ["rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"])
+    except GitError:
+        raise GitError(f"Unbekannte Revision: {rev}") from None
+    prefix = root.relative_to(top).as_posix()
+    prefix = "" if prefix == "." else prefix + "/"
+
+    def local(path: str):
+        """Pfad relativ zum Repository -> relativ zu root (None = außerhalb)."""
+        return path[len(prefix):] if path.startswith(prefix) else None
+
+    change = ChangeSet(root=root, rev=rev)
+    spec = prefix.rstrip("/") or "."
+    fields = _git(top, ["diff", "--name-status", "-z", "-M", "--no-ext-diff", rev, "--", spec]).split("\0")
+    i = 0
+    while i < len(fields) - 1:
+        status = fields[i]
+        if status[:1] in ("R", "C"):
+            old, new = local(fields[i + 1]), local(fields[i + 2])
+            i += 3
+            if status[0] == "R" and old is not None:
+                change.removed.add(old)
+            if new is not None:
+                change.changed.add(new)
+                change.added.add(new)
+            continue
+        rel = local(fields[i + 1])
+        i += 2
+        if rel is None:
+            continue
+        if status == "D":
+            change.removed.add(rel)
+        else:
+            change.changed.add(rel)
+            if status == "A":
+                change.added.add(rel)
+    for path in _git(top, ["ls-files", "--others", "--exclude-standard", "--full-name", "-z",
+                            "--", spec]).split("\0"):
+        rel = local(path) if path else None
+        if rel is not None:
+            change.changed.add(rel)
+            change.added.add(rel)
+
+    # Ordner, die seit rev entstanden/verschwunden sind -> Elternordner ebenfalls geändert
+    candidates = sorted({a for d in _parents(change.added | change.removed) for a in _ancestors(d)})
+    if candidates:
+        specs = "".join(f"{rev}:{prefix}{d}\n" for d in candidates)
+        answers = _git(top, ["cat-file", "--batch-check"], stdin=specs).splitlines()
+        for d, answer in zip(candidates, answers):
+            existed = not answer.endswith(" missing") and " tree " in answer
+            if existed != os.path.isdir(root / d):
+                change.structure.add(posixpath.dirname(d))
+    return change
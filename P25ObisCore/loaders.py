@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Verzögert geladene Core-Module für die Tools (Startzeit: nur laden, was der Lauf braucht).
+
+    from loaders import load_bounded, load_changes
+    for item in load_bounded()(items, 8):
+        ...
+
+Die Tools nehmen P25ObisCore einmal beim Import in den Suchpfad auf; diese Funktionen
+importieren das jeweilige Modul erst beim ersten Aufruf (danach aus sys.modules).
+"""
+
+from pathlib import Path
+
+
+def load_changes(root: Path, rev: str):
+    """Änderungen seit rev (gitchanges.py, nur bei --changed-since geladen)."""
+    from gitchanges import changed_since
+    return changed_since(root, rev)
+
+
+def load_bounded():
+    """bounded() aus stages.py (Stufen mit begrenzter Queue)."""
+    from stages import bounded
+    return bounded
+
+
+def load_progress():
+    """progress.py (nur mit --progress geladen)."""
+    import progress
+    return progress
+
+
+def load_checkpoint():
+    """checkpoint.py (Checkpoints/--resume)."""
+    import checkpoint
+    return checkpoint
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gedrosselte Fortschrittsanzeige für lange Läufe (Dateien/s, ETA, verarbeitete Bytes).
+
+    progress = Progress("database", unit="Dateien", mode="tty")
+    progress.count_in_background(lambda: sum(1 for _ in notes(root)))  # Gesamtzahl -> ETA
+    log = progress.wrap(print)
+    for md in notes(root):
+        ...
+        progress.advance(1, md_size)
+    progress.close()
+
+- mode "tty": eine Statuszeile auf stderr, die per \\r überschrieben wird. Logzeilen über
+  wrap(log) löschen die Statuszeile vorher, damit sich beides nicht vermischt.
+- mode "json": eine JSON-Zeile je Meldung auf stderr ({"event": "progress", ...}), am Ende
+  {"event": "done", ...} bzw. "aborted" – für Jobs/Monitoring. stdout bleibt unverändert.
+- Gedrosselt: advance() rechnet nur und schreibt höchstens alle interval Sekunden.
+- Die Gesamtzahl für die ETA ist optional; count_in_background() ermittelt sie in einem
+  Hintergrund-Thread (eigener, billiger Durchlauf), bis dahin zeigt die ETA "?".
+
+Genutzt von ObisDatabase und P25ObisLinks (--progress).
+"""
+
+import json
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TextIO
+
+MODES = ("tty", "json")
+INTERVALS = {"tty": 0.2, "json": 2.0}  # Sekunden zwischen zwei Meldungen
+
+
+def human_size(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{int(n)} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{int(n)} B"
+
+
+def human_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    h, rest = divmod(seconds, 3600)
+    m, s = divmod(rest, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+class Progress:
+    """Zählt erledigte Einheiten/Bytes und meldet den Stand gedrosselt auf stream."""
+
+    def __init__(self, tool: str, *, unit: str = "Dateien", mode: str = "tty",
+                 total: Optional[int] = None, stream: Optional[TextIO] = None,
+                 interval: Optional[float] = None):
+        if mode not in MODES:
+            raise ValueError(f"Unbekannter Fortschritts-Modus: {mode} (erlaubt: {', '.join(MODES)})")
+        self.tool = tool
+        self.unit = unit
+        self.mode = mode
+        self.total = total
+        self.stream = stream if stream is not None else sys.stderr
+        self.interval = INTERVALS[mode] if interval is None else interval
+        self.done = 0
+        self.bytes = 0
+        self.skipped = 0  # per --resume übersprungen (zählt nicht in die Rate)
+        self._t0 = time.monotonic()
+        self._last = 0.0  # Zeitpunkt der letzten Meldung (0 = noch keine)
+        self._shown = 0  # Länge der sichtbaren Statuszeile (tty)
+
+    # ---------- Gesamtzahl ----------
+
+    def count_in_background(self, count: Callable[[], int]) -> None:
+        """Ermittelt total in einem Daemon-Thread; Fehler lassen die ETA einfach offen."""
+        def work() -> None:
+            try:
+                self.total = count()
+            except Exception:
+                pass
+
+        threading.Thread(target=work, name="obis-progress-count", daemon=True).start()
+
+    # ---------- Zählen ----------
+
+    def advance(self, units: int = 1, nbytes: int = 0) -> None:
+        self.done += units
+        self.bytes += nbytes
+        now = time.monotonic()
+        if now - self._last >= self.interval:
+            self._last = now
+            self._emit("progress", now)
+
+    def skip(self, units: int = 1, nbytes: int = 0) -> None:
+        """Bereits erledigte Einheiten (Checkpoint): zählen zum Stand, nicht zur Rate."""
+        self.done += units
+        self.skipped += units
+        self.bytes += nbytes
+
+    def wrap(self, log: Callable[[Any], None]) -> Callable[[Any], None]:
+        """log-Funktion, die vor jeder Zeile die Statuszeile entfernt (nur tty)."""
+        if self.mode != "tty":
+            return log
+
+        def wrapped(item: Any) -> None:
+            self._clear()
+            log(item)
+
+        return wrapped
+
+    def close(self, aborted: bool = False) -> None:
+        """Letzte Meldung (immer, ungedrosselt); tty: Statuszeile stehen lassen."""
+        self._emit("aborted" if aborted else "done", time.monotonic())
+        if self.mode == "tty" and self._shown:
+            self.stream.write("\n")
+            self.stream.flush()
+            self._shown = 0
+
+    # ---------- Ausgabe ----------
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Aktueller Stand als Dict (Grundlage beider Ausgabeformen)."""
+        elapsed = (time.monotonic() if now is None else now) - self._t0
+        worked = self.done - self.skipped
+        rate = worked / elapsed if elapsed > 0 else 0.0
+        total = self.total
+        eta = None
+        if total is not None and rate > 0:
+            eta = max(0.0, (total - self.done) / rate)
+        return {"tool": self.tool, "unit": self.unit, "done": self.done, "total": total,
+                "bytes": self.bytes, "rate": round(rate, 1), "elapsed": round(elapsed, 1),
+                "eta": None if eta is None else round(eta, 1)}
+
+    def line(self, now: Optional[float] = None) -> str:
+        s = self.snapshot(now)
+        count = f"{s['done']}/{s['total']}" if s["total"] is not None else f"{s['done']}"
+        eta = human_duration(s["eta"]) if s["eta"] is not None else "?"
+        return (f"[{self.tool}] {count} {self.unit} | {s['rate']:.1f}/s | "
+                f"{human_size(s['bytes'])} | ETA {eta}")
+
+    def _clear(self) -> None:
+        if self._shown:
+            self.stream.write("\r" + " " * self._shown + "\r")
+            self.stream.flush()
+            self._shown = 0
+
+    def _emit(self, event: str, now: float) -> None:
+        if self.mode == "json":
+            self.stream.write(json.dumps({"event": event, **self.snapshot(now)}) + "\n")
+        else:
+            text = self.line(now)
+            pad = max(0, self._shown - len(text))
+            self.stream.write("\r" + text + " " * pad)
+            self._shown = len(text)
+        self.stream.flush()
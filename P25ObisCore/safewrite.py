@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Notizen zurückschreiben, ohne gleichzeitige Änderungen zu überschreiben (Obsidian offen,
+mehrere Tools oder Worker auf demselben Vault).
+
+    update = update_text(FS, md, lambda text: new_frontmatter(text), owner="database")
+    update.written  # False: Inhalt war schon so
+
+Ablauf je Datei (optimistisch, ohne den Editor zu sperren):
+1. stat + lesen und den Stand merken: Snapshot (mtime_ns, size, Hash des Inhalts).
+2. Änderung berechnen: edit(text) -> neuer Text (None = Datei löschen). Gleich -> fertig.
+3. Neuen Inhalt in eine temporäre Datei im selben Ordner schreiben.
+4. Sperrdatei anlegen, Stand erneut prüfen, atomar ersetzen (replace), Sperre freigeben.
+5. Stand geändert (z. B. in Obsidian gespeichert) -> ab 1. neu lesen und die Änderung auf
+   den neuen Inhalt anwenden; nach RETRIES Versuchen WriteConflict – der Aufrufer
+   überspringt die Datei und meldet sie.
+
+- Prüfen: andere Größe -> geändert. Sonst entscheidet der Hash, wenn die mtime abweicht
+  oder höchstens RACY_SECONDS vor dem Lesen liegt (grobe Zeitstempel, z. B. FAT; wie
+  "racy clean" bei git). Nur berührte Dateien (gleicher Inhalt) gelten als unverändert.
+- Sperrdateien (`.NAME.obis-lock` neben der Datei) sind beratend: Obis-Tools und ihre
+  Worker halten sie nur für Prüfen + Ersetzen. Obsidian kennt sie nicht – dagegen hilft
+  der Vergleich in 4./5. Eine Sperre gilt als verwaist, wenn sie älter als LOCK_STALE
+  Sekunden ist oder ihr Prozess (gleicher Rechner) nicht mehr läuft; sie wird dann
+  übernommen – nur, wenn Inhalt und mtime noch die als verwaist gelesenen sind: atomar
+  beiseite umbenannt (das gelingt nur einem Prozess), erneut verglichen und erst dann
+  gelöscht; eine dabei erwischte frische Sperre wird zurückgelegt (schlägt das fehl:
+  WriteConflict statt stiller Doppelsperre). Freigegeben wird nur die eigene Sperre.
+  Wer länger als LOCK_TIMEOUT wartet, bekommt WriteConflict.
+- Sperr- und temporäre Dateien beginnen mit "." und tragen ".obis-" im Namen; Tools, die
+  Dateien eines Ordners verarbeiten (Renamer), lassen sie über is_scratch() liegen.
+- Symlinks: geschrieben wird das Ziel, der Link bleibt.
+- Alle Zugriffe laufen über das Dateisystem-Backend fs (fsbackend).
+
+Genutzt von ObisDatabase (Frontmatter) und P25ObisLinks (Index, Unterseiten, MOC).
+"""
+
+import itertools
+import os
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from fsbackend import FileSystem
+
+RETRIES = 3  # Versuche je Datei, bevor sie als Konflikt übersprungen wird
+RACY_SECONDS = 2.0  # so junge mtimes zusätzlich per Hash prüfen
+LOCK_TIMEOUT = 10.0  # höchstens so lange auf eine fremde Sperre warten
+LOCK_STALE = 60.0  # ältere Sperren gelten als verwaist
+LOCK_POLL = 0.02  # Wartezeit zwischen zwei Versuchen, die Sperre zu bekommen
+
+_SEQ = itertools.count(1)  # eindeutige Namen für temporäre Dateien im Prozess
+_host: Optional[str] = None
+
+
+class WriteConflict(Exception):
+    """Datei wurde während der Verarbeitung wiederholt geändert, ist verschwunden oder gesperrt."""
+
+    def __init__(self, path: Path, reason: str):
+        super().__init__(f"{reason}: {path}")
+        self.path = path
+        self.reason = reason
+
+
+class Snapshot(NamedTuple):
+    """Stand einer Datei beim Lesen."""
+    mtime_ns: int
+    size: int
+    digest: str
+    seen_ns: int  # Wanduhr beim Lesen (für die Prüfung junger mtimes)
+
+
+class Update(NamedTuple):
+    """Ergebnis von update_text()."""
+    before: Optional[str]  # gelesener Text (None = Datei fehlte)
+    after: Optional[str]  # gewünschter Text (None = gelöscht)
+    written: bool  # False: nichts zu tun (after == before)
+    attempts: int  # 1 = ohne Konflikt
+
+
+def digest(data: bytes) -> str:
+    import hashlib  # erst beim ersten Schreiben laden (Startzeit der Tools)
+
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def read_snapshot(fs: FileSystem, path: Path) -> Tuple[Optional[bytes], Optional[Snapshot]]:
+    """Inhalt und Stand; (None, None), wenn die Datei fehlt. stat vor dem Lesen: eine
+    Änderung dazwischen fällt beim Prüfen auf (stat weicht ab), der Hash passt zum Inhalt."""
+    try:
+        st = fs.stat(path)
+        data = fs.read_bytes(path)
+    except FileNotFoundError:
+        return None, None
+    return data, Snapshot(st.st_mtime_ns, st.st_size, digest(data), time.time_ns())
+
+
+def unchanged(fs: FileSystem, path: Path, snap: Optional[Snapshot]) -> bool:
+    """Ist path noch im Stand snap (None: existiert weiterhin nicht)?"""
+    if snap is None:
+        return not fs.exists(path)
+    try:
+        st = fs.stat(path)
+    except FileNotFoundError:
+        return False
+    if st.st_size != snap.size:
+        return False
+    if st.st_mtime_ns == snap.mtime_ns and st.st_mtime_ns < snap.seen_ns - int(RACY_SECONDS * 1e9):
+        return True
+    try:
+        return digest(fs.read_bytes(path)) == snap.digest
+    except FileNotFoundError:
+        return False
+
+
+# ---------- Sperrdateien ----------
+
+def lock_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.obis-lock")
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.obis-{os.getpid()}-{next(_SEQ)}.tmp")
+
+
+def is_scratch(name: str) -> bool:
+    """Sperr- oder temporäre Datei von safewrite (nie umbenennen oder als Notiz behandeln)?"""
+    return name.startswith(".") and (name.endswith(".obis-lock")
+                                      or (name.endswith(".tmp") and ".obis-" in name))
+
+
+def _hostname() -> str:
+    global _host
+    if _host is None:
+        import socket
+
+        _host = socket.gethostname()
+    return _host
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name != "posix":
+        return True  # os.kill(pid, 0) beendet unter Windows den Prozess – dort nur das Alter
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # existiert, gehört aber einem anderen Benutzer
+    return True
+
+
+class FileLock:
+    """Beratende Sperre für path (exklusiv angelegte Sperrdatei); mit `with` verwenden."""
+
+    def __init__(self, fs: FileSystem, path: Path, owner: str = "obis",
+                 timeout: float = LOCK_TIMEOUT):
+        self.fs = fs
+        self.target = path
+        self.path = lock_path(path)
+        self.owner = owner
+        self.timeout = timeout
+        self.payload = b""
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+    def acquire(self) -> None:
+        import json  # wie hashlib erst beim ersten Schreiben
+
+        self.payload = json.dumps({"owner": self.owner, "pid": os.getpid(), "host": _hostname(),
+                                   "time": time.time()}).encode("utf-8")
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self.fs.create(self.path, self.payload)
+                return
+            except FileExistsError:
+                pass
+            try:
+                seen = self._state()
+            except FileNotFoundError:
+                continue  # gerade freigegeben
+            if self._stale(seen[0]):
+                self._take_over(seen)
+                continue
+            if time.monotonic() >= deadline:
+                raise WriteConflict(self.target, f"gesperrt ({self.path.name})")
+            time.sleep(LOCK_POLL)
+
+    def release(self) -> None:
+        try:
+            if self.fs.read_bytes(self.path) != self.payload:
+                return  # galt als verwaist und wurde übernommen -> fremde Sperre stehen lassen
+            self.fs.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _state(self, path: Optional[Path] = None) -> Tuple[bytes, int]:
+        """(Inhalt, mtime_ns) der Sperrdatei; FileNotFoundError, wenn sie fehlt."""
+        path = path or self.path
+        mtime_ns = self.fs.stat(path).st_mtime_ns
+        try:
+            data = self.fs.read_bytes(path)
+        except FileNotFoundError:
+            raise
+        except OSError:
+            data = b""  # nicht lesbar -> nach Dateialter (_stale)
+        return data, mtime_ns
+
+    def _take_over(self, seen: Tuple[bytes, int]) -> None:
+        """
+        Entfernt die als verwaist gelesene Sperre seen = (Inhalt, mtime_ns) – nie eine andere.
+        Vorher erneut vergleichen; Umbenennen ist atomar, halten mehrere Prozesse dieselbe
+        Sperre für verwaist, bekommt sie genau einer. Ist die beiseite gelegte Datei doch
+        eine frische Sperre (zwischen Vergleich und Umbenennen neu angelegt), wird sie
+        zurückgelegt; ist der Platz inzwischen belegt, WriteConflict.
+        """
+        try:
+            if self._state() != seen:
+                return  # freigegeben, übernommen oder neu angelegt -> normal weiter warten
+        except FileNotFoundError:
+            return
+        moved = _tmp_path(self.path)
+        try:
+            self.fs.replace(self.path, moved)
+        except FileNotFoundError:
+            return  # ein anderer Prozess war schneller
+        try:
+            state = self._state(moved)
+        except FileNotFoundError:
+            return
+        if state != seen:
+            try:
+                self.fs.create(self.path, state[0])
+            except FileExistsError:
+                raise WriteConflict(self.target, f"fremde Sperre beim Übernehmen verdrängt, "
+                                                 f"liegt unter {moved.name}") from None
+        try:
+            self.fs.unlink(moved)
+        except FileNotFoundError:
+            pass
+
+    def _stale(self, seen: bytes) -> bool:
+        """Ist die Sperre mit Inhalt seen verwaist?"""
+        import json
+
+        try:
+            info = json.loads(seen.decode("utf-8"))
+            since = float(info["time"])
+        except (ValueError, KeyError, TypeError):
+            # gerade erst angelegt (noch leer) oder beschädigt -> nach Dateialter
+            try:
+                return time.time() - self.fs.stat(self.path).st_mtime > LOCK_STALE
+            except FileNotFoundError:
+                return True
+        if time.time() - since > LOCK_STALE:
+            return True
+        if info.get("host") == _hostname() and isinstance(info.get("pid"), int):
+            return not _pid_alive(info["pid"])
+        return False
+
+
+# ---------- Schreiben ----------
+
+def commit(fs: FileSystem, path: Path, data: Optional[bytes], snap: Optional[Snapshot],
+           owner: str = "obis") -> bool:
+    """
+    Schreibt data (None = löschen) nach path, sofern die Datei noch im Stand snap ist.
+    False bei Abweichung (nichts geschrieben); WriteConflict, wenn die Sperre nicht frei wird.
+    """
+    tmp: Optional[Path] = None
+    if data is not None:
+        tmp = _tmp_path(path)
+        fs.write_bytes(tmp, data)
+    try:
+        with FileLock(fs, path, owner):
+            if not unchanged(fs, path, snap):
+                return False
+            if tmp is None:
+                fs.unlink(path)
+            else:
+                fs.replace(tmp, path)
+                tmp = None
+            return True
+    finally:
+        if tmp is not None:
+            try:
+                fs.unlink(tmp)
+            except FileNotFoundError:
+                pass
+
+
+def _decode(data: bytes, errors: str) -> str:
+    text = data.decode("utf-8", errors)
+    return text.replace("\r\n", "\n").replace("\r", "\n") if "\r" in text else text
+
+
+def _encode(text: str, newline: Optional[str]) -> bytes:
+    nl = os.linesep if newline is None else newline
+    if nl not in ("", "\n"):
+        text = text.replace("\n", nl)
+    return text.encode("utf-8")
+
+
+def update_text(fs: FileSystem, path: Path, edit: Callable[[Optional[str]], Optional[str]], *,
+                errors: str = "strict", newline: Optional[str] = None, owner: str = "obis",
+                retries: int = RETRIES) -> Update:
+    """
+    Liest path (UTF-8, universelle Zeilenenden; fehlt die Datei: None), wendet edit an und
+    schreibt das Ergebnis wie write_text(newline=...) zurück – nur wenn sich der Text ändert
+    und die Datei seit dem Lesen unverändert ist. Sonst neu lesen und edit erneut anwenden
+    (edit muss daher wiederholbar sein). WriteConflict nach retries Versuchen.
+    """
+    resolved = False
+    for attempt in range(1, retries + 1):
+        data, snap = read_snapshot(fs, path)
+        before = None if data is None else _decode(data, errors)
+        after = edit(before)
+        if after == before:
+            return Update(before, after, False, attempt)
+        if not resolved:
+            resolved = True  # erst beim Schreiben nachsehen (ein Aufruf weniger je unveränderter Datei)
+            if fs.is_symlink(path):
+                path = fs.resolve(path)  # stat/lesen folgen dem Link -> der Snapshot passt
+        if commit(fs, path, None if after is None else _encode(after, newline), snap, owner):
+            return Update(before, after, True, attempt)
+    raise WriteConflict(path, f"während der Verarbeitung {retries}× extern geändert – übersprungen")
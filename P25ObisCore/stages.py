@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Entkoppelte Verarbeitungsstufen mit begrenzter Queue (Durchlauf → Plan → Anwenden).
+
+    plans = bounded(plan(d) for d in bounded(walk(root)))
+    for plan in plans:
+        apply(plan)
+
+bounded() lässt die Quelle in einem eigenen Thread laufen und reicht ihre Elemente über
+eine Queue mit höchstens maxsize Plätzen weiter: Die Quelle läuft dem Verbraucher
+voraus (z. B. das Listing des nächsten Ordners, während der aktuelle geschrieben wird),
+aber nie mehr als maxsize Elemente. Liefert jede Stufe ein Element je Ordner, hängt der
+Speicherbedarf damit nur vom größten Ordner ab, nicht von der Größe des Vaults.
+
+- Reihenfolge und Ausnahmen bleiben erhalten: ein Fehler in der Quelle wird beim
+  Verbraucher an derselben Stelle ausgelöst wie bei direkter Iteration.
+- Bricht der Verbraucher ab (Ausnahme, break), wird die Quelle gestoppt und geschlossen.
+- maxsize <= 0: keine Queue, kein Thread – die Quelle wird direkt durchgereicht.
+
+Genutzt von ObisRenamer, ObisDatabase und P25ObisLinks.
+"""
+
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+QUEUE_SIZE = 8  # Standard: Elemente (meist Ordner) je Queue
+
+
+class _Failure:
+    """Ausnahme der Quelle, wird im Verbraucher erneut ausgelöst."""
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+_DONE = object()
+_POLL_SECONDS = 0.1  # wie oft eine blockierte Quelle prüft, ob der Verbraucher aufgehört hat
+
+
+def bounded(items: Iterable[T], maxsize: int = QUEUE_SIZE) -> Iterator[T]:
+    """Iteriert items in einem Hintergrund-Thread, höchstens maxsize Elemente im Voraus."""
+    if maxsize <= 0:
+        yield from items
+        return
+
+    q: "queue.Queue[object]" = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        it = iter(items)
+        try:
+            for item in it:
+                if not put(item):
+                    return
+        except BaseException as exc:  # auch KeyboardInterrupt/GeneratorExit der Quelle weiterreichen
+            put(_Failure(exc))
+            return
+        finally:
+            close = getattr(it, "close", None)
+            if close is not None:
+                close()  # verschachtelte Stufen (Generatoren) beenden ihre Threads
+        put(_DONE)
+
+    worker = threading.Thread(target=produce, name="obis-stage", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.exc
+            yield item  # type: ignore[misc]
+    finally:
+        stop.set()
+        worker.join()
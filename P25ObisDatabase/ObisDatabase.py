@@ -21,9 +21,32 @@ Bestehendes bleibt:
 - _settings.key_mode: strict|merge; _settings.keep_extra_keys: [Globs]
 - _settings.exclude_folders: [Ordner/Globs]
 
+--changed-since REV: nur .md-Dateien, die sich seit der Git-Revision REV geändert haben
+(neu, geändert, umbenannt/verschoben); ändert sich die Konfiguration selbst, läuft alles.
+
+Der Vault wird ordnerweise gelesen (FS.walk in einem eigenen Thread, begrenzte Queue);
+ausgeschlossene Ordner werden nicht betreten. Der Speicherbedarf hängt vom größten
+Ordner ab, nicht von der Zahl der Notizen.
+
 Reihenfolge: Felder werden **in der Reihenfolge der YAML.ini** ausgegeben. In strict werden nicht genannte Keys entfernt (außer Whitelist).
 
-Voraussetzung: PyYAML (pip install pyyaml)
+Als Bibliothek: run(root, config) schreibt nichts auf stdout und beendet nie den Prozess –
+Rückgabe ist ein RunResult (je Datei Aktion, changed, Dauer), Fehler kommen als
+DatabaseError (ConfigError, ChangesError). main() ist nur noch die CLI-Hülle darum.
+Dateizugriffe laufen über das Backend FS (P25ObisCore/fsbackend.py); run(..., fs=...)
+tauscht es für einen Lauf, z. B. gegen MemoryFileSystem oder LatencyFileSystem.
+
+Gleichzeitiges Bearbeiten (Obsidian offen, andere Tools): Notizen werden über
+P25ObisCore/safewrite.py geschrieben – Stand beim Lesen merken, vor dem atomaren Ersetzen
+vergleichen, bei Abweichung neu lesen und das Frontmatter erneut anwenden. Kommt eine Notiz
+nicht zur Ruhe, wird sie übersprungen und als [KONFLIKT] gemeldet.
+
+    config = Config.from_dict({"Titel": "%data%", "_settings": {"key_mode": "merge"}})
+    result = run(Path("Vault"), config, dry_run=True)
+    for f in result.files: ...
+
+Voraussetzung: PyYAML (pip install pyyaml) – wird erst beim ersten YAML-Zugriff geladen,
+damit `obis database -h` und Aufrufe anderer Tools über obis.py nicht dafür bezahlen.
 """
 from __future__ import annotations
 
@@ -32,17 +55,29 @@ import datetime
 import fnmatch
 import re
 import sys
-from dataclasses import dataclass
+import time
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-try:
-    import yaml  # type: ignore
-except Exception:  # pragma: no cover
-    sys.stderr.write("[FEHLER] PyYAML nicht installiert. Bitte ausführen: pip install pyyaml\n")
-    raise
+
+def _use_core() -> None:
+    """Gemeinsame Module aus P25ObisCore importierbar machen."""
+    core = str(Path(__file__).resolve().parent.parent / "P25ObisCore")
+    if core not in sys.path:
+        sys.path.insert(0, core)
+
+
+_use_core()
+from fsbackend import OS, FileSystem  # noqa: E402
+from loaders import load_bounded, load_changes, load_checkpoint, load_progress  # noqa: E402
+from safewrite import WriteConflict, is_scratch, update_text  # noqa: E402
 
 # ======================= Konstanten =======================
+QUEUE_DIRS = 8  # Ordner je Queue zwischen Durchlauf und Verarbeitung (0 = ohne Thread)
+CHECKPOINT_FILENAME = ".obisdatabase-checkpoint.json"  # Fortschritt für --resume (im Root)
+CHECKPOINT_SECONDS = 30.0  # höchstens so oft den Checkpoint schreiben
+FS: FileSystem = OS  # Dateisystem-Backend (run(..., fs=...) setzt es für die Dauer eines Laufs)
 CONFIG_FILENAMES = ("ObisDatabase.ini", "ObisDatabase-Timetable.ini", "ObisDatabase-Klausur.ini", "ObisDatabase-Skript.ini", "YAML.ini")
 FRONTMATTER_DELIM = "---"
 SENTINEL_EMPTY = "=leer="
@@ -55,11 +90,39 @@ class _KEEP:  # Marker für %wert%
 
 KEEP_EXISTING = _KEEP()
 
+# ======================= Fehler =======================
+
+class DatabaseError(Exception):
+    """Basis aller Fehler von ObisDatabase."""
+
+
+class ConfigError(DatabaseError):
+    """Konfiguration fehlt/ist ungültig, Root fehlt oder PyYAML ist nicht installiert."""
+
+
+class ChangesError(DatabaseError):
+    """Änderungen seit einer Git-Revision nicht ermittelbar (--changed-since)."""
+
+
+_yaml_module = None
+
+
+def _yaml():
+    """PyYAML bei Bedarf importieren (einmalig)."""
+    global _yaml_module
+    if _yaml_module is None:
+        try:
+            import yaml  # type: ignore
+        except ImportError as e:  # pragma: no cover
+            raise ConfigError("PyYAML nicht installiert. Bitte ausführen: pip install pyyaml") from e
+        _yaml_module = yaml
+    return _yaml_module
+
 # ======================= Hilfsfunktionen =======================
 
 def get_creation_date(p: Path) -> str:
     """YYYY-MM-DD; bevorzugt st_birthtime (macOS/Windows), sonst st_mtime (Linux)."""
-    st = p.stat()
+    st = FS.stat(p)
     try:
         ts = st.st_birthtime  # type: ignore[attr-defined]
     except AttributeError:
@@ -68,11 +131,21 @@ def get_creation_date(p: Path) -> str:
 
 
 def read_text(p: Path) -> str:
-    return p.read_text(encoding="utf-8")
+    return FS.read_text(p, encoding="utf-8")
 
 
-def write_text(p: Path, content: str) -> None:
-    p.write_text(content, encoding="utf-8", newline="\n")
+def update_note(p: Path, edit: Callable[[str], str]) -> bool:
+    """
+    Schreibt edit(Text) zurück, ohne zwischenzeitliche Änderungen (z. B. aus Obsidian) zu
+    überschreiben: bei Abweichung neu lesen und edit erneut anwenden (P25ObisCore/safewrite.py).
+    True, wenn geschrieben; WriteConflict, wenn die Datei verschwunden ist oder nicht zur Ruhe kommt.
+    """
+    def apply(text: Optional[str]) -> Optional[str]:
+        if text is None:
+            raise WriteConflict(p, "während der Verarbeitung verschwunden")
+        return edit(text)
+
+    return update_text(FS, p, apply, newline="\n", owner="database").written
 
 # ======================= Settings =======================
 
@@ -115,35 +188,46 @@ class Settings:
             selective_processing_active=selective_on,
         )
 
+@dataclass
+class Config:
+    """Settings + Frontmatter-Vorlage (Reihenfolge der Keys = Ausgabe-Reihenfolge)."""
+    settings: Settings = field(default_factory=Settings)
+    template: Dict[str, Any] = field(default_factory=dict)
+    path: Optional[Path] = None  # Herkunft (None = im Code erzeugt)
+
+    @staticmethod
+    def from_dict(cfg: Dict[str, Any], path: Optional[Path] = None) -> "Config":
+        """Wie eine YAML.ini: `_settings` plus Vorlage (nur Keys ohne führenden Unterstrich)."""
+        if not isinstance(cfg, dict):
+            raise ConfigError("Konfiguration muss ein Mapping auf Top-Level sein.")
+        template = {k: v for k, v in cfg.items() if not str(k).startswith("_")}
+        return Config(settings=Settings.from_cfg(cfg), template=template, path=path)
+
 # ======================= YAML-INI Laden =======================
 
-def load_config(root: Path) -> Tuple[Settings, Dict[str, Any]]:
-    ini_path: Path | None = None
+def find_config(root: Path) -> Path:
     for name in CONFIG_FILENAMES:
         candidate = root / name
-        if candidate.is_file():
-            ini_path = candidate
-            break
-    if ini_path is None:
-        opts = " oder ".join(CONFIG_FILENAMES)
-        sys.stderr.write(f"[FEHLER] Keine Konfigurationsdatei gefunden ({opts}) in {root}\n")
-        sys.exit(2)
+        if FS.is_file(candidate):
+            return candidate
+    opts = " oder ".join(CONFIG_FILENAMES)
+    raise ConfigError(f"Keine Konfigurationsdatei gefunden ({opts}) in {root}")
+
+
+def load_config(root: Path) -> Config:
+    """Erste gefundene Datei aus CONFIG_FILENAMES im Root laden."""
+    ini_path = find_config(root)
 
     # Vorab: YAML verbietet Tabs -> klare Fehlermeldung statt kryptischem ScannerError
-    raw_ini = ini_path.read_text(encoding="utf-8")
+    raw_ini = FS.read_text(ini_path, encoding="utf-8")
     if "\t" in raw_ini:
-        sys.stderr.write(f"[FEHLER] Tabs in {ini_path.name} gefunden. YAML erlaubt keine Tabs. Ersetze Tabs durch Spaces.\n")
-        sys.exit(2)
+        raise ConfigError(f"Tabs in {ini_path.name} gefunden. YAML erlaubt keine Tabs. Ersetze Tabs durch Spaces.")
+    yaml = _yaml()
     try:
         cfg: Dict[str, Any] = yaml.safe_load(raw_ini) or {}
     except yaml.YAMLError as e:  # pragma: no cover
-        sys.stderr.write(f"[FEHLER] {ini_path.name} ist keine gültige YAML-Datei: {e}\n")
-        sys.exit(2)
-
-    settings = Settings.from_cfg(cfg)
-    # Frontmatter-Vorlage: nur Keys ohne führenden Unterstrich (Reihenfolge bleibt erhalten)
-    template = {k: v for k, v in cfg.items() if not str(k).startswith("_")}
-    return settings, template
+        raise ConfigError(f"{ini_path.name} ist keine gültige YAML-Datei: {e}") from e
+    return Config.from_dict(cfg, path=ini_path)
 
 # ======================= Frontmatter Parser =======================
 
@@ -162,6 +246,7 @@ def split_frontmatter(text: str) -> Tuple[Dict[str, Any], str]:
         return {}, text
     fm_text = "".join(lines[1:end_idx])
     body = "".join(lines[end_idx + 1 :])
+    yaml = _yaml()
     try:
         data = yaml.safe_load(fm_text) or {}
         if not isinstance(data, dict):
@@ -172,7 +257,7 @@ def split_frontmatter(text: str) -> Tuple[Dict[str, Any], str]:
 
 
 def dump_frontmatter(data: Dict[str, Any]) -> str:
-    payload = yaml.safe_dump(
+    payload = _yaml().safe_dump(
         data,
         allow_unicode=True,
         sort_keys=False,          # Reihenfolge beibehalten
@@ -198,7 +283,7 @@ def compute_folder_levels_up(md_path: Path) -> List[str]:
 def compute_root_parts_down(base: Path, md_parent: Path) -> List[str]:
     """[root1, root2, ...] = Pfadteile von base → md_parent. root0 = base.name."""
     try:
-        rel = md_parent.resolve().relative_to(base.resolve())
+        rel = FS.resolve(md_parent).relative_to(FS.resolve(base))
     except Exception:
         return []
     return list(rel.parts)  # kann leer sein (Datei liegt direkt unter base)
@@ -365,17 +450,6 @@ def build_result(existing: Dict[str, Any], applied: Dict[str, Any], *, key_mode:
 
     return result
 
-# ======================= Exklusionslogik =======================
-
-def is_excluded(md_path: Path, exclude_folders: Iterable[str]) -> bool:
-    parts = [p.name for p in md_path.parents]
-    for pat in exclude_folders:
-        for name in parts:
-            if fnmatch.fnmatch(name, pat):
-                return True
-    return False
-
-
 # ======================= Selektions-/Anker-Helfer =======================
 def nearest_named_ancestor(dir_path: Path, names: Iterable[str]) -> Path | None:
     """Nächster Vorfahr (inkl. dir_path) mit Name in 'names', sonst None."""
@@ -391,7 +465,7 @@ def has_excluded_child_folder(dir_path: Path, exclude_folders: Iterable[str]) ->
     Achtung: absichtliche Beschränkung auf unmittelbare Kinder, um false positives zu vermeiden.
     """
     try:
-        child_dirs = [p.name for p in dir_path.iterdir() if p.is_dir()]
+        child_dirs = [e.name for e in FS.scandir(dir_path) if e.is_dir()]
     except FileNotFoundError:
         return False
     for pat in exclude_folders:
@@ -402,8 +476,8 @@ def has_excluded_child_folder(dir_path: Path, exclude_folders: Iterable[str]) ->
  
 # ======================= Hauptlogik =======================
 def find_anchor_by_name(exec_base: Path, md_path: Path, anchor_name: str) -> Path | None:
-    p = md_path.parent.resolve()
-    eb = exec_base.resolve()
+    p = FS.resolve(md_path.parent)
+    eb = FS.resolve(exec_base)
     # nur innerhalb des --root suchen
     for ancestor in [p, *p.parents]:
         if ancestor == eb.parent:  # außerhalb von --root stoppen
@@ -412,10 +486,34 @@ def find_anchor_by_name(exec_base: Path, md_path: Path, anchor_name: str) -> Pat
             return ancestor
     return None
 
-def process_md(md_path: Path, template: Dict[str, Any], *, exec_base: Path, settings: Settings) -> bool:
-    text = read_text(md_path)
-    existing, body = split_frontmatter(text)
-
+def dir_selected(dir_path: Path, settings: Settings) -> bool:
+    """Werden .md-Dateien direkt in dir_path verarbeitet? (Excludes + Selektionslogik)"""
+    for pat in settings.exclude_folders:
+        if any(fnmatch.fnmatch(d.name, pat) for d in (dir_path, *dir_path.parents)):
+            return False
+    include_names = tuple(settings.include_folders_by_name)
+    if settings.selective_processing_active and include_names:
+        # Finde nächstgelegenen selektierten Anker (z. B. 'Klausur')
+        anchor_dir = nearest_named_ancestor(dir_path, include_names)
+        if anchor_dir is None:
+            # Datei liegt NICHT unter einem gewünschten Ordner
+            return False
+        # ANKER-Exklusion per Ordner (integriert in exclude_folders):
+        # Wenn der selektierte Anker einen *direkten* Unterordner hat,
+        # dessen Name in exclude_folders matcht (z. B. '.archive'),
+        # wird der gesamte Ankerzweig ausgelassen.
+        if has_excluded_child_folder(anchor_dir, settings.exclude_folders):
+            return False
+    return True
+
+
+def process_md(md_path: Path, template: Dict[str, Any], *, exec_base: Path, settings: Settings,
+               dry_run: bool = False) -> bool:
+    """
+    True, wenn das Frontmatter geändert wurde (im Trockenlauf: würde). Das Template hängt
+    nur vom Pfad ab; gemischt wird mit dem Inhalt beim Schreiben (update_note), damit
+    zwischenzeitliche Änderungen an der Notiz erhalten bleiben.
+    """
     # Anker bestimmen
     base = exec_base
     if settings.base_root:
@@ -443,76 +541,333 @@ def process_md(md_path: Path, template: Dict[str, Any], *, exec_base: Path, sett
         file_name=file_name,
     )
     if not isinstance(applied, dict):
-        raise ValueError("Template muss ein Mapping auf Top-Level sein.")
+        raise ConfigError("Template muss ein Mapping auf Top-Level sein.")
+
+    def render(text: str) -> str:
+        existing, body = split_frontmatter(text)
+        final_data = build_result(
+            existing,
+            applied,
+            key_mode=settings.key_mode,
+            keep_extra=settings.keep_extra_keys,
+        )
+        return dump_frontmatter(final_data) + body.lstrip("\n")
 
-    final_data = build_result(
-        existing,
-        applied,
-        key_mode=settings.key_mode,
-        keep_extra=settings.keep_extra_keys,
-    )
+    if dry_run:
+        text = read_text(md_path)
+        return render(text) != text
+    return update_note(md_path, render)
 
-    new_content = dump_frontmatter(final_data) + body.lstrip("\n")
-    if new_content != text:
-        write_text(md_path, new_content)
-        return True
-    return False
 
+# ======================= Ergebnisse =======================
 
-def run(root: Path) -> None:
-    settings, template = load_config(root)
+@dataclass
+class FileResult:
+    path: Path
+    changed: bool       # Frontmatter neu geschrieben (im Trockenlauf: würde)
+    dry_run: bool = False
+    seconds: float = 0.0
+    conflict: str = ""  # Grund, falls wegen gleichzeitiger Änderung übersprungen
+
+    @property
+    def action(self) -> str:
+        if self.conflict:
+            return "conflict"
+        return "updated" if self.changed else "unchanged"
+
+    def __str__(self) -> str:
+        if self.conflict:
+            return f"[KONFLIKT] {self.conflict}: {self.path}"
+        if not self.changed:
+            return f"[SKIP] unverändert: {self.path}"
+        return f"[DRY]  würde aktualisieren: {self.path}" if self.dry_run else f"[OK]   aktualisiert: {self.path}"
 
-    exec_base = root.resolve()
 
-    changed = 0
-    total = 0
-    include_names = tuple(settings.include_folders_by_name)
-    use_selection = bool(settings.selective_processing_active and include_names)
-
-    for md in root.rglob("*.md"):
-        if is_excluded(md, settings.exclude_folders):
-            continue
-
-        # 2) Selektionslogik: nur Dateien unter explizit benannten Ordnern
-        if use_selection:
-            # Finde nächstgelegenen selektierten Anker (z. B. 'Klausur')
-            anchor_dir = nearest_named_ancestor(md.parent, include_names)
-            if anchor_dir is None:
-                # Datei liegt NICHT unter einem gewünschten Ordner
-                continue
+@dataclass
+class RunResult:
+    root: Path
+    dry_run: bool = False
+    files: List[FileResult] = field(default_factory=list)  # je Notiz (nur mit keep_files)
+    notes: List[str] = field(default_factory=list)  # Hinweise (z. B. zu --changed-since)
+    total: int = 0  # verarbeitete Notizen (zählt auch ohne keep_files)
+    changed: int = 0  # davon Frontmatter geändert
+    conflicts: int = 0  # wegen gleichzeitiger Änderung übersprungen (nächster Lauf holt sie nach)
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        prefix = "Trockenlauf abgeschlossen." if self.dry_run else "Fertig."
+        text = f"{prefix} Dateien gesamt: {self.total}, geändert: {self.changed}."
+        if self.conflicts:
+            text += f" Übersprungen (gleichzeitig geändert): {self.conflicts}."
+        return text
+
+# ======================= Lauf =======================
+
+def _name_key(name: str) -> str:
+    return name.lower()
+
+
+def iter_note_dirs(root: Path, settings: Settings,
+                   prune: Optional[Callable[[Path], bool]] = None) -> Iterator[Tuple[Path, List[Path]]]:
+    """
+    (Ordner, .md-Dateien darin) je Ordner, Pre-Order mit nach Namen sortierten Unterordnern
+    (wie P25ObisLinks) – deterministisch, damit ein Checkpoint die Position beschreiben
+    kann. Anders als root.rglob("*.md") ohne Menge aller bereits gelieferten Pfade.
+    Ordner, deren Name ein exclude_folders-Muster trifft, werden gar nicht erst betreten
+    (dir_selected verwirft ohnehin alles darunter), ebenso Ordner, für die prune() True
+    liefert (z. B. laut Checkpoint erledigte Teilbäume).
+    """
+    for curr, dirs, files in FS.walk(root):
+        dirs[:] = sorted((d for d in dirs
+                          if not any(fnmatch.fnmatch(d, pat) for pat in settings.exclude_folders)
+                          and not (prune is not None and prune(Path(curr, d)))),
+                         key=_name_key)
+        mds = sorted((name for name in files if name.endswith(".md") and not is_scratch(name)),
+                     key=_name_key)
+        if mds:
+            base = Path(curr)
+            yield base, [base / name for name in mds]
+
+
+def changed_notes(root: Path, rev: str) -> Optional[List[Path]]:
+    """Geänderte .md seit rev; None, wenn die Konfiguration selbst geändert wurde (-> alles)."""
+    try:
+        change = load_changes(root, rev)
+    except RuntimeError as e:
+        raise ChangesError(str(e)) from e
+    if any(change.touches(name) for name in CONFIG_FILENAMES):
+        return None
+    return [p for p in change.paths(change.changed)
+            if p.name.endswith(".md") and not is_scratch(p.name) and FS.is_file(p)]
 
-            # 3) ANKER-Exklusion per Ordner (integriert in exclude_folders):
-            #    Wenn der selektierte Anker einen *direkten* Unterordner hat,
-            #    dessen Name in exclude_folders matcht (z. B. '.archive'),
-            #    wird der gesamte Ankerzweig ausgelassen.
-            if has_excluded_child_folder(anchor_dir, settings.exclude_folders):
-                continue
 
-        total += 1
-        if process_md(md, template, exec_base=exec_base, settings=settings):
-            changed += 1
-            print(f"[OK]   aktualisiert: {md}")
+def checkpoint_options(config: Config, changed_since: Optional[str]) -> Dict[str, Any]:
+    """Was ein Checkpoint mit dem fortsetzenden Lauf gemeinsam haben muss."""
+    import hashlib
+    import json
+
+    blob = json.dumps([asdict(config.settings), config.template], sort_keys=True, default=str,
+                      ensure_ascii=False)
+    return {"config": hashlib.sha1(blob.encode("utf-8")).hexdigest(), "changed_since": changed_since}
+
+
+def run(root: Path, config: Optional[Config] = None, *, only: Optional[Iterable[Path]] = None,
+        changed_since: Optional[str] = None, dry_run: bool = False,
+        log: Optional[Callable[[Any], None]] = None, keep_files: bool = True,
+        queue_dirs: int = QUEUE_DIRS, progress: Optional[str] = None, resume: bool = False,
+        checkpoint_seconds: float = CHECKPOINT_SECONDS, fs: Optional[FileSystem] = None) -> RunResult:
+    """
+    Setzt das Frontmatter aller .md unterhalb von root.
+    config: None = aus dem Root laden (load_config).
+    only: nur diese .md-Dateien, sonst rekursiv ab root; changed_since: nur seit der
+    Git-Revision geänderte Notizen (ersetzt only).
+    log: erhält jedes FileResult und jeden Hinweis (str) sofort, z. B. print.
+
+    Ordnerweise: ein Thread liest die Ordner (höchstens queue_dirs im Voraus), der
+    Aufrufer-Thread setzt das Frontmatter. keep_files=False sammelt keine FileResults
+    (nur Zähler) – der Speicherbedarf hängt dann nur vom größten Ordner ab.
+
+    progress: "tty" oder "json" – gedrosselter Fortschritt (Dateien/s, ETA, Bytes) auf
+    stderr, siehe P25ObisCore/progress.py. Ohne Trockenlauf wird alle checkpoint_seconds
+    der zuletzt fertige Ordner in CHECKPOINT_FILENAME im Root vermerkt (auch beim Abbruch);
+    resume=True setzt dort fort, ein vollständiger Lauf löscht den Checkpoint.
+
+    fs: Dateisystem-Backend für diesen Lauf (Standard: FS). FS ist modulweit – parallele
+    Läufe mit verschiedenen Backends im selben Prozess sind nicht vorgesehen.
+    """
+    global FS
+    saved = FS
+    FS = fs if fs is not None else FS
+    try:
+        root = FS.resolve(Path(root))  # absolut wie die Pfade aus gitchanges
+        return _run(root, config, only=only, changed_since=changed_since, dry_run=dry_run, log=log,
+                    keep_files=keep_files, queue_dirs=queue_dirs, progress=progress, resume=resume,
+                    checkpoint_seconds=checkpoint_seconds)
+    finally:
+        FS = saved
+
+
+def _run(root: Path, config: Optional[Config], *, only: Optional[Iterable[Path]],
+         changed_since: Optional[str], dry_run: bool, log: Optional[Callable[[Any], None]],
+         keep_files: bool, queue_dirs: int, progress: Optional[str], resume: bool,
+         checkpoint_seconds: float) -> RunResult:
+    t0 = time.perf_counter()
+    if not FS.is_dir(root):
+        raise ConfigError(f"Root nicht gefunden/kein Ordner: {root}")
+    if config is None:
+        config = load_config(root)
+    settings, template = config.settings, config.template
+    result = RunResult(root=root, dry_run=dry_run)
+
+    meter = None
+    if progress:
+        try:
+            meter = load_progress().Progress("database", unit="Dateien", mode=progress)
+        except ValueError as e:
+            raise ConfigError(str(e)) from e
+        if log is not None:
+            log = meter.wrap(log)
+
+    def note(text: str) -> None:
+        result.notes.append(text)
+        if log is not None:
+            log(text)
+
+    if changed_since:
+        only = changed_notes(root, changed_since)
+        if only is None:
+            note(f"[INFO] Konfiguration geändert seit {changed_since} – vollständiger Lauf.")
         else:
-            print(f"[SKIP] unverändert: {md}")
+            note(f"[INFO] Geänderte Notizen seit {changed_since}: {len(only)}")
+
+    cp_mod = load_checkpoint() if (resume or not dry_run) else None
+    cp_path = root / CHECKPOINT_FILENAME
+    cp_options = checkpoint_options(config, changed_since) if cp_mod is not None else {}
+    resumed = cp_mod.Checkpoint.load(cp_path, cp_options, root, FS) if resume else None
+    writer = (cp_mod.CheckpointWriter(cp_path, cp_options, root, checkpoint_seconds, FS)
+              if not dry_run else None)
+    counters = {"total": 0, "changed": 0, "bytes": 0}  # inkl. der Läufe vor dem Checkpoint
+    if resume:
+        if resumed is None:
+            note("[INFO] Kein passender Checkpoint – vollständiger Lauf.")
+        else:
+            counters.update({k: v for k, v in resumed.counters.items() if k in counters})
+            note(f"[INFO] Fortsetzen nach {resumed.where} (bereits erledigt: {counters['total']} Dateien)")
+            if meter is not None:
+                meter.skip(counters["total"], counters["bytes"])
+
+    exec_base = FS.resolve(root)
+
+    def grouped() -> Iterator[Tuple[Path, List[Path]]]:
+        # Teil-Lauf: Notizen desselben Ordners zusammenfassen, Ordner in Traversierungsreihenfolge
+        group: List[Path] = []
+        for md in sorted(only, key=lambda p: ([part.lower() for part in p.parent.parts], p.name.lower())):
+            if group and md.parent != group[0].parent:
+                yield group[0].parent, group
+                group = []
+            group.append(md)
+        if group:
+            yield group[0].parent, group
+
+    if meter is not None:
+        if only is not None:
+            meter.total = len(only)
+        else:
+            meter.count_in_background(lambda: sum(
+                len(mds) for folder, mds in iter_note_dirs(root, settings) if dir_selected(folder, settings)))
 
-    print(f"\nFertig. Dateien gesamt: {total}, geändert: {changed}.")
+    prune = resumed.subtree_done if resumed is not None else None
+    listed = iter_note_dirs(root, settings, prune) if only is None else grouped()
+    try:
+        for folder, mds in load_bounded()(listed, queue_dirs):
+            if resumed is not None and resumed.done(folder):
+                continue
+            if dir_selected(folder, settings):
+                for md in mds:
+                    t_file = time.perf_counter()
+                    conflict = ""
+                    try:
+                        changed = process_md(md, template, exec_base=exec_base, settings=settings,
+                                             dry_run=dry_run)
+                    except WriteConflict as e:
+                        changed, conflict = False, e.reason
+                    file_result = FileResult(path=md, changed=changed, dry_run=dry_run,
+                                             seconds=time.perf_counter() - t_file, conflict=conflict)
+                    result.total += 1
+                    result.changed += changed
+                    result.conflicts += bool(conflict)
+                    counters["total"] += 1
+                    counters["changed"] += changed
+                    if keep_files:
+                        result.files.append(file_result)
+                    if log is not None:
+                        log(file_result)
+                    if meter is not None:
+                        size = FS.stat(md).st_size if not conflict else 0
+                        counters["bytes"] += size
+                        meter.advance(1, size)
+            if writer is not None:
+                writer.reached(folder, counters)
+    except BaseException:
+        # Abbruch (auch Strg+C): Stand des letzten fertigen Ordners sofort sichern
+        if writer is not None:
+            writer.save()
+        if meter is not None:
+            meter.close(aborted=True)
+        raise
+    if meter is not None:
+        meter.close()
+    if writer is not None:
+        writer.clear()
+
+    result.seconds = time.perf_counter() - t0
+    return result
 
 # ======================= CLI =======================
 
-def parse_args(argv: Iterable[str]) -> argparse.Namespace:
+def parse_args(argv: Iterable[str], prog: Optional[str] = None) -> argparse.Namespace:
     ap = argparse.ArgumentParser(
+        prog=prog,
         description="YAML-Frontmatter-Manager (rekursiv)",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
+    ap.add_argument(
+        "root_arg",
+        nargs="?",
+        type=Path,
+        default=None,
+        metavar="ROOT",
+        help="Startverzeichnis (wie --root; einheitlich mit den anderen Tools)",
+    )
     ap.add_argument(
         "--root",
         type=Path,
         default=Path.cwd(),
         help="Startverzeichnis (Standard: aktuelles Arbeitsverzeichnis)",
     )
+    ap.add_argument(
+        "--changed-since",
+        metavar="REV",
+        default=None,
+        help="Nur Notizen, die sich seit der Git-Revision REV geändert haben (z. B. HEAD~1)",
+    )
+    ap.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Nur anzeigen, welche Notizen geändert würden; nichts schreiben",
+    )
+    ap.add_argument(
+        "--progress",
+        nargs="?",
+        const="tty",
+        default=None,
+        choices=("tty", "json"),
+        help="Fortschritt (Dateien/s, ETA, Bytes) auf stderr: Statuszeile (tty) oder JSON-Zeilen (json)",
+    )
+    ap.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Nach abgebrochenem Lauf am letzten Checkpoint ({CHECKPOINT_FILENAME}) fortsetzen",
+    )
     return ap.parse_args(argv)
 
 
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    ns = parse_args(sys.argv[1:] if argv is None else argv, prog=prog)
+    root = (ns.root_arg or ns.root).resolve()
+    try:
+        result = run(root, changed_since=ns.changed_since, dry_run=ns.dry_run, log=print,
+                     keep_files=False, progress=ns.progress, resume=ns.resume)
+    except DatabaseError as e:
+        sys.stderr.write(f"[FEHLER] {e}\n")
+        return 2
+    except KeyboardInterrupt:
+        hint = "" if ns.dry_run else " – mit --resume am Checkpoint fortsetzen"
+        sys.stderr.write(f"\n[ABBRUCH] Lauf unterbrochen{hint}.\n")
+        return 130
+    print(f"\n{result.summary()}")
+    return 0
+
+
 if __name__ == "__main__":
-    ns = parse_args(sys.argv[1:])
-    run(ns.root.resolve())
+    sys.exit(main())
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ObisDedupe – findet doppelte Anhänge (PDFs, Bilder, ...) im Vault.
+
+Vorgehen (jede Stufe nur für Kandidaten der vorigen):
+1) Gruppieren nach Dateigröße (aus dem Verzeichnis-Scan, kein Lesen)
+2) Hash der ersten PREFIX_BYTES für Größen mit mehr als einer Datei
+3) Voller Hash (in Blöcken gelesen) für gleiche Präfixe
+Stufe 2 und 3 laufen im Thread-Pool. Bereits per Hardlink verbundene Dateien zählen
+als eine Datei. Optional werden Kopien durch Hardlinks auf das Original ersetzt.
+
+Ausschlüsse wie P25ObisLinks (EXCLUDE_FOLDERS, Dot-Items).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from linkgraph import iter_vault_files, is_note
+from P25ObisLinks import SETTINGS as LINK_SETTINGS, human_size, tool_files
+
+# =========================
+# USER SETTINGS (hier anpassen)
+# =========================
+SETTINGS: Dict[str, Any] = {
+    # Kleinere Dateien werden ignoriert (Bytes)
+    "MIN_SIZE": 1024,
+    # Notizen (.md) mitprüfen? Standard: nur Anhänge
+    "INCLUDE_NOTES": False,
+    # Bytes für den Vorab-Hash
+    "PREFIX_BYTES": 64 * 1024,
+    # Blockgröße beim vollständigen Hashen
+    "CHUNK_BYTES": 1024 * 1024,
+}
+
+
+def _hash_file(path: str, limit: Optional[int] = None) -> Optional[str]:
+    """BLAKE2b über die ersten limit Bytes (None = ganze Datei), blockweise gelesen."""
+    h = hashlib.blake2b(digest_size=20)
+    remaining = limit
+    try:
+        with open(path, "rb") as fh:
+            while remaining is None or remaining > 0:
+                n = SETTINGS["CHUNK_BYTES"] if remaining is None else min(remaining, SETTINGS["CHUNK_BYTES"])
+                block = fh.read(n)
+                if not block:
+                    break
+                h.update(block)
+                if remaining is not None:
+                    remaining -= len(block)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def _regroup(groups: Iterable[List[str]], key: Callable[[str], Optional[str]],
+             ex: Optional[ThreadPoolExecutor]) -> List[List[str]]:
+    """Teilt jede Gruppe nach key() weiter auf; behält nur Gruppen mit > 1 Datei."""
+    groups = list(groups)
+    flat = [p for g in groups for p in g]
+    keys = list(ex.map(key, flat)) if ex is not None else [key(p) for p in flat]
+    result: List[List[str]] = []
+    i = 0
+    for g in groups:
+        sub: Dict[str, List[str]] = {}
+        for p in g:
+            k = keys[i]
+            i += 1
+            if k is not None:
+                sub.setdefault(k, []).append(p)
+        result.extend(v for v in sub.values() if len(v) > 1)
+    return result
+
+
+def collect_candidates(root: Path) -> Tuple[List[List[str]], int]:
+    """Größengruppen mit mehr als einer (physischen) Datei; liefert (Gruppen, Zahl gescannter Dateien)."""
+    excluded = set(LINK_SETTINGS["EXCLUDE_FOLDERS"])
+    skip = set(tool_files())
+    by_size: Dict[int, List[str]] = {}
+    scanned = 0
+    for rel, (_, size) in iter_vault_files(root, excluded, LINK_SETTINGS["IGNORE_DOT_ITEMS"]):
+        scanned += 1
+        if size < SETTINGS["MIN_SIZE"] or os.path.basename(rel) in skip:
+            continue
+        if is_note(rel) and not SETTINGS["INCLUDE_NOTES"]:
+            continue
+        by_size.setdefault(size, []).append(rel)
+
+    groups: List[List[str]] = []
+    for rels in by_size.values():
+        if len(rels) < 2:
+            continue
+        # Hardlinks (gleiches Gerät + Inode) nur einmal berücksichtigen
+        seen: Dict[Tuple[int, int], str] = {}
+        for rel in sorted(rels, key=lambda r: (r.count("/"), r.lower())):
+            try:
+                st = os.stat(root / rel)
+            except OSError:
+                continue
+            seen.setdefault((st.st_dev, st.st_ino), rel)
+        if len(seen) > 1:
+            groups.append(list(seen.values()))
+    return groups, scanned
+
+
+def find_duplicates(root: Path, workers: int = 4) -> Tuple[List[List[str]], Dict[str, int]]:
+    """
+    Liefert Duplikat-Sätze (je Satz: Original zuerst = kürzester Pfad, dann alphabetisch)
+    und Zähler der einzelnen Stufen.
+    """
+    groups, scanned = collect_candidates(root)
+    counts = {"scanned": scanned, "size_candidates": sum(len(g) for g in groups)}
+    base = str(root)
+
+    def prefix_key(rel: str) -> Optional[str]:
+        return _hash_file(os.path.join(base, rel), SETTINGS["PREFIX_BYTES"])
+
+    def full_key(rel: str) -> Optional[str]:
+        return _hash_file(os.path.join(base, rel))
+
+    ex = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        groups = _regroup(groups, prefix_key, ex)
+        counts["prefix_candidates"] = sum(len(g) for g in groups)
+        # Gruppen, deren Dateien kürzer als der Präfix sind, sind bereits vollständig gehasht
+        short: List[List[str]] = []
+        long_: List[List[str]] = []
+        for g in groups:
+            fits = os.path.getsize(os.path.join(base, g[0])) <= SETTINGS["PREFIX_BYTES"]
+            (short if fits else long_).append(g)
+        counts["full_hashed"] = sum(len(g) for g in long_)
+        groups = short + _regroup(long_, full_key, ex)
+    finally:
+        if ex is not None:
+            ex.shutdown()
+    sets = [sorted(g, key=lambda r: (r.count("/"), r.lower())) for g in groups]
+    sets.sort(key=lambda g: g[0].lower())
+    return sets, counts
+
+
+def hardlink_copies(root: Path, dup_set: List[str], dry_run: bool) -> int:
+    """Ersetzt alle Kopien eines Satzes atomar durch Hardlinks auf das Original."""
+    original = root / dup_set[0]
+    linked = 0
+    for rel in dup_set[1:]:
+        copy = root / rel
+        if dry_run:
+            print(f"[DRY][LINK] {copy} -> {original}")
+            linked += 1
+            continue
+        tmp = copy.with_name(copy.name + ".obisdedupe.tmp")
+        try:
+            os.link(original, tmp)
+            os.replace(tmp, copy)
+        except OSError as exc:
+            if tmp.exists():
+                tmp.unlink()
+            print(f"[WARN] Hardlink nicht möglich ({exc}): {copy}")
+            continue
+        print(f"[LINK] {copy} -> {original}")
+        linked += 1
+    return linked
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Findet doppelte Anhänge (Größe -> Präfix-Hash -> voller Hash) und ersetzt Kopien optional durch Hardlinks."
+    )
+    parser.add_argument("root", nargs="?", default=Path("."), type=Path,
+                        help="Startordner (Default: aktuelles Verzeichnis '.')")
+    parser.add_argument("--workers", type=int, default=4, metavar="N",
+                        help="Threads zum Hashen (Default: 4).")
+    parser.add_argument("--min-size", type=int, default=None, metavar="BYTES",
+                        help=f"Kleinere Dateien ignorieren (MIN_SIZE, Default: {SETTINGS['MIN_SIZE']}).")
+    parser.add_argument("--hardlink", action="store_true",
+                        help="Kopien durch Hardlinks auf das Original (kürzester Pfad) ersetzen.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Mit --hardlink: nur anzeigen, nichts ändern.")
+    parser.add_argument("--report", type=Path, default=None,
+                        help="Duplikat-Sätze zusätzlich als JSON in diese Datei schreiben.")
+    args = parser.parse_args(argv)
+
+    root = args.root.resolve()
+    if not root.exists() or not root.is_dir():
+        raise SystemExit(f"Root nicht gefunden/kein Ordner: {root}")
+    if args.min_size is not None:
+        SETTINGS["MIN_SIZE"] = max(0, args.min_size)
+
+    sets, counts = find_duplicates(root, workers=max(1, args.workers))
+    wasted = 0
+    for dup_set in sets:
+        size = (root / dup_set[0]).stat().st_size
+        wasted += size * (len(dup_set) - 1)
+        print(f"[DUP] {len(dup_set)}× {human_size(size)}")
+        for i, rel in enumerate(dup_set):
+            print(f"   {'*' if i == 0 else ' '} {rel}")
+
+    linked = 0
+    if args.hardlink:
+        for dup_set in sets:
+            linked += hardlink_copies(root, dup_set, args.dry_run)
+
+    print(f"\nGescannt: {counts['scanned']} Dateien, gleiche Größe: {counts['size_candidates']}, "
+          f"gleicher Präfix: {counts['prefix_candidates']}, voll gehasht: {counts['full_hashed']}. "
+          f"Duplikat-Sätze: {len(sets)}, einsparbar: {human_size(wasted)}, verlinkt: {linked}.")
+    if args.report is not None:
+        payload = {"root": str(root), **counts, "wasted_bytes": wasted, "linked": linked,
+                   "sets": sets}
+        args.report.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ObisLinkCheck – findet nicht auflösbare [[Links]] und verwaiste Anhänge.
+
+- Nutzt den (inkrementellen) Link-Graphen aus linkgraph.py; derselbe Cache wie
+  P25ObisLinks --backlinks (.p25obislinks-graph.json im Startordner).
+- Einmal pro Lauf wird ein Hash-Index aller Dateinamen/Pfade gebaut, jede Referenz
+  wird dagegen mit O(1)-Lookups geprüft.
+- Verwaist = Anhang (keine .md), auf den keine Notiz verweist. Die generierten
+  #Files-Sektionen der P25ObisLinks-Indexe zählen dabei bewusst nicht.
+- Optional: verwaiste Anhänge in einen Quarantäne-Ordner verschieben (Pfad bleibt erhalten).
+"""
+
+import argparse
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from linkgraph import LinkGraph, NameIndex, is_note
+from P25ObisLinks import SETTINGS as LINK_SETTINGS, tool_files
+
+# =========================
+# USER SETTINGS (hier anpassen)
+# =========================
+SETTINGS: Dict[str, Any] = {
+    # Ziel für --quarantine (relativ zum Startordner); wird selbst nie geprüft
+    "QUARANTINE_DIR": "_Quarantaene",
+    # Dateiendungen, die nie als verwaist gelten (z. B. Skripte/Configs neben dem Vault-Inhalt)
+    "ORPHAN_IGNORE_EXT": {".py", ".ini", ".json", ".canvas"},
+}
+
+
+def find_broken(graph: LinkGraph, index: NameIndex) -> Tuple[List[Tuple[str, str]], set]:
+    """
+    Prüft jede Referenz gegen den Index. Liefert (defekte Links [(Quelle, Rohziel)],
+    Menge aller aufgelösten Ziele).
+    """
+    broken: List[Tuple[str, str]] = []
+    referenced: set = set()
+    for source, target, raw in graph.edges(index):
+        if target is None:
+            broken.append((source, raw))
+        else:
+            referenced.add(target)
+    return broken, referenced
+
+
+def find_orphans(files: List[str], referenced: set) -> List[str]:
+    ignore = {e.lower() for e in SETTINGS["ORPHAN_IGNORE_EXT"]}
+    return [rel for rel in files
+            if not is_note(rel) and rel not in referenced
+            and os.path.splitext(rel)[1].lower() not in ignore]
+
+
+def quarantine(root: Path, orphans: List[str], dry_run: bool) -> int:
+    """Verschiebt verwaiste Anhänge nach QUARANTINE_DIR (relative Pfade bleiben erhalten)."""
+    qroot = root / SETTINGS["QUARANTINE_DIR"]
+    moved = 0
+    for rel in orphans:
+        src = root / rel
+        dst = qroot / rel
+        if dry_run:
+            print(f"[DRY][MOVE] {src} -> {dst}")
+            moved += 1
+            continue
+        if dst.exists():
+            print(f"[WARN] Ziel existiert bereits, übersprungen: {dst}")
+            continue
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(src), str(dst))
+        print(f"[MOVE] {src} -> {dst}")
+        moved += 1
+    return moved
+
+
+def check(root: Path, workers: int = 4, dry_run: bool = False,
+          move: bool = False, save_graph: bool = True) -> Dict[str, Any]:
+    excluded = set(LINK_SETTINGS["EXCLUDE_FOLDERS"]) | {SETTINGS["QUARANTINE_DIR"]}
+    graph = LinkGraph.load(root, root / LINK_SETTINGS["GRAPH_FILENAME"])
+    parsed = graph.update(excluded, ignore_dot=LINK_SETTINGS["IGNORE_DOT_ITEMS"],
+                          workers=workers, skip_names=tool_files())
+    index = graph.name_index()
+    broken, referenced = find_broken(graph, index)
+    orphans = find_orphans(graph.files, referenced)
+
+    for source, raw in broken:
+        print(f"[BROKEN] {source} -> [[{raw}]]")
+    for rel in orphans:
+        print(f"[ORPHAN] {rel}")
+
+    moved = quarantine(root, orphans, dry_run) if move else 0
+    if save_graph and not dry_run:
+        graph.save()
+    return {
+        "root": str(root),
+        "files": len(index),
+        "notes": len(graph.notes),
+        "parsed": parsed,
+        "references": sum(len(t) for _, _, t in graph.notes.values()),
+        "broken": [{"source": s, "target": t} for s, t in broken],
+        "orphans": orphans,
+        "moved": moved,
+    }
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Prüft alle [[Links]] eines Vaults und meldet defekte Links sowie verwaiste Anhänge."
+    )
+    parser.add_argument("root", nargs="?", default=Path("."), type=Path,
+                        help="Startordner (Default: aktuelles Verzeichnis '.')")
+    parser.add_argument("--workers", type=int, default=4, metavar="N",
+                        help="Threads zum Einlesen geänderter Notizen (Default: 4).")
+    parser.add_argument("--quarantine", action="store_true",
+                        help="Verwaiste Anhänge nach QUARANTINE_DIR verschieben.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Nur anzeigen, nichts verschieben, Graph-Cache nicht schreiben.")
+    parser.add_argument("--report", type=Path, default=None,
+                        help="Ergebnis zusätzlich als JSON in diese Datei schreiben.")
+    parser.add_argument("--strict", action="store_true",
+                        help="Exit-Code 1, wenn defekte Links gefunden wurden (z. B. für CI/Cron).")
+    args = parser.parse_args(argv)
+
+    root = args.root.resolve()
+    if not root.exists() or not root.is_dir():
+        raise SystemExit(f"Root nicht gefunden/kein Ordner: {root}")
+
+    result = check(root, workers=args.workers, dry_run=args.dry_run, move=args.quarantine)
+    print(f"\nGeprüft: {result['notes']} Notizen, {result['references']} Links, {result['files']} Dateien. "
+          f"Defekt: {len(result['broken'])}, verwaist: {len(result['orphans'])}, "
+          f"verschoben: {result['moved']}.")
+    if args.report is not None:
+        args.report.write_text(json.dumps(result, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return 1 if args.strict and result["broken"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
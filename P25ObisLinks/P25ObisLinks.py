@@ -2,10 +2,33 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import mmap
 import os
+import posixpath
 import re
+import sys
+import time
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import TYPE_CHECKING, Callable, List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+if TYPE_CHECKING:  # concurrent.futures erst bei --workers > 1 laden (Startzeit)
+    from concurrent.futures import ThreadPoolExecutor
+
+def _use_core() -> None:
+    """Gemeinsame Module aus P25ObisCore importierbar machen."""
+    core = str(Path(__file__).resolve().parent.parent / "P25ObisCore")
+    if core not in sys.path:
+        sys.path.insert(0, core)
+
+_use_core()
+from fsbackend import OS, FileSystem  # noqa: E402
+from loaders import load_bounded, load_changes, load_checkpoint, load_progress  # noqa: E402
+from safewrite import Update, WriteConflict, is_scratch, update_text  # noqa: E402
+
+# Dateisystem-Backend aller Zugriffe auf den Vault (P25ObisCore/fsbackend.py);
+# run(..., fs=...) setzt es für die Dauer eines Laufs, z. B. MemoryFileSystem
+FS: FileSystem = OS
 
 # =========================
 # USER SETTINGS (hier anpassen)
@@ -24,67 +47,410 @@ SETTINGS: Dict[str, Any] = {
     "FOLDER_LINK_PREFIX": "",
     # Versteckte Elemente (beginnen mit ".") generell ignorieren?
     "IGNORE_DOT_ITEMS": True,
+    # Zustandsdatei für --incremental (liegt im Start-Root, taucht nie in Indexen auf)
+    "STATE_FILENAME": ".p25obislinks-state.json",
+    # Rekursive Kennzahlen (Notizen, Anhänge, Bytes unterhalb des Ordners) im Index zeigen?
+    "RECURSIVE_STATS": False,
+    # Vault-weite Map of Content im Start-Root, z. B. "Map of Content.md" ("" = aus)
+    "MOC_FILENAME": "",
+    # Große Ordner: mehr Einträge als PAGE_SIZE in #Markdown/#Files -> nummerierte
+    # Unterseiten "<Ordner>-Files-01.md" usw.; der Index verlinkt nur die Seiten (0 = aus)
+    "PAGE_SIZE": 0,
+    # Je Liste nur die ersten N Einträge einbetten (![[...]]), danach einfache Links (0 = alle einbetten)
+    "EMBED_LIMIT": 0,
+    # Frontmatter-Felder der Notizen, die hinter #Markdown-Einträgen erscheinen, z. B. ["title", "Datum", "Prozent"]
+    "MD_FIELDS": [],
+    # #Markdown nach einem Frontmatter-Feld sortieren ("" = Dateiname, "-Feld" = absteigend)
+    "MD_SORT_BY": "",
+    # Persistenter Header-Cache für MD_FIELDS/MD_SORT_BY (liegt im Start-Root)
+    "HEADER_CACHE_FILENAME": ".p25obislinks-headers.json",
+    # #Backlinks-Sektion: Notizen außerhalb des Ordners, die auf dessen Inhalte verlinken
+    "BACKLINKS": False,
+    # Persistenter Link-Graph für BACKLINKS (liegt im Start-Root, wird inkrementell nachgeführt)
+    "GRAPH_FILENAME": ".p25obislinks-graph.json",
+    # Ordner-Snapshots, die der Durchlauf der Verarbeitung vorauslaufen darf (0 = ohne Thread).
+    # Ohne RECURSIVE_STATS/MOC_FILENAME/BACKLINKS hängt der Speicher so nur vom größten Ordner ab.
+    "QUEUE_DIRS": 8,
+    # Fortschritt für --resume: zuletzt fertiger Ordner + Zähler (liegt im Start-Root,
+    # wird höchstens alle CHECKPOINT_SECONDS geschrieben und nach vollständigem Lauf gelöscht)
+    "CHECKPOINT_FILENAME": ".p25obislinks-checkpoint.json",
+    "CHECKPOINT_SECONDS": 30.0,
 }
 
 AUTOGEN_START = "<!-- AUTOGEN_START -->"
 AUTOGEN_END = "<!-- AUTOGEN_END -->"
+# Eigene Marker für die MOC-Seite, damit sie nie als (doppelter) Ordner-Index gilt
+MOC_START = "<!-- AUTOGEN_MOC_START -->"
+MOC_END = "<!-- AUTOGEN_MOC_END -->"
+# ... und für die Unterseiten großer Ordner
+PAGE_START = "<!-- AUTOGEN_PAGE_START -->"
+PAGE_END = "<!-- AUTOGEN_PAGE_END -->"
+PAGE_SECTIONS = ("Markdown", "Files")
+
+_AUTOGEN_START_B = AUTOGEN_START.encode("ascii")
+_AUTOGEN_END_B = AUTOGEN_END.encode("ascii")
+_PAGE_START_B = PAGE_START.encode("ascii")
+_PAGE_END_B = PAGE_END.encode("ascii")
+_SCAN_CHUNK = 1 << 16  # Dateien bis 64 KiB werden direkt gelesen, größere per mmap
+MAX_HEADER_BYTES = 1 << 16  # Frontmatter größer als 64 KiB wird nicht ausgewertet
+
+# Pro Ordner: Ergebnis der Marker-Erkennung je Datei (process_dir verwirft die Einträge
+# seines Ordners am Ende; bei eigenen Schreib-/Rename-Vorgängen nachgeführt)
+_AUTOGEN_CACHE: Dict[Path, bool] = {}
+_PAGE_CACHE: Dict[Path, bool] = {}  # dasselbe für Unterseiten-Blöcke
+
+
+# ---------- Fehler / Ergebnisse ----------
+
+class LinksError(Exception):
+    """Basis aller Fehler von P25ObisLinks."""
+
+class ConfigError(LinksError):
+    """Root fehlt/ist kein Ordner oder unbekannte Einstellung."""
+
+class ChangesError(LinksError):
+    """Änderungen seit einer Git-Revision nicht ermittelbar (--changed-since)."""
+
+class FileAction:
+    """
+    Eine Aktion an einer vom Tool verwalteten Datei (Index, Unterseite, MOC, Dublette).
+    action: created, updated, unchanged, renamed (old_path -> path), cleaned (AUTOGEN-Block
+    aus Dublette entfernt), page_cleaned/page_removed (veraltete Unterseite), conflict
+    (gleichzeitig geändert, übersprungen; Grund in detail).
+    str() ergibt die Logzeile der CLI.
+    """
+    __slots__ = ("action", "path", "old_path", "dry_run", "detail")
 
+    _LINES = {
+        ("created", False): "[OK]  {path}",
+        ("updated", False): "[OK]  {path}",
+        ("created", True): "[DRY] würde erzeugen: {path}",
+        ("updated", True): "[DRY] würde aktualisieren: {path}",
+        ("renamed", False): "[RENAME] {old_path} -> {path}",
+        ("renamed", True): "[DRY][RENAME] {old_path} -> {path}",
+        ("cleaned", False): "[CLEAN] AUTOGEN-Block entfernt aus: {path}",
+        ("cleaned", True): "[DRY][CLEAN] würde AUTOGEN-Block entfernen aus: {path}",
+        ("page_cleaned", False): "[CLEAN] Unterseiten-Block entfernt aus: {path}",
+        ("page_cleaned", True): "[DRY][CLEAN] würde Unterseiten-Block entfernen aus: {path}",
+        ("page_removed", False): "[CLEAN] veraltete Unterseite gelöscht: {path}",
+        ("page_removed", True): "[DRY][CLEAN] würde veraltete Unterseite entfernen: {path}",
+    }
+
+    def __init__(self, action: str, path: Path, dry_run: bool = False,
+                 old_path: Optional[Path] = None, detail: str = ""):
+        self.action = action
+        self.path = path
+        self.old_path = old_path
+        self.dry_run = dry_run
+        self.detail = detail  # Zusatz zur Logzeile, z. B. " (Fingerprint)"
+
+    @property
+    def changed(self) -> bool:
+        return self.action not in ("unchanged", "conflict")
+
+    def __str__(self) -> str:
+        if self.action == "unchanged":
+            return f"[SKIP] unverändert{self.detail}: {self.path}"
+        if self.action == "conflict":
+            return f"[KONFLIKT] {self.detail}: {self.path}"
+        return self._LINES[(self.action, self.dry_run)].format(path=self.path, old_path=self.old_path)
+
+    def __repr__(self) -> str:
+        return f"FileAction({self.action!r}, {str(self.path)!r})"
 
 # ---------- Hilfsfunktionen ----------
 
+# RunStats/TreeStats/DirSnapshot bewusst ohne @dataclass: dataclasses zieht inspect
+# nach sich (~10 ms Importzeit) – zu viel für `obis links` als Speicher-Hook.
+
+class RunStats:
+    """Zähler je Lauf (im Trockenlauf: was passieren *würde*)."""
+    __slots__ = ("created", "updated", "unchanged", "renamed", "cleaned", "conflicts")
+
+    def __init__(self, created: int = 0, updated: int = 0, unchanged: int = 0,
+                 renamed: int = 0, cleaned: int = 0, conflicts: int = 0):
+        self.created = created
+        self.updated = updated
+        self.unchanged = unchanged
+        self.renamed = renamed
+        self.cleaned = cleaned
+        self.conflicts = conflicts  # wegen gleichzeitiger Änderung übersprungen
+
+    def __repr__(self) -> str:
+        return f"RunStats({self.summary()})"
+
+    def merge(self, other: "RunStats") -> None:
+        self.created += other.created
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.renamed += other.renamed
+        self.cleaned += other.cleaned
+        self.conflicts += other.conflicts
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "created": self.created,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "renamed": self.renamed,
+            "cleaned": self.cleaned,
+            "conflicts": self.conflicts,
+        }
+
+    def summary(self) -> str:
+        text = (f"Indexe neu: {self.created}, aktualisiert: {self.updated}, "
+                f"unverändert: {self.unchanged}, umbenannt: {self.renamed}, "
+                f"bereinigt: {self.cleaned}")
+        if self.conflicts:
+            text += f", übersprungen (gleichzeitig geändert): {self.conflicts}"
+        return text
+
+class TreeStats:
+    """Rekursive Kennzahlen eines Ordners (inkl. aller Unterordner)."""
+    __slots__ = ("notes", "attachments", "size")
+
+    def __init__(self, notes: int = 0, attachments: int = 0, size: int = 0):
+        self.notes = notes
+        self.attachments = attachments
+        self.size = size
+
+    def add(self, other: "TreeStats") -> None:
+        self.notes += other.notes
+        self.attachments += other.attachments
+        self.size += other.size
+
+    def line(self) -> str:
+        return f"Notizen: {self.notes} | Anhänge: {self.attachments} | Größe: {human_size(self.size)}"
+
+def human_size(n: int) -> str:
+    size = float(n)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{int(size)} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{n} B"
+
 def is_hidden(p: Path) -> bool:
     return SETTINGS["IGNORE_DOT_ITEMS"] and p.name.startswith(".")
 
+class DirSnapshot:
+    """
+    Unmittelbare Einträge eines Ordners aus *einem* scandir-Durchlauf.
+    Die Typinformation stammt aus den gecachten DirEntry-Daten (kein stat pro Eintrag).
+    Nach eigenen Umbenennungen wird der Snapshot inkrementell nachgeführt statt neu gelesen.
+    """
+    __slots__ = ("path", "subs", "mds", "files", "walk_subs", "depth", "sigs")
+
+    def __init__(self, path: Path, depth: int = 0):
+        self.path = path
+        self.subs: List[Path] = []
+        self.mds: List[Path] = []
+        self.files: List[Path] = []
+        # Unterordner für den Abstieg (ohne Symlinks, wie os.walk(followlinks=False))
+        self.walk_subs: List[Path] = []
+        # Tiefe relativ zum Start-Root (0 = Root)
+        self.depth = depth
+        # (mtime_ns, size) je Datei (nur bei scan_dir(..., with_stat=True), z. B. für
+        # RECURSIVE_STATS oder den Header-Cache)
+        self.sigs: Dict[str, Tuple[int, int]] = {}
+
+    def has_md(self, name: str) -> bool:
+        return any(p.name == name for p in self.mds)
+
+    def rename_md(self, src: Path, dst: Path) -> None:
+        """Spiegelt ein Umbenennen src -> dst (im selben Ordner) in der md-Liste."""
+        self.mds = sorted([p for p in self.mds if p.name not in (src.name, dst.name)] + [dst],
+                          key=lambda p: p.name.lower())
+
+    def add_md(self, p: Path) -> None:
+        """Spiegelt eine neu angelegte md-Datei (z. B. den erzeugten Index)."""
+        if not self.has_md(p.name):
+            self.mds = sorted(self.mds + [p], key=lambda q: q.name.lower())
+
+    def remove_md(self, p: Path) -> None:
+        """Spiegelt eine gelöschte md-Datei (z. B. eine veraltete Unterseite)."""
+        self.mds = [q for q in self.mds if q.name != p.name]
+
+def tool_files() -> Tuple[str, ...]:
+    """Eigene Zustands-/Cache-Dateien; erscheinen nie in Indexen."""
+    return (SETTINGS["STATE_FILENAME"], SETTINGS["HEADER_CACHE_FILENAME"], SETTINGS["GRAPH_FILENAME"],
+            SETTINGS["CHECKPOINT_FILENAME"])
+
+def scan_dir(path: Path, excluded: set, depth: int = 0, with_stat: bool = False) -> DirSnapshot:
+    snap = DirSnapshot(path=path, depth=depth)
+    for entry in FS.scandir(path):
+        if SETTINGS["IGNORE_DOT_ITEMS"] and entry.name.startswith("."):
+            continue
+        if entry.name in tool_files() or is_scratch(entry.name):
+            continue  # auch Sperr-/Temp-Dateien laufender Schreibvorgänge (safewrite)
+        try:
+            if entry.is_dir():
+                if entry.name in excluded:
+                    continue
+                p = path / entry.name
+                snap.subs.append(p)
+                if not entry.is_symlink():
+                    snap.walk_subs.append(p)
+            elif entry.is_file():
+                if os.path.splitext(entry.name)[1].lower() == ".md":
+                    snap.mds.append(path / entry.name)
+                else:
+                    snap.files.append(path / entry.name)
+                if with_stat:
+                    st = entry.stat()
+                    snap.sigs[entry.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            continue  # Eintrag zwischenzeitlich verschwunden/unlesbar
+    for lst in (snap.subs, snap.mds, snap.files, snap.walk_subs):
+        lst.sort(key=lambda p: p.name.lower())
+    return snap
+
 def list_immediate(path: Path, excluded: set) -> Tuple[List[Path], List[Path], List[Path]]:
-    subs = sorted([d for d in path.iterdir()
-                   if d.is_dir() and not is_hidden(d) and d.name not in excluded],
-                  key=lambda p: p.name.lower())
-    mds  = sorted([f for f in path.iterdir()
-                   if f.is_file() and f.suffix.lower()==".md" and not is_hidden(f)],
-                  key=lambda p: p.name.lower())
-    files= sorted([f for f in path.iterdir()
-                   if f.is_file() and f.suffix.lower()!=".md" and not is_hidden(f)],
-                  key=lambda p: p.name.lower())
-    return subs, mds, files
+    snap = scan_dir(path, excluded)
+    return snap.subs, snap.mds, snap.files
 
 def read_text_safe(p: Path) -> str:
     try:
-        return p.read_text(encoding="utf-8")
+        return FS.read_text(p, encoding="utf-8")
     except UnicodeDecodeError:
         # Fallback, falls Encoding daneben lag
-        return p.read_text(errors="ignore")
+        return FS.read_text(p, encoding="utf-8", errors="ignore")
+
+def page_name(dir_name: str, section: str, nr: int) -> str:
+    return f"{dir_name}-{section}-{nr:02d}.md"
+
+def is_page_name(dir_name: str, name: str) -> bool:
+    """Entspricht name dem Schema der Unterseiten "<Ordner>-<Sektion>-NN.md"?"""
+    for section in PAGE_SECTIONS:
+        prefix = f"{dir_name}-{section}-"
+        if name.startswith(prefix) and name.endswith(".md"):
+            nr = name[len(prefix):-3]
+            return len(nr) >= 2 and nr.isdigit()
+    return False
+
+def is_page(snap: DirSnapshot, p: Path) -> bool:
+    """
+    Vom Tool erzeugte Unterseite: passender Name *und* Unterseiten-Block – eine eigene Notiz,
+    die zufällig "<Ordner>-Markdown-01.md" heißt, bleibt eine Notiz. Unabhängig von PAGE_SIZE,
+    damit Reste nach dem Abschalten der Unterseiten erkannt und gelöscht werden.
+    """
+    return is_page_name(snap.path.name, p.name) and has_page_block(p)
+
+def generated_names(snap: DirSnapshot) -> set:
+    """Vom Tool selbst erzeugte md-Dateien eines Ordners (nie eingebettet/gezählt)."""
+    names = {determine_index_name(snap.path.name)}
+    if snap.depth == 0 and SETTINGS["MOC_FILENAME"]:
+        names.add(SETTINGS["MOC_FILENAME"])
+    names.update(p.name for p in snap.mds if is_page(snap, p))
+    return names
+
+def entry_lines(names: List[str], suffixes: Optional[Dict[str, str]] = None) -> List[str]:
+    """Einbettungen, ab EMBED_LIMIT nur noch einfache Links; optional mit Feld-Suffix."""
+    limit = SETTINGS["EMBED_LIMIT"]
+    suffixes = suffixes or {}
+    return [(f"![[{n}]]" if not limit or i < limit else f"[[{n}]]") + suffixes.get(n, "")
+            for i, n in enumerate(names)]
+
+def field_suffix(fields: Dict[str, str]) -> str:
+    """' (title: X | Prozent: 80%)' aus den konfigurierten MD_FIELDS (leere Felder entfallen)."""
+    shown = [f"{k}: {fields[k]}" for k in SETTINGS["MD_FIELDS"] if fields.get(k)]
+    return f" ({' | '.join(shown)})" if shown else ""
+
+def _sort_value(value: Optional[str]) -> Tuple[int, float, str]:
+    """Zahlen (auch "80% | ...") numerisch, sonst als Text; fehlende Werte zuletzt."""
+    if not value:
+        return (2, 0.0, "")
+    m = re.match(r"\s*(-?\d+(?:[.,]\d+)?)", value)
+    if m:
+        return (0, float(m.group(1).replace(",", ".")), value.lower())
+    return (1, 0.0, value.lower())
+
+def sort_by_field(names: List[str], headers: Dict[str, Dict[str, str]], spec: str) -> List[str]:
+    key, descending = (spec[1:], True) if spec.startswith("-") else (spec, False)
+    present = [n for n in names if headers.get(n, {}).get(key)]
+    missing = [n for n in names if not headers.get(n, {}).get(key)]
+    present.sort(key=lambda n: _sort_value(headers[n][key]), reverse=descending)
+    return present + missing
+
+def build_page(dir_name: str, section: str, nr: int, total: int, names: List[str],
+               suffixes: Optional[Dict[str, str]] = None) -> str:
+    parts = [PAGE_START, f"[[{dir_name}]] · {section} {nr}/{total}", "\n---"]
+    parts.extend(entry_lines(names, suffixes))
+    parts.append(PAGE_END)
+    return "\n".join(parts) + "\n"
+
+def folder_link_target(d: Path) -> str:
+    return f"{SETTINGS['FOLDER_LINK_PREFIX']}{d.name}" if SETTINGS["FOLDER_LINK_PREFIX"] else d.name
 
 def build_block(subfolders: List[Path], md_files: List[Path], other_files: List[Path],
-                index_filename: str) -> str:
+                index_filename: str, skip_names: Iterable[str] = (),
+                tree_stats: Optional[TreeStats] = None,
+                headers: Optional[Dict[str, Dict[str, str]]] = None,
+                backlinks: Optional[List[str]] = None) -> str:
+    return build_index(subfolders, md_files, other_files, index_filename,
+                       skip_names=skip_names, tree_stats=tree_stats, headers=headers,
+                       backlinks=backlinks)[0]
+
+def build_index(subfolders: List[Path], md_files: List[Path], other_files: List[Path],
+                index_filename: str, skip_names: Iterable[str] = (),
+                tree_stats: Optional[TreeStats] = None,
+                headers: Optional[Dict[str, Dict[str, str]]] = None,
+                backlinks: Optional[List[str]] = None) -> Tuple[str, Dict[str, str]]:
+    """
+    Liefert den AUTOGEN-Block des Index und die Unterseiten {Dateiname: Block}
+    (nur bei PAGE_SIZE und Sektionen mit mehr als PAGE_SIZE Einträgen).
+    headers: Frontmatter-Felder je md-Dateiname (für MD_FIELDS/MD_SORT_BY).
+    backlinks: Notizen (Pfad relativ zum Start-Root) mit Links in diesen Ordner.
+    """
     parts: List[str] = [AUTOGEN_START]
+    pages: Dict[str, str] = {}
+    dir_name = Path(index_filename).stem
+    skip = {index_filename, *skip_names}
+
+    # #Stats (rekursiv, optional)
+    if tree_stats is not None:
+        parts.append("\n---\n#Stats")
+        parts.append(tree_stats.line())
 
     # #Folder
     folder_lines = []
     for d in subfolders:
-        link_target = f"{SETTINGS['FOLDER_LINK_PREFIX']}{d.name}" if SETTINGS["FOLDER_LINK_PREFIX"] else d.name
-        folder_lines.append(f"[[{link_target}]]")
+        folder_lines.append(f"[[{folder_link_target(d)}]]")
     if folder_lines:
         parts.append("\n---\n#Folder")
         parts.extend(folder_lines)
 
-    # #Markdown
-    md_lines = []
-    for f in md_files:
-        if f.name == index_filename:
-            continue  # nicht sich selbst einbetten
-        md_lines.append(f"![[{f.name}]]")
-    if md_lines:
-        parts.append("\n---\n#Markdown")
-        parts.extend(md_lines)
-
-    # #Files
-    file_lines = [f"![[{f.name}]]" for f in other_files]
-    if file_lines:
-        parts.append("\n---\n#Files")
-        parts.extend(file_lines)
+    # #Markdown (nicht sich selbst, die MOC oder Unterseiten einbetten) / #Files
+    md_names = [f.name for f in md_files if f.name not in skip]
+    file_names = [f.name for f in other_files]
+    md_suffixes: Dict[str, str] = {}
+    if headers is not None:
+        if SETTINGS["MD_SORT_BY"]:
+            md_names = sort_by_field(md_names, headers, SETTINGS["MD_SORT_BY"])
+        if SETTINGS["MD_FIELDS"]:
+            md_suffixes = {n: field_suffix(headers.get(n, {})) for n in md_names}
+    page_size = SETTINGS["PAGE_SIZE"]
+    for section, names, suffixes in zip(PAGE_SECTIONS, (md_names, file_names), (md_suffixes, {})):
+        if not names:
+            continue
+        parts.append(f"\n---\n#{section}")
+        if page_size and len(names) > page_size:
+            chunks = [names[i:i + page_size] for i in range(0, len(names), page_size)]
+            for nr, chunk in enumerate(chunks, start=1):
+                name = page_name(dir_name, section, nr)
+                pages[name] = build_page(dir_name, section, nr, len(chunks), chunk, suffixes)
+                first = (nr - 1) * page_size + 1
+                parts.append(f"[[{name[:-3]}]] ({first}–{first + len(chunk) - 1})")
+        else:
+            parts.extend(entry_lines(names, suffixes))
+
+    # #Backlinks (optional): einfache Links, keine Einbettungen
+    if backlinks:
+        parts.append("\n---\n#Backlinks")
+        parts.extend(f"[[{b[:-3] if b.lower().endswith('.md') else b}]]" for b in backlinks)
 
     parts.append(AUTOGEN_END)
-    return ("\n".join(parts)).strip() + "\n"
+    return ("\n".join(parts)).strip() + "\n", pages
 
 def strip_placeholder_links(content: str) -> str:
     """
@@ -98,35 +464,87 @@ def strip_placeholder_links(content: str) -> str:
         r"(^|\n)#{1,6}\s*Links\s*\n(?:\s*\[\[\]\]\s*\n?)+",
         flags=re.IGNORECASE
     )
-    return re.sub(pattern, r"\\1", content)
+    return re.sub(pattern, r"\1", content)
 
-def merge_content(existing: str, new_block: str) -> str:
+def merge_content(existing: str, new_block: str,
+                  start: str = AUTOGEN_START, end: str = AUTOGEN_END) -> str:
     if not existing:
         return new_block
     cleaned = strip_placeholder_links(existing)
-    if AUTOGEN_START in cleaned and AUTOGEN_END in cleaned:
+    if start in cleaned and end in cleaned:
         pattern = re.compile(
-            re.escape(AUTOGEN_START) + r".*?" + re.escape(AUTOGEN_END),
+            re.escape(start) + r".*?" + re.escape(end),
             flags=re.DOTALL
         )
-        merged = pattern.sub(new_block.strip(), cleaned)
-        if not merged.endswith("\\n"):
-            merged += "\\n"
+        merged = pattern.sub(lambda _m: new_block.strip(), cleaned)
+        if not merged.endswith("\n"):
+            merged += "\n"
         return merged
     else:
-        sep = "" if cleaned.endswith("\\n\\n") else ("\\n" if cleaned.endswith("\\n") else "\\n\\n")
+        sep = "" if cleaned.endswith("\n\n") else ("\n" if cleaned.endswith("\n") else "\n\n")
         return f"{cleaned}{sep}{new_block}"
 
 def determine_index_name(dir_name: str) -> str:
     # Immer <Ordnername>.md (kein Sonderfall)
     return f"{dir_name}.md"
 
-def has_autogen_block(p: Path) -> bool:
+def _stream_has_markers(fh, start: bytes, end: bytes) -> bool:
+    """Begrenzter Streaming-Scan (Chunks mit Überlappung) nach beiden Markern."""
+    keep = max(len(start), len(end)) - 1
+    found_start = found_end = False
+    tail = b""
+    while True:
+        chunk = fh.read(_SCAN_CHUNK)
+        if not chunk:
+            return False
+        buf = tail + chunk
+        found_start = found_start or start in buf
+        found_end = found_end or end in buf
+        if found_start and found_end:
+            return True
+        tail = buf[-keep:]
+
+def _scan_markers(p: Path, start: bytes, end: bytes) -> bool:
+    """Sucht die Marker in den Rohbytes (ASCII), ohne die Datei zu dekodieren."""
+    with FS.open_read(p) as fh:
+        try:
+            fd = fh.fileno()
+        except (ValueError, OSError):
+            # kein Dateideskriptor (z. B. MemoryFileSystem) -> Streaming
+            return _stream_has_markers(fh, start, end)
+        size = os.fstat(fd).st_size
+        if size <= _SCAN_CHUNK:
+            data = fh.read()
+            return start in data and end in data
+        try:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                return mm.find(start) != -1 and mm.find(end) != -1
+        except (ValueError, OSError):
+            # Dateisystem ohne mmap-Unterstützung -> Streaming
+            fh.seek(0)
+            return _stream_has_markers(fh, start, end)
+
+def _has_markers(p: Path, start: bytes, end: bytes, cache: Dict[Path, bool]) -> bool:
+    cached = cache.get(p)
+    if cached is not None:
+        return cached
     try:
-        text = read_text_safe(p)
+        found = _scan_markers(p, start, end)
     except Exception:
         return False
-    return (AUTOGEN_START in text) and (AUTOGEN_END in text)
+    cache[p] = found
+    return found
+
+def has_autogen_block(p: Path) -> bool:
+    return _has_markers(p, _AUTOGEN_START_B, _AUTOGEN_END_B, _AUTOGEN_CACHE)
+
+def has_page_block(p: Path) -> bool:
+    """Enthält p einen Unterseiten-Block (beide Marker)? Nur für Dateien mit Seitennamen geprüft."""
+    return _has_markers(p, _PAGE_START_B, _PAGE_END_B, _PAGE_CACHE)
+
+def reset_autogen_cache() -> None:
+    _AUTOGEN_CACHE.clear()
+    _PAGE_CACHE.clear()
 
 def remove_autogen_block_from_text(text: str) -> str:
     pattern = re.compile(
@@ -134,34 +552,411 @@ def remove_autogen_block_from_text(text: str) -> str:
         flags=re.DOTALL
     )
     cleaned = pattern.sub("", text).strip()
-    if cleaned and not cleaned.endswith("\\n"):
-        cleaned += "\\n"
+    if cleaned and not cleaned.endswith("\n"):
+        cleaned += "\n"
     return cleaned
 
-def remove_autogen_block_from_file(path: Path, dry_run: bool = False) -> None:
-    content = read_text_safe(path)
-    if AUTOGEN_START in content and AUTOGEN_END in content:
-        cleaned = remove_autogen_block_from_text(content)
-        if dry_run:
-            print(f"[DRY][CLEAN] würde AUTOGEN-Block entfernen aus: {path}")
-        else:
-            path.write_text(cleaned, encoding="utf-8")
-            print(f"[CLEAN] AUTOGEN-Block entfernt aus: {path}")
+def update_guarded(path: Path, edit: Callable[[Optional[str]], Optional[str]],
+                   log: Callable[[Any], None], stats: Optional[RunStats] = None) -> Optional[Update]:
+    """
+    Schreibt edit(Inhalt) nach path (None = löschen), ohne zwischenzeitliche Änderungen
+    (Obsidian, andere Tools) zu überschreiben – siehe P25ObisCore/safewrite.py. None, wenn
+    die Datei als Konflikt übersprungen wurde (geloggt und in stats gezählt).
+    """
+    try:
+        return update_text(FS, path, edit, errors="ignore", owner="links")
+    except WriteConflict as e:
+        if stats is not None:
+            stats.conflicts += 1
+        log(FileAction("conflict", path, detail=e.reason))
+        return None
+
+def remove_autogen_block_from_file(path: Path, dry_run: bool = False,
+                                   log: Callable[[Any], None] = print,
+                                   stats: Optional[RunStats] = None) -> bool:
+    """Entfernt den AUTOGEN-Block; True, wenn (im Trockenlauf: würde) bereinigt."""
+    if dry_run:
+        content = read_text_safe(path)
+        if AUTOGEN_START in content and AUTOGEN_END in content:
+            log(FileAction("cleaned", path, dry_run))
+            return True
+        return False
+
+    def clean(text: Optional[str]) -> Optional[str]:
+        if text is None or AUTOGEN_START not in text or AUTOGEN_END not in text:
+            return text
+        return remove_autogen_block_from_text(text)
+
+    update = update_guarded(path, clean, log, stats)
+    if update is None or not update.written:
+        return False
+    _AUTOGEN_CACHE[path] = False
+    log(FileAction("cleaned", path))
+    return True
+
+# ---------- Inkrementeller Zustand ----------
+
+STATE_VERSION = 1
+
+def listing_fingerprint(snap: DirSnapshot, tree_stats: Optional[TreeStats] = None,
+                        backlinks: Optional[List[str]] = None) -> str:
+    """
+    Fingerprint der Eingaben eines Index-Blocks: unmittelbare Einträge (nach Ausschluss
+    und Dot-Filter) plus FOLDER_LINK_PREFIX und die übrigen Layout-Settings.
+    Inhalte der Notizen fließen nicht ein.
+    Mit RECURSIVE_STATS zählen zusätzlich die rekursiven Kennzahlen dazu, mit
+    MD_FIELDS/MD_SORT_BY die Signaturen (mtime_ns, size) der Notizen (ohne Index und
+    Unterseiten), mit BACKLINKS
+    die Liste der verlinkenden Notizen.
+    """
+    import hashlib  # erst hier: ohne --incremental wird nie gehasht
+
+    settings_key = "\0".join(str(SETTINGS[k]) for k in (
+        "FOLDER_LINK_PREFIX", "MOC_FILENAME", "PAGE_SIZE", "EMBED_LIMIT", "MD_FIELDS", "MD_SORT_BY"))
+    h = hashlib.sha1(f"v{STATE_VERSION}\0{settings_key}".encode("utf-8"))
+    if tree_stats is not None:
+        h.update(f"\0s{tree_stats.notes},{tree_stats.attachments},{tree_stats.size}".encode("ascii"))
+    if backlinks is not None:
+        for b in backlinks:
+            h.update(f"\0b{b}".encode("utf-8", "surrogateescape"))
+    for tag, entries in (("d", snap.subs), ("m", snap.mds), ("f", snap.files)):
+        for p in entries:
+            h.update(f"\0{tag}{p.name}".encode("utf-8", "surrogateescape"))
+    if uses_headers():
+        # Frontmatter-Felder hängen vom Inhalt ab -> Signatur der Notizen mit aufnehmen. Ohne
+        # die selbst erzeugten Dateien: deren Signatur ändert sich durch das Schreiben des
+        # Index, der Fingerprint des nächsten Laufs träfe sonst nie.
+        skip = generated_names(snap)
+        for p in snap.mds:
+            if p.name not in skip:
+                h.update(f"\0{snap.sigs.get(p.name)}".encode("ascii"))
+    return h.hexdigest()
+
+def block_hash(block: str) -> str:
+    import hashlib
+
+    return hashlib.sha1(block.encode("utf-8", "surrogateescape")).hexdigest()
+
+def _file_signature(p: Path) -> Optional[List[int]]:
+    try:
+        st = FS.stat(p)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+class LinkState:
+    """
+    Persistenter Zustand je Ordner (Schlüssel: Pfad relativ zum Start-Root):
+    Listing-Fingerprint, Hash des erzeugten Blocks und Signatur (mtime_ns, size) der Indexdatei.
+    """
+
+    def __init__(self, root: Path, path: Path):
+        self.root = root
+        self.path = path
+        self.dirs: Dict[str, Dict[str, Any]] = {}
+        self.seen: set = set()
+
+    @classmethod
+    def load(cls, root: Path) -> "LinkState":
+        import json  # nur mit --incremental nötig -> nicht beim Start laden
+
+        state = cls(root, root / SETTINGS["STATE_FILENAME"])
+        try:
+            data = json.loads(FS.read_text(state.path, encoding="utf-8"))
+        except (OSError, ValueError):
+            return state  # fehlt/defekt -> Vollauf
+        if data.get("version") == STATE_VERSION and isinstance(data.get("dirs"), dict):
+            state.dirs = data["dirs"]
+        return state
+
+    def key(self, dir_path: Path) -> str:
+        return os.path.relpath(dir_path, self.root)
+
+    @staticmethod
+    def _files_intact(entry: Dict[str, Any], dir_path: Path, index_path: Path) -> bool:
+        """Indexdatei (und ggf. Unterseiten) seit dem letzten Lauf unberührt?"""
+        if entry.get("index") is None or entry["index"] != _file_signature(index_path):
+            return False
+        return all(sig == _file_signature(dir_path / name)
+                   for name, sig in entry.get("pages", {}).items())
+
+    def is_fresh(self, dir_path: Path, fingerprint: str, index_path: Path) -> bool:
+        """Listing und Indexdatei unverändert seit dem letzten Lauf?"""
+        key = self.key(dir_path)
+        self.seen.add(key)
+        entry = self.dirs.get(key)
+        if not entry or entry.get("fp") != fingerprint:
+            return False
+        return self._files_intact(entry, dir_path, index_path)
+
+    def block_unchanged(self, dir_path: Path, bhash: str, index_path: Path) -> bool:
+        """Gleicher Block wie beim letzten Lauf und Indexdatei seitdem unberührt?"""
+        entry = self.dirs.get(self.key(dir_path))
+        return bool(entry) and entry.get("block") == bhash and self._files_intact(entry, dir_path, index_path)
+
+    def record(self, dir_path: Path, fingerprint: str, bhash: str, index_path: Path,
+               pages: Iterable[str] = ()) -> None:
+        key = self.key(dir_path)
+        self.seen.add(key)
+        entry: Dict[str, Any] = {"fp": fingerprint, "block": bhash, "index": _file_signature(index_path)}
+        page_sigs = {name: _file_signature(dir_path / name) for name in pages}
+        if page_sigs:
+            entry["pages"] = page_sigs
+        self.dirs[key] = entry
+
+    def save(self, prune: bool = True) -> None:
+        """Atomar schreiben; prune entfernt Ordner, die in diesem Lauf nicht mehr vorkamen."""
+        import json
+
+        dirs = {k: v for k, v in self.dirs.items() if k in self.seen} if prune else self.dirs
+        payload = json.dumps({"version": STATE_VERSION, "dirs": dirs},
+                             ensure_ascii=False, sort_keys=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        FS.write_text(tmp, payload, encoding="utf-8")
+        FS.replace(tmp, self.path)
+
+# ---------- Frontmatter-Header (MD_FIELDS / MD_SORT_BY) ----------
+
+def _unquote(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+def parse_header_lines(lines: Iterable[str]) -> Dict[str, str]:
+    """
+    Minimaler Frontmatter-Parser (Standardbibliothek): Top-Level "key: value";
+    Listenelemente ("- x") werden komma-getrennt an den vorigen Key gehängt.
+    """
+    data: Dict[str, str] = {}
+    current: Optional[str] = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if line[0] in " \t-":
+            if current is not None and stripped.startswith("- "):
+                item = _unquote(stripped[2:])
+                data[current] = f"{data[current]}, {item}" if data[current] else item
+            continue
+        key, sep, value = line.partition(":")
+        if not sep:
+            continue
+        current = key.strip()
+        data[current] = _unquote(value)
+    return data
+
+def read_header(p: Path) -> Dict[str, str]:
+    """
+    Liest nur den Frontmatter-Kopf: stoppt am schließenden '---' (oder '...')
+    und nach spätestens MAX_HEADER_BYTES. Der Rest der Notiz wird nie gelesen.
+    """
+    with FS.open_read(p) as fh:
+        first = fh.readline(MAX_HEADER_BYTES)
+        if first.lstrip(b"\xef\xbb\xbf").strip() != b"---":
+            return {}
+        total = len(first)
+        lines: List[str] = []
+        while total < MAX_HEADER_BYTES:
+            raw = fh.readline(MAX_HEADER_BYTES - total)
+            if not raw:
+                break
+            total += len(raw)
+            if raw.strip() in (b"---", b"..."):
+                return parse_header_lines(lines)
+            lines.append(raw.decode("utf-8", errors="replace").rstrip("\r\n"))
+    return {}
+
+class HeaderCache:
+    """
+    Persistenter Cache der Frontmatter-Felder, Schlüssel (Pfad, mtime_ns, size).
+    Nur geänderte Notizen werden (Kopf-)gelesen.
+    """
+
+    def __init__(self, root: Path, path: Path):
+        self.root = root
+        self.path = path
+        self.entries: Dict[str, List[Any]] = {}
+        self.seen: set = set()
+        self.dirty = False
+
+    @classmethod
+    def load(cls, root: Path) -> "HeaderCache":
+        import json
+
+        cache = cls(root, root / SETTINGS["HEADER_CACHE_FILENAME"])
+        try:
+            data = json.loads(FS.read_text(cache.path, encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+        if data.get("version") == STATE_VERSION and isinstance(data.get("files"), dict):
+            cache.entries = data["files"]
+        return cache
+
+    def fields(self, p: Path, sig: Optional[Tuple[int, int]] = None) -> Dict[str, str]:
+        key = os.path.relpath(p, self.root)
+        self.seen.add(key)
+        if sig is None:
+            current = _file_signature(p)
+            if current is None:
+                return {}
+            sig = (current[0], current[1])
+        hit = self.entries.get(key)
+        if hit is not None and hit[0] == sig[0] and hit[1] == sig[1]:
+            return hit[2]
+        try:
+            data = read_header(p)
+        except OSError:
+            data = {}
+        self.entries[key] = [sig[0], sig[1], data]
+        self.dirty = True
+        return data
+
+    def save(self, prune: bool = True) -> None:
+        """prune entfernt Notizen, die in diesem Lauf nicht gelesen wurden."""
+        entries = {k: v for k, v in self.entries.items() if k in self.seen} if prune else self.entries
+        if not self.dirty and len(entries) == len(self.entries):
+            return
+        import json
+
+        payload = json.dumps({"version": STATE_VERSION, "files": entries},
+                             ensure_ascii=False, sort_keys=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        FS.write_text(tmp, payload, encoding="utf-8")
+        FS.replace(tmp, self.path)
+
+def uses_headers() -> bool:
+    return bool(SETTINGS["MD_FIELDS"] or SETTINGS["MD_SORT_BY"])
+
+# ---------- Rekursive Kennzahlen / Map of Content ----------
+
+def own_stats(snap: DirSnapshot) -> TreeStats:
+    """Kennzahlen der unmittelbaren Einträge (ohne vom Tool erzeugte Seiten)."""
+    skip = generated_names(snap)
+    notes = [p for p in snap.mds if p.name not in skip]
+    size = sum(snap.sigs.get(p.name, (0, 0))[1] for p in notes + snap.files)
+    return TreeStats(notes=len(notes), attachments=len(snap.files), size=size)
+
+def aggregate_stats(snap: DirSnapshot, tree: Dict[Path, TreeStats]) -> TreeStats:
+    """Eigene Kennzahlen + bereits berechnete Summen der Unterordner (Bottom-up)."""
+    agg = own_stats(snap)
+    for sub in snap.walk_subs:
+        child = tree.get(sub)
+        if child is not None:
+            agg.add(child)
+    return agg
+
+def bottom_up_order(snaps: List[DirSnapshot]) -> List[List[DirSnapshot]]:
+    """
+    Gruppiert die (Pre-Order-)Snapshots nach Tiefe, tiefste zuerst. Innerhalb einer
+    Gruppe bleibt die Pre-Order erhalten; jede Gruppe hängt nur von tieferen ab.
+    """
+    by_depth: Dict[int, List[DirSnapshot]] = {}
+    for snap in snaps:
+        by_depth.setdefault(snap.depth, []).append(snap)
+    return [by_depth[d] for d in sorted(by_depth, reverse=True)]
+
+def build_moc(snaps: List[DirSnapshot], tree: Dict[Path, TreeStats], excluded: set) -> str:
+    """Vault-weite Map of Content als verschachtelte Liste (Pre-Order)."""
+    lines: List[str] = [MOC_START]
+    for snap in snaps:
+        if is_skipped_dir(snap.path, excluded):
+            continue
+        line = f"{chr(9) * snap.depth}- [[{folder_link_target(snap.path)}]]"
+        agg = tree.get(snap.path)
+        if agg is not None and SETTINGS["RECURSIVE_STATS"]:
+            line += f" ({agg.line()})"
+        lines.append(line)
+    lines.append(MOC_END)
+    return "\n".join(lines) + "\n"
+
+def sync_generated(path: Path, read_from: Optional[Path], block: str, dry_run: bool,
+                   stats: RunStats, log: Callable[[Any], None] = print,
+                   start: str = AUTOGEN_START, end: str = AUTOGEN_END) -> bool:
+    """
+    Mergt block in path (bestehender Inhalt aus read_from, None = neu) und schreibt nur
+    bei Änderungen. Rückgabe: True, wenn geschrieben wurde (bzw. im Trockenlauf würde).
+    """
+    def merge(existing: Optional[str]) -> str:
+        return merge_content(existing or "", block, start=start, end=end)
+
+    if dry_run:
+        existing = read_text_safe(read_from) if read_from is not None else None
+        merged = merge(existing)
+    else:
+        # Gelesen wird erst beim Schreiben: bei gleichzeitiger Änderung neu lesen und neu mergen
+        update = update_guarded(path, merge, log, stats)
+        if update is None:
+            return False
+        existing, merged = update.before, update.after
+
+    # Nur schreiben, wenn sich der Inhalt tatsächlich ändert (mtime/Sync/Git schonen)
+    if existing is not None and merged == existing:
+        stats.unchanged += 1
+        log(FileAction("unchanged", path, dry_run))
+        return False
+    if existing is None:
+        stats.created += 1
+    else:
+        stats.updated += 1
+    log(FileAction("created" if existing is None else "updated", path, dry_run))
+    return True
+
+def write_moc(root: Path, snaps: List[DirSnapshot], tree: Dict[Path, TreeStats], excluded: set,
+              dry_run: bool, stats: RunStats, log: Callable[[Any], None] = print) -> None:
+    moc_path = root / SETTINGS["MOC_FILENAME"]
+    block = build_moc(snaps, tree, excluded)
+    read_from = moc_path if FS.is_file(moc_path) else None
+    sync_generated(moc_path, read_from, block, dry_run, stats, log, start=MOC_START, end=MOC_END)
+
+def remove_stale_page(path: Path, dry_run: bool, log: Callable[[Any], None] = print,
+                      stats: Optional[RunStats] = None) -> bool:
+    """
+    Löscht eine nicht mehr benötigte Unterseite; eigener Inhalt außerhalb der Marker bleibt.
+    True, wenn (im Trockenlauf: würde) bereinigt. Eine Datei ohne Unterseiten-Block wird nie
+    gelöscht oder gezählt.
+    """
+    pattern = re.compile(re.escape(PAGE_START) + r".*?" + re.escape(PAGE_END), flags=re.DOTALL)
+
+    def strip(text: Optional[str]) -> Optional[str]:
+        if text is None or PAGE_START not in text or PAGE_END not in text:
+            return text  # keine Unterseite (mehr) -> nicht anfassen
+        rest = pattern.sub("", text).strip()
+        return rest + "\n" if rest else None
+
+    if dry_run:
+        text = read_text_safe(path)
+        after = strip(text)
+        if after == text:
+            return False
+        log(FileAction("page_removed" if after is None else "page_cleaned", path, dry_run))
+        return True
+    update = update_guarded(path, strip, log, stats)
+    if update is None or not update.written:
+        return False
+    log(FileAction("page_removed" if update.after is None else "page_cleaned", path))
+    return True
 
 # ---------- Verarbeitung ----------
 
-def choose_canonical_index(dir_path: Path, md_files: List[Path], expected_index: Path) -> Tuple[Path, List[Path]]:
+def choose_canonical_index(dir_path: Path, md_files: List[Path], expected_index: Path,
+                           expected_exists: Optional[bool] = None) -> Tuple[Path, List[Path]]:
     """
     Wählt die *kanonische* Index-Datei (die die AUTOGEN-Sektion tragen soll) und liefert
     zusätzlich die Liste aller weiteren Dateien, die fälschlich eine AUTOGEN-Sektion enthalten.
+    expected_exists: bereits bekannte Existenz der erwarteten Datei (aus dem Snapshot).
     """
     # Kandidaten mit AUTOGEN-Sektion
     candidates = [p for p in md_files if has_autogen_block(p)]
 
+    if expected_exists is None:
+        expected_exists = FS.exists(expected_index)
+
     # Falls erwartete Indexdatei existiert, priorisieren
-    if expected_index.exists():
+    if expected_exists:
         canonical = expected_index
-        duplicates = [p for p in candidates if p.resolve() != expected_index.resolve()]
+        expected_real = FS.resolve(expected_index)
+        duplicates = [p for p in candidates if FS.resolve(p) != expected_real]
         return canonical, duplicates
 
     # Keine Kandidaten -> erwartete Indexdatei wird neu gebaut
@@ -176,27 +971,80 @@ def choose_canonical_index(dir_path: Path, md_files: List[Path], expected_index:
     for p in candidates:
         if p.name == expected_index.name:
             canonical = p
-            duplicates = [q for q in candidates if q.resolve() != p.resolve()]
+            duplicates = [q for q in candidates if FS.resolve(q) != FS.resolve(p)]
             return canonical, duplicates
 
     # Keine trägt den erwarteten Namen -> nimm die jüngste Datei als Kanon
-    canonical = max(candidates, key=lambda p: p.stat().st_mtime)
-    duplicates = [q for q in candidates if q.resolve() != canonical.resolve()]
+    canonical = max(candidates, key=lambda p: FS.stat(p).st_mtime)
+    duplicates = [q for q in candidates if FS.resolve(q) != FS.resolve(canonical)]
     return canonical, duplicates
 
-def process_dir(dir_path: Path, excluded: set, dry_run: bool = False):
-    subs, mds, files = list_immediate(dir_path, excluded)
+def process_dir(dir_path: Path, excluded: set, dry_run: bool = False,
+                snapshot: Optional[DirSnapshot] = None,
+                stats: Optional[RunStats] = None,
+                state: Optional[LinkState] = None,
+                log: Callable[[Any], None] = print,
+                tree: Optional[Dict[Path, TreeStats]] = None,
+                headers: Optional[HeaderCache] = None,
+                backlinks: Optional[Dict[Path, List[str]]] = None):
+    """
+    Verarbeitet genau einen Ordner. Schreibt/benennt nur innerhalb von dir_path,
+    daher können verschiedene Ordner unabhängig (auch parallel) verarbeitet werden.
+    tree: rekursive Kennzahlen (RECURSIVE_STATS); die Unterordner müssen bereits
+    verarbeitet sein, der eigene Eintrag wird hier ergänzt.
+    headers: Header-Cache für MD_FIELDS/MD_SORT_BY.
+    backlinks: verlinkende Notizen je Ordner (BACKLINKS, aus dem Link-Graphen).
+    log: erhält je Datei eine FileAction (print gibt die Logzeile aus).
+    """
+    try:
+        _process_dir(dir_path, excluded, dry_run, snapshot, stats, state, log, tree, headers, backlinks)
+    finally:
+        # Marker-Ergebnisse werden nur innerhalb des Ordners gebraucht -> Cache bleibt klein
+        for cache in (_AUTOGEN_CACHE, _PAGE_CACHE):
+            for p in list(cache):
+                if p.parent == dir_path:
+                    cache.pop(p, None)
+
+def _process_dir(dir_path: Path, excluded: set, dry_run: bool,
+                 snapshot: Optional[DirSnapshot],
+                 stats: Optional[RunStats],
+                 state: Optional[LinkState],
+                 log: Callable[[Any], None],
+                 tree: Optional[Dict[Path, TreeStats]],
+                 headers: Optional[HeaderCache],
+                 backlinks: Optional[Dict[Path, List[str]]]):
+    snap = snapshot if snapshot is not None else scan_dir(dir_path, excluded)
+    if stats is None:
+        stats = RunStats()
 
     expected_index_name = determine_index_name(dir_path.name)
     expected_index_path = dir_path / expected_index_name
 
+    tree_stats = aggregate_stats(snap, tree) if tree is not None else None
+    dir_backlinks = backlinks.get(dir_path, []) if backlinks is not None else None
+
+    # 0) Inkrementell: Listing + Indexdatei unverändert -> ohne Lesen einer Notiz überspringen
+    fingerprint = listing_fingerprint(snap, tree_stats, dir_backlinks) if state is not None else ""
+    if state is not None and state.is_fresh(dir_path, fingerprint, expected_index_path):
+        if tree is not None:
+            tree[dir_path] = tree_stats
+        stats.unchanged += 1
+        log(FileAction("unchanged", expected_index_path, dry_run, detail=" (Fingerprint)"))
+        return
+
+    # Quelle des bestehenden Index-Inhalts (im Trockenlauf ggf. die noch nicht umbenannte Datei)
+    read_from: Optional[Path] = None
+
     # 1) Kanonische Indexdatei wählen + Dubletten mit AUTOGEN erkennen
-    canonical_path, duplicates = choose_canonical_index(dir_path, mds, expected_index_path)
+    canonical_path, duplicates = choose_canonical_index(
+        dir_path, snap.mds, expected_index_path,
+        expected_exists=snap.has_md(expected_index_name),
+    )
 
     # 2) Falls Kanon nicht dem erwarteten Namen entspricht -> umbenennen
-    if canonical_path.exists() and canonical_path.name != expected_index_name:
+    if snap.has_md(canonical_path.name) and canonical_path.name != expected_index_name:
         target = expected_index_path
-        if target.exists() and canonical_path.resolve() != target.resolve():
+        if snap.has_md(target.name) and FS.resolve(canonical_path) != FS.resolve(target):
             # Konflikt: Ziel existiert bereits (unterschiedliche Datei)
             # Strategie: Ziel bleibt Kanon; AUTOGEN-Block aus der "alten" Datei entfernen
             if canonical_path in duplicates:
@@ -207,59 +1055,514 @@ def process_dir(dir_path: Path, excluded: set, dry_run: bool = False):
             canonical_path = target  # arbeite mit dem Ziel weiter
         else:
             # Umbenennen
+            stats.renamed += 1
             if dry_run:
-                print(f"[DRY][RENAME] {canonical_path} -> {target}")
+                log(FileAction("renamed", target, dry_run, old_path=canonical_path))
+                read_from = canonical_path
             else:
-                canonical_path.rename(target)
-                print(f"[RENAME] {canonical_path} -> {target}")
+                FS.rename(canonical_path, target)
+                _AUTOGEN_CACHE[target] = _AUTOGEN_CACHE.pop(canonical_path, True)
+                log(FileAction("renamed", target, old_path=canonical_path))
+                # 4) Snapshot inkrementell nachführen statt Verzeichnis neu zu lesen
+                snap.rename_md(canonical_path, target)
             canonical_path = target
 
     # 3) Sicherstellen: pro Ordner nur *eine* Datei mit AUTOGEN-Block -> aus Duplikaten Block entfernen
     for dup in duplicates:
-        remove_autogen_block_from_file(dup, dry_run=dry_run)
-
-    # 4) Nach evtl. Umbenennungen/Cleans: Verzeichnis-Inhalt neu erfassen
-    subs, mds, files = list_immediate(dir_path, excluded)
+        if remove_autogen_block_from_file(dup, dry_run=dry_run, log=log, stats=stats):
+            stats.cleaned += 1
 
     # 5) Block erzeugen und in die kanonische Datei mergen
     index_name = determine_index_name(dir_path.name)  # nach evtl. Umbenennung erneut bestimmen
     index_path = dir_path / index_name
 
-    block = build_block(
-        subfolders=subs,
-        md_files=mds,
-        other_files=files,
+    if tree is not None:
+        tree_stats = aggregate_stats(snap, tree)  # nach evtl. Umbenennung neu
+        tree[dir_path] = tree_stats
+
+    skip_names = generated_names(snap)
+    md_headers: Optional[Dict[str, Dict[str, str]]] = None
+    if uses_headers():
+        if headers is None:
+            headers = HeaderCache(dir_path, dir_path / SETTINGS["HEADER_CACHE_FILENAME"])  # nur flüchtig
+        md_headers = {p.name: headers.fields(p, snap.sigs.get(p.name))
+                      for p in snap.mds if p.name not in skip_names}
+
+    block, pages = build_index(
+        subfolders=snap.subs,
+        md_files=snap.mds,
+        other_files=snap.files,
         index_filename=index_name,
+        skip_names=skip_names,
+        tree_stats=tree_stats,
+        headers=md_headers,
+        backlinks=dir_backlinks,
     )
+    stale_pages = [p for p in snap.mds if p.name not in pages and is_page(snap, p)]
 
-    existing = read_text_safe(index_path) if index_path.exists() else ""
-    merged = merge_content(existing, block)
+    if read_from is None and snap.has_md(index_name):
+        read_from = index_path
 
-    if dry_run:
-        action = "würde schreiben (update/erzeugen)"
-        print(f"[DRY] {action}: {index_path}")
-    else:
-        index_path.write_text(merged, encoding="utf-8")
-        print(f"[OK]  {index_path}")
+    bhash = block_hash(block + "".join(pages.values())) if state is not None else ""
+    if (state is not None and not dry_run and read_from == index_path and not duplicates
+            and not stale_pages and state.block_unchanged(dir_path, bhash, index_path)):
+        # Listing geändert, Block/Unterseiten aber identisch und seitdem unberührt
+        stats.unchanged += 1
+        state.record(dir_path, listing_fingerprint(snap, tree_stats, dir_backlinks), bhash, index_path, pages)
+        log(FileAction("unchanged", index_path))
+        return
+
+    # 6) Index schreiben (nur bei Änderungen)
+    if sync_generated(index_path, read_from, block, dry_run, stats, log) and not dry_run:
+        _AUTOGEN_CACHE[index_path] = True
+        snap.add_md(index_path)
+
+    # 7) Unterseiten großer Ordner im selben Durchgang synchron halten
+    for name, page_block in pages.items():
+        page_path = dir_path / name
+        page_from = page_path if snap.has_md(name) else None
+        if sync_generated(page_path, page_from, page_block, dry_run, stats, log,
+                          start=PAGE_START, end=PAGE_END) and not dry_run:
+            _PAGE_CACHE[page_path] = True
+            snap.add_md(page_path)
+    for page_path in stale_pages:
+        if not remove_stale_page(page_path, dry_run, log, stats):
+            continue
+        stats.cleaned += 1
+        if not dry_run:
+            _PAGE_CACHE[page_path] = False
+            snap.remove_md(page_path)
 
-def walk_all(root: Path, excluded: set, dry_run: bool = False):
-    for dirpath, dirnames, filenames in os.walk(root):
-        p = Path(dirpath)
+    if state is not None and not dry_run:
+        state.record(dir_path, listing_fingerprint(snap, tree_stats, dir_backlinks), bhash, index_path, pages)
 
-        # Prune bevor Abstieg
-        dirnames[:] = [
-            d for d in dirnames
-            if not (SETTINGS["IGNORE_DOT_ITEMS"] and d.startswith(".")) and d not in excluded
-        ]
+def is_skipped_dir(p: Path, excluded: set) -> bool:
+    return (SETTINGS["IGNORE_DOT_ITEMS"] and p.name.startswith(".")) or p.name in excluded
 
-        # Falls doch in ausgeschlossenen/versteckten Ordner geraten -> überspringen
-        if (SETTINGS["IGNORE_DOT_ITEMS"] and p.name.startswith(".")) or p.name in excluded:
+def iter_snapshots(root: Path, excluded: set, with_stat: bool = False,
+                   prune: Optional[Callable[[Path], bool]] = None) -> Iterator[DirSnapshot]:
+    """
+    Traversiert ab root (Pre-Order, Unterordner sortiert) und liefert je Ordner genau
+    einen Snapshot. Der Abstieg nutzt dieselben Scan-Daten (kein zweites Listing).
+    Unlesbare Ordner werden wie bei os.walk stillschweigend übersprungen; Unterordner,
+    für die prune() True liefert (laut Checkpoint erledigt), gar nicht erst gelesen.
+    """
+    stack = [(root, 0)]
+    while stack:
+        p, depth = stack.pop()
+        try:
+            snap = scan_dir(p, excluded, depth=depth, with_stat=with_stat)
+        except OSError:
+            continue
+        yield snap
+        stack.extend((sub, depth + 1) for sub in reversed(snap.walk_subs)
+                     if prune is None or not prune(sub))
+
+def count_dirs(root: Path, excluded: set) -> int:
+    """Ordnerzahl wie iter_snapshots, nur per FS.walk gezählt (Gesamtzahl für die ETA)."""
+    ignore_dot = SETTINGS["IGNORE_DOT_ITEMS"]
+    skip = excluded | set(tool_files())
+    n = 0
+    for _, dirs, _ in FS.walk(root):
+        dirs[:] = [d for d in dirs if d not in skip and not (ignore_dot and d.startswith("."))]
+        n += 1
+    return n
+
+def changed_dirs(change) -> List[Path]:
+    """
+    Ordner, deren Index sich geändert haben kann: Eltern aller neuen/geänderten/gelöschten
+    Dateien (geänderte Notizen wegen MD_FIELDS) plus Eltern neuer/verschwundener Ordner.
+    Eigene Zustandsdateien und (bei IGNORE_DOT_ITEMS) versteckte Dateien zählen nicht.
+    """
+    skip = set(tool_files())
+    rels = set(change.structure)
+    for rel in change.changed | change.removed:
+        name = posixpath.basename(rel)
+        if name in skip or is_scratch(name) or (SETTINGS["IGNORE_DOT_ITEMS"] and name.startswith(".")):
             continue
+        rels.add(posixpath.dirname(rel))
+    return change.paths(rels)
+
+def iter_listed_snapshots(root: Path, dirs: Iterable[Path], excluded: set,
+                          with_stat: bool = False) -> Iterator[DirSnapshot]:
+    """
+    Snapshots nur für die angegebenen Ordner (Pre-Order wie iter_snapshots). Ordner, die
+    die Traversierung ab root nie erreichen würde (ausgeschlossen/versteckt/Symlink auf
+    dem Weg), und nicht mehr existierende Ordner entfallen.
+    """
+    keyed = []
+    for d in dirs:
+        parts = d.relative_to(root).parts
+        cur = root
+        reachable = True
+        for part in parts:
+            cur = cur / part
+            if is_skipped_dir(cur, excluded) or part in tool_files() or FS.is_symlink(cur):
+                reachable = False
+                break
+        if reachable:
+            keyed.append(([part.lower() for part in parts], d))
+    for _, d in sorted(keyed, key=lambda kv: kv[0]):
+        try:
+            yield scan_dir(d, excluded, depth=len(d.relative_to(root).parts), with_stat=with_stat)
+        except OSError:
+            continue
+
+def _process_buffered(snap: DirSnapshot, excluded: set, dry_run: bool,
+                      state: Optional[LinkState],
+                      tree: Optional[Dict[Path, TreeStats]],
+                      headers: Optional[HeaderCache],
+                      backlinks: Optional[Dict[Path, List[str]]]) -> Tuple[List[Any], RunStats]:
+    """Worker-Variante: sammelt Aktionen und Zähler, statt sie direkt weiterzugeben."""
+    lines: List[Any] = []
+    stats = RunStats()
+    process_dir(snap.path, excluded, dry_run=dry_run, snapshot=snap, stats=stats,
+                state=state, log=lines.append, tree=tree, headers=headers, backlinks=backlinks)
+    return lines, stats
+
+def _walk_pooled(ex: "ThreadPoolExecutor", snaps: Iterable[DirSnapshot], excluded: set, dry_run: bool,
+                 state: Optional[LinkState], workers: int, stats: RunStats,
+                 tree: Optional[Dict[Path, TreeStats]] = None,
+                 headers: Optional[HeaderCache] = None,
+                 backlinks: Optional[Dict[Path, List[str]]] = None,
+                 log: Callable[[Any], None] = print,
+                 on_dir: Optional[Callable[[DirSnapshot], None]] = None) -> None:
+    """
+    Der Haupt-Thread traversiert und verteilt process_dir-Aufrufe an den Pool.
+    Ergebnisse werden strikt in Traversierungsreihenfolge ausgegeben/verbucht, so dass
+    Logs deterministisch sind; die Zahl offener Aufträge ist begrenzt.
+    on_dir: nach dem Verbuchen eines Ordners (ebenfalls in Traversierungsreihenfolge).
+    """
+    window = workers * 4
+    pending: deque = deque()
+
+    def drain(limit: int) -> None:
+        while len(pending) > limit:
+            snap, future = pending.popleft()
+            lines, st = future.result()
+            for line in lines:
+                log(line)
+            stats.merge(st)
+            if on_dir is not None:
+                on_dir(snap)
+
+    for snap in snaps:
+        pending.append((snap, ex.submit(_process_buffered, snap, excluded, dry_run, state, tree,
+                                        headers, backlinks)))
+        drain(window)
+    drain(0)
+
+def _run_batches(batches: Iterable[Iterable[DirSnapshot]], excluded: set, dry_run: bool,
+                 state: Optional[LinkState], workers: int, stats: RunStats,
+                 tree: Optional[Dict[Path, TreeStats]],
+                 headers: Optional[HeaderCache],
+                 backlinks: Optional[Dict[Path, List[str]]] = None,
+                 log: Callable[[Any], None] = print,
+                 on_dir: Optional[Callable[[DirSnapshot], None]] = None) -> None:
+    """
+    Verarbeitet Gruppen nacheinander (Barriere zwischen Gruppen), seriell oder im Pool.
+    on_dir: je fertigem Ordner in Traversierungsreihenfolge (Fortschritt/Checkpoint).
+    """
+    if workers > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            for batch in batches:
+                _walk_pooled(ex, batch, excluded, dry_run, state, workers, stats, tree, headers,
+                             backlinks, log, on_dir)
+    else:
+        for batch in batches:
+            for snap in batch:
+                process_dir(snap.path, excluded, dry_run=dry_run, snapshot=snap, stats=stats,
+                            state=state, log=log, tree=tree, headers=headers, backlinks=backlinks)
+                if on_dir is not None:
+                    on_dir(snap)
+
+def walk_all(root: Path, excluded: set, dry_run: bool = False,
+             incremental: bool = False, workers: int = 1,
+             only_dirs: Optional[Iterable[Path]] = None,
+             log: Callable[[Any], None] = print,
+             meter: Any = None, resumed: Any = None, writer: Any = None) -> RunStats:
+    """
+    only_dirs: nur diese Ordner neu indexieren (z. B. aus --changed-since). Mit
+    RECURSIVE_STATS/MOC_FILENAME/BACKLINKS hängen Indexe von anderen Ordnern ab -> Vollauf.
+    incremental: Zustand aus SETTINGS["STATE_FILENAME"] im Root nutzen; Ordner mit
+    unverändertem Listing und unveränderter Indexdatei werden übersprungen.
+    workers > 1: Ordner im Thread-Pool verarbeiten (Ergebnis identisch zum seriellen Lauf).
+
+    Mit RECURSIVE_STATS/MOC_FILENAME wird der Baum einmal gescannt und in *einem*
+    Bottom-up-Durchlauf (tiefste Ordner zuerst) verarbeitet; die Summen der Unterordner
+    werden dabei weitergereicht, kein Teilbaum wird erneut gelesen.
+
+    meter: Progress aus P25ObisCore/progress.py (je fertigem Ordner ein Schritt).
+    resumed/writer: Checkpoint/CheckpointWriter aus P25ObisCore/checkpoint.py – erledigte
+    Ordner überspringen bzw. den Fortschritt sichern (nicht im Bottom-up-Durchlauf).
+
+    log: erhält je Datei eine FileAction und Hinweise als str (Default: print).
+    """
+    reset_autogen_cache()
+    if only_dirs is not None and (SETTINGS["RECURSIVE_STATS"] or SETTINGS["MOC_FILENAME"]
+                                  or SETTINGS["BACKLINKS"]):
+        log("[INFO] Kennzahlen/MOC/Backlinks hängen vom ganzen Vault ab – vollständiger Lauf.")
+        only_dirs = None
+    bottom_up = bool(SETTINGS["RECURSIVE_STATS"] or SETTINGS["MOC_FILENAME"])
+    if bottom_up and (resumed is not None or writer is not None):
+        if resumed is not None:
+            log("[INFO] Kennzahlen/MOC brauchen den ganzen Baum – kein Fortsetzen, vollständiger Lauf.")
+        resumed = writer = None
+    stats = RunStats()
+    state = LinkState.load(root) if incremental else None
+    headers = HeaderCache.load(root) if uses_headers() else None
+    needs_stat = bool(SETTINGS["RECURSIVE_STATS"]) or uses_headers()
+    graph = None
+    backlinks: Optional[Dict[Path, List[str]]] = None
+    if SETTINGS["BACKLINKS"]:
+        from linkgraph import LinkGraph  # nur bei Bedarf laden
+        graph = LinkGraph.load(root, root / SETTINGS["GRAPH_FILENAME"])
+        parsed = graph.update(excluded, ignore_dot=SETTINGS["IGNORE_DOT_ITEMS"],
+                              workers=max(workers, 4), skip_names=tool_files())
+        log(f"[GRAPH] {len(graph.notes)} Notizen, {parsed} neu eingelesen")
+        backlinks = {root / d if d else root: links
+                     for d, links in graph.backlinks_by_dir().items()}
 
-        process_dir(p, excluded, dry_run=dry_run)
+    counters = {"dirs": 0, "bytes": 0}  # inkl. der Läufe vor dem Checkpoint
+    if resumed is not None:
+        counters.update({k: v for k, v in resumed.counters.items() if k in counters})
+        log(f"[INFO] Fortsetzen nach {resumed.where} (bereits erledigt: {counters['dirs']} Ordner)")
+        if meter is not None:
+            meter.skip(counters["dirs"], counters["bytes"])
 
-def main():
+    def on_dir(snap: DirSnapshot) -> None:
+        counters["dirs"] += 1
+        if meter is not None:
+            try:
+                size = FS.stat(snap.path / determine_index_name(snap.path.name)).st_size
+            except OSError:
+                size = 0
+            counters["bytes"] += size
+            meter.advance(1, size)
+        if writer is not None:
+            writer.reached(snap.path, counters)
+
+    def processable(snaps: Iterable[DirSnapshot]) -> List[DirSnapshot]:
+        # Falls der Start-Root selbst ausgeschlossen/versteckt ist -> nur absteigen
+        return [snap for snap in snaps if not is_skipped_dir(snap.path, excluded)]
+
+    try:
+        if bottom_up:
+            snaps = list(iter_snapshots(root, excluded, with_stat=needs_stat))
+            tree: Dict[Path, TreeStats] = {}
+            batches = [processable(batch) for batch in bottom_up_order(snaps)]
+            if meter is not None:
+                meter.total = sum(len(batch) for batch in batches)
+            _run_batches(batches, excluded, dry_run, state, workers, stats,
+                         tree if SETTINGS["RECURSIVE_STATS"] else None, headers, backlinks, log,
+                         on_dir if meter is not None else None)
+            if SETTINGS["MOC_FILENAME"]:
+                write_moc(root, snaps, tree, excluded, dry_run, stats, log)
+        else:
+            if only_dirs is not None:
+                only_dirs = list(only_dirs)
+                if meter is not None:
+                    meter.total = len(only_dirs)
+                snaps = iter_listed_snapshots(root, only_dirs, excluded, with_stat=needs_stat)
+            else:
+                if meter is not None:
+                    meter.count_in_background(lambda: count_dirs(root, excluded))
+                prune = resumed.subtree_done if resumed is not None else None
+                snaps = iter_snapshots(root, excluded, with_stat=needs_stat, prune=prune)
+            # Durchlauf in eigenem Thread, höchstens QUEUE_DIRS Snapshots im Voraus
+            snaps_iter = load_bounded()(
+                (snap for snap in snaps if not is_skipped_dir(snap.path, excluded)
+                 and (resumed is None or not resumed.done(snap.path))), SETTINGS["QUEUE_DIRS"])
+            _run_batches([snaps_iter], excluded, dry_run, state, workers, stats, None, headers,
+                         backlinks, log, on_dir if (meter is not None or writer is not None) else None)
+    except BaseException:
+        # Abbruch (auch Strg+C): Stand des letzten fertigen Ordners sofort sichern;
+        # Zustand/Header-Cache der bereits verarbeiteten Ordner nicht verwerfen
+        if writer is not None:
+            writer.save()
+            for cache in (state, headers):
+                if cache is not None:
+                    cache.save(prune=False)
+        if meter is not None:
+            meter.close(aborted=True)
+        raise
+    if meter is not None:
+        meter.close()
+
+    if not dry_run:
+        # Teil-Lauf: Einträge nicht besuchter Ordner/Notizen bleiben erhalten
+        partial = only_dirs is not None or resumed is not None
+        if state is not None:
+            state.save(prune=not partial)
+        if headers is not None:
+            headers.save(prune=not partial)
+        if graph is not None:
+            graph.save()
+    if writer is not None:
+        writer.clear()
+    return stats
+
+# Laufzeit-Stellschrauben ohne Einfluss auf das Ergebnis -> ändern den Checkpoint nicht
+_RUNTIME_SETTINGS = ("QUEUE_DIRS", "CHECKPOINT_FILENAME", "CHECKPOINT_SECONDS")
+
+def checkpoint_options(changed_since: Optional[str]) -> Dict[str, Any]:
+    """Was ein Checkpoint mit dem fortsetzenden Lauf gemeinsam haben muss (Einstellungen, Revision)."""
+    import hashlib
+    import json
+
+    relevant = {k: v for k, v in SETTINGS.items() if k not in _RUNTIME_SETTINGS}
+    blob = json.dumps(relevant, sort_keys=True, ensure_ascii=False,
+                      default=lambda v: sorted(v) if isinstance(v, (set, frozenset)) else str(v))
+    return {"settings": hashlib.sha1(blob.encode("utf-8")).hexdigest(), "changed_since": changed_since}
+
+class RunResult:
+    """Ergebnis von run(): Zähler, Datei-Aktionen in Traversierungsreihenfolge (keep_actions), Hinweise."""
+    __slots__ = ("root", "dry_run", "stats", "actions", "notes", "seconds")
+
+    def __init__(self, root: Path, dry_run: bool = False):
+        self.root = root
+        self.dry_run = dry_run
+        self.stats = RunStats()
+        self.actions: List[FileAction] = []
+        self.notes: List[str] = []
+        self.seconds = 0.0
+
+    @property
+    def changed(self) -> List[FileAction]:
+        return [a for a in self.actions if a.changed]
+
+    def summary(self) -> str:
+        prefix = "Trockenlauf abgeschlossen." if self.dry_run else "Fertig."
+        return f"{prefix} {self.stats.summary()}."
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"root": str(self.root), "dry_run": self.dry_run, **self.stats.as_dict()}
+
+def run(root: Path, options: Optional[Dict[str, Any]] = None, *, dry_run: bool = False,
+        incremental: bool = False, workers: int = 1, only_dirs: Optional[Iterable[Path]] = None,
+        changed_since: Optional[str] = None, log: Optional[Callable[[Any], None]] = None,
+        keep_actions: bool = True, progress: Optional[str] = None,
+        resume: bool = False, fs: Optional[FileSystem] = None) -> RunResult:
+    """
+    Bibliotheks-Einstieg: wie walk_all, aber ohne Ausgabe und mit Ergebnisobjekt.
+    options: Einstellungen für diesen Lauf (Schlüssel wie SETTINGS, z. B. {"PAGE_SIZE": 50});
+    sie gelten nur während des Aufrufs. SETTINGS ist modulweit – parallele Läufe mit
+    unterschiedlichen options im selben Prozess sind daher nicht möglich.
+    changed_since: nur Ordner mit Änderungen seit der Git-Revision (ersetzt only_dirs).
+    log: erhält jede FileAction und jeden Hinweis (str) sofort, z. B. print.
+    keep_actions=False: FileActions nur an log geben, nicht sammeln (stats zählt weiter) –
+    für sehr große Vaults, deren Aktionsliste sonst mit der Dateizahl wächst.
+    progress: "tty" oder "json" – gedrosselter Fortschritt (Ordner/s, ETA, Bytes der
+    Indexe) auf stderr, siehe P25ObisCore/progress.py.
+    resume: am Checkpoint (CHECKPOINT_FILENAME) eines abgebrochenen Laufs fortsetzen.
+    Ohne Trockenlauf wird der Checkpoint alle CHECKPOINT_SECONDS (und beim Abbruch)
+    geschrieben und nach einem vollständigen Lauf gelöscht.
+    fs: Dateisystem-Backend für diesen Lauf (Standard: FS); wie SETTINGS modulweit.
+    BACKLINKS liest den Vault über linkgraph.py direkt und geht nur mit dem echten
+    Dateisystem.
+    """
+    global FS
+    t0 = time.perf_counter()
+    fs = fs if fs is not None else FS
+    root = fs.resolve(Path(root))  # absolut wie die Pfade aus gitchanges/Snapshots
+    if not fs.is_dir(root):
+        raise ConfigError(f"Root nicht gefunden/kein Ordner: {root}")
+    unknown = sorted(set(options or {}) - set(SETTINGS))
+    if unknown:
+        raise ConfigError(f"Unbekannte Einstellung(en): {', '.join(unknown)}")
+    if fs is not OS and (options or {}).get("BACKLINKS", SETTINGS["BACKLINKS"]):
+        raise ConfigError("BACKLINKS geht nur mit dem echten Dateisystem (linkgraph.py liest direkt).")
+    result = RunResult(root, dry_run)
+    meter = None
+    if progress:
+        try:
+            meter = load_progress().Progress("links", unit="Ordner", mode=progress)
+        except ValueError as e:
+            raise ConfigError(str(e)) from e
+        if log is not None:
+            log = meter.wrap(log)
+
+    def sink(item: Any) -> None:
+        if isinstance(item, FileAction):
+            if keep_actions:
+                result.actions.append(item)
+        else:
+            result.notes.append(str(item))
+        if log is not None:
+            log(item)
+
+    saved, saved_fs = dict(SETTINGS), FS
+    SETTINGS.update(options or {})
+    FS = fs
+    try:
+        excluded = set(SETTINGS["EXCLUDE_FOLDERS"])
+        if changed_since:
+            try:
+                only_dirs = changed_dirs(load_changes(root, changed_since))
+            except RuntimeError as e:
+                raise ChangesError(str(e)) from e
+            sink(f"[INFO] Geänderte Ordner seit {changed_since}: {len(only_dirs)}")
+        resumed = writer = None
+        if resume or not dry_run:
+            cp = load_checkpoint()
+            cp_path = root / SETTINGS["CHECKPOINT_FILENAME"]
+            cp_options = checkpoint_options(changed_since)
+            if resume:
+                resumed = cp.Checkpoint.load(cp_path, cp_options, root, FS)
+                if resumed is None:
+                    sink("[INFO] Kein passender Checkpoint – vollständiger Lauf.")
+            if not dry_run:
+                writer = cp.CheckpointWriter(cp_path, cp_options, root, SETTINGS["CHECKPOINT_SECONDS"], FS)
+        result.stats = walk_all(root, excluded, dry_run=dry_run, incremental=incremental,
+                                workers=workers, only_dirs=only_dirs, log=sink,
+                                meter=meter, resumed=resumed, writer=writer)
+    finally:
+        SETTINGS.clear()
+        SETTINGS.update(saved)
+        FS = saved_fs
+    result.seconds = time.perf_counter() - t0
+    return result
+
+def add_layout_args(parser: argparse.ArgumentParser) -> None:
+    """CLI-Optionen für Layout/Inhalt der Indexe (auch von der Pipeline genutzt)."""
+    parser.add_argument("--stats", action="store_true",
+                        help="Rekursive Kennzahlen (Notizen, Anhänge, Größe) in jedem Index zeigen (RECURSIVE_STATS).")
+    parser.add_argument("--moc", metavar="DATEI", default=None,
+                        help="Vault-weite Map of Content im Startordner erzeugen, z. B. 'Map of Content.md' (MOC_FILENAME).")
+    parser.add_argument("--page-size", type=int, default=None, metavar="N",
+                        help="Sektionen mit mehr als N Einträgen auf nummerierte Unterseiten verteilen (PAGE_SIZE).")
+    parser.add_argument("--embed-limit", type=int, default=None, metavar="N",
+                        help="Je Liste nur N Einträge einbetten, danach einfache Links (EMBED_LIMIT).")
+    parser.add_argument("--fields", default=None, metavar="F1,F2",
+                        help="Frontmatter-Felder hinter #Markdown-Einträgen anzeigen, z. B. 'title,Datum,Prozent' (MD_FIELDS).")
+    parser.add_argument("--sort-by", default=None, metavar="FELD",
+                        help="#Markdown nach Frontmatter-Feld sortieren, '--sort-by=-FELD' = absteigend (MD_SORT_BY).")
+
+def layout_options(args: argparse.Namespace) -> Dict[str, Any]:
+    """Optionen aus add_layout_args() als SETTINGS-Schlüssel (für run(options=...))."""
+    options: Dict[str, Any] = {}
+    if args.stats:
+        options["RECURSIVE_STATS"] = True
+    if args.page_size is not None:
+        options["PAGE_SIZE"] = max(0, args.page_size)
+    if args.embed_limit is not None:
+        options["EMBED_LIMIT"] = max(0, args.embed_limit)
+    if args.fields is not None:
+        options["MD_FIELDS"] = [f.strip() for f in args.fields.split(",") if f.strip()]
+    if args.sort_by is not None:
+        options["MD_SORT_BY"] = args.sort_by.strip()
+    if args.moc:
+        options["MOC_FILENAME"] = args.moc if args.moc.lower().endswith(".md") else f"{args.moc}.md"
+    return options
+
+def apply_layout_args(args: argparse.Namespace) -> None:
+    """Überträgt die Optionen aus add_layout_args() dauerhaft in SETTINGS."""
+    SETTINGS.update(layout_options(args))
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
     parser = argparse.ArgumentParser(
+        prog=prog,
         description="Erzeuge/aktualisiere Ordner-Index-Markdown-Dateien ab Startpunkt rekursiv nach unten.\n"
                     "Neue Logik: erkennt bestehende Index-Dateien via AUTOGEN-Block, benennt bei Ordner-Umbenennung korrekt um\n"
                     "und stellt sicher, dass je Ordner nur *eine* Datei den AUTOGEN-Block enthält."
@@ -267,15 +1570,49 @@ def main():
     parser.add_argument("root", nargs="?", default=Path("."), type=Path,
                         help="Startordner (Default: aktuelles Verzeichnis '.')")
     parser.add_argument("--dry-run", action="store_true", help="Nur Aktionen anzeigen (inkl. Rename/Clean), keine Schreibzugriffe.")
-    args = parser.parse_args()
+    parser.add_argument("--incremental", action="store_true",
+                        help="Nur Ordner neu indexieren, deren Listing (oder Indexdatei) sich seit dem letzten Lauf geändert hat.")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="Ordner mit N Threads parallel verarbeiten (Default: 1 = seriell).")
+    parser.add_argument("--changed-since", metavar="REV", default=None,
+                        help="Nur Ordner mit Änderungen seit der Git-Revision REV neu indexieren (z. B. HEAD~1).")
+    add_layout_args(parser)
+    parser.add_argument("--backlinks", action="store_true",
+                        help="#Backlinks-Sektion aus dem (inkrementellen) Link-Graphen des Vaults erzeugen (BACKLINKS).")
+    parser.add_argument("--report", type=Path, default=None,
+                        help="Zähler des Laufs zusätzlich als JSON in diese Datei schreiben (z. B. für nächtliche Jobs).")
+    parser.add_argument("--progress", nargs="?", const="tty", default=None, choices=("tty", "json"),
+                        help="Fortschritt (Ordner/s, ETA, Bytes) auf stderr: Statuszeile (tty, Default) oder JSON-Zeilen (json).")
+    parser.add_argument("--resume", action="store_true",
+                        help="Nach abgebrochenem Lauf am letzten Checkpoint fortsetzen (CHECKPOINT_FILENAME).")
+    args = parser.parse_args(argv)
 
     root = args.root.resolve()
-    if not root.exists() or not root.is_dir():
-        raise SystemExit(f"Root nicht gefunden/kein Ordner: {root}")
+    options = layout_options(args)
+    if args.backlinks:
+        options["BACKLINKS"] = True
+
+    try:
+        result = run(root, options, dry_run=args.dry_run, incremental=args.incremental,
+                     workers=args.workers, changed_since=args.changed_since, log=print,
+                     keep_actions=False, progress=args.progress, resume=args.resume)
+    except KeyboardInterrupt:
+        hint = "" if args.dry_run else " – mit --resume am Checkpoint fortsetzen"
+        print(f"\n[ABBRUCH] Lauf unterbrochen{hint}.", file=sys.stderr)
+        return 130
+    except ChangesError as e:
+        print(f"[FEHLER] {e}", file=sys.stderr)
+        return 1
+    except LinksError as e:
+        print(e, file=sys.stderr)
+        return 1
 
-    excluded = set(SETTINGS["EXCLUDE_FOLDERS"])
+    print(f"\n{result.summary()}")
+    if args.report is not None:
+        import json
 
-    walk_all(root, excluded, dry_run=args.dry_run)
+        args.report.write_text(json.dumps(result.as_dict(), indent=2) + "\n", encoding="utf-8")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Link-Graph eines Vaults: alle [[...]]- und ![[...]]-Verweise aller Notizen.
+
+- Ein vorkompilierter Scanner (LINK_RE) für alle Notizen, Parsing in Chunks im Thread-Pool.
+- Generierte Blöcke (AUTOGEN / AUTOGEN_MOC / AUTOGEN_PAGE) werden vor dem Scannen
+  entfernt, d. h. nur von Hand geschriebene Links zählen.
+- Persistenz als kompakte Adjazenz: eine Tabelle aller Link-Ziele und je Notiz
+  (mtime_ns, size, [Ziel-IDs]). Folgeläufe lesen nur geänderte Notizen neu.
+- Auflösung der Ziele wie in Obsidian: Dateiname/Stamm (ohne Groß-/Kleinschreibung),
+  Pfad relativ zum Vault oder zur Notiz; bei Mehrdeutigkeit gewinnt derselbe Ordner,
+  dann der kürzeste Pfad.
+
+Wird von P25ObisLinks (#Backlinks) und ObisLinkCheck genutzt.
+"""
+
+import json
+import os
+import posixpath
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+GRAPH_VERSION = 1
+
+# [[Ziel]], [[Ziel#Abschnitt]], [[Ziel^block]], [[Ziel|Alias]], ![[...]]
+LINK_RE = re.compile(r"!?\[\[([^\[\]\n|#^]*)(?:[#^][^\[\]\n|]*)?(?:\|[^\[\]\n]*)?\]\]")
+# Generierte Blöcke aller P25ObisLinks-Markerarten
+GENERATED_RE = re.compile(
+    r"<!-- AUTOGEN((?:_[A-Z]+)?)_START -->.*?<!-- AUTOGEN\1_END -->", flags=re.DOTALL)
+
+Sig = Tuple[int, int]
+_MISS = object()
+
+
+def extract_links(text: str) -> List[str]:
+    """Rohziele aller Links (ohne Abschnitt/Alias), generierte Blöcke ausgenommen."""
+    if "<!-- AUTOGEN" in text:
+        text = GENERATED_RE.sub("", text)
+    return [m.strip() for m in LINK_RE.findall(text) if m.strip()]
+
+
+def parse_note(path: str) -> List[str]:
+    try:
+        with open(path, "rb") as fh:
+            data = fh.read()
+    except OSError:
+        return []
+    return extract_links(data.decode("utf-8", errors="replace"))
+
+
+def _parse_chunk(root: str, chunk: List[Tuple[str, Sig]]) -> List[Tuple[str, Sig, List[str]]]:
+    return [(rel, sig, parse_note(os.path.join(root, rel))) for rel, sig in chunk]
+
+
+def iter_vault_files(root: Path, excluded: Iterable[str], ignore_dot: bool = True,
+                     ) -> Iterator[Tuple[str, Sig]]:
+    """
+    Alle Dateien unterhalb von root als (Pfad relativ zu root mit '/', (mtime_ns, size)).
+    Gleiche Ausschlussregeln wie P25ObisLinks (EXCLUDE_FOLDERS, Dot-Items).
+    """
+    excluded = set(excluded)
+    stack = [("", str(root))]
+    while stack:
+        rel_dir, abs_dir = stack.pop()
+        try:
+            with os.scandir(abs_dir) as it:
+                entries = sorted(it, key=lambda e: e.name.lower())
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            if ignore_dot and entry.name.startswith("."):
+                continue
+            rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir():
+                    if entry.name not in excluded and not entry.is_symlink():
+                        subdirs.append((rel, entry.path))
+                elif entry.is_file():
+                    st = entry.stat()
+                    yield rel, (st.st_mtime_ns, st.st_size)
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
+
+
+def is_note(rel: str) -> bool:
+    return rel.lower().endswith(".md")
+
+
+class NameIndex:
+    """Hash-Index aller Dateien nach Pfad und Dateiname (jeweils kleingeschrieben)."""
+
+    def __init__(self, files: Iterable[str]):
+        self.by_path: Dict[str, str] = {}
+        self.by_name: Dict[str, List[str]] = {}
+        # Ergebnisse, die nicht vom Ordner der Quelle abhängen (eindeutiger Dateiname)
+        self._memo: Dict[str, Optional[str]] = {}
+        for rel in files:
+            self.by_path[rel.lower()] = rel
+            self.by_name.setdefault(posixpath.basename(rel).lower(), []).append(rel)
+
+    def __len__(self) -> int:
+        return len(self.by_path)
+
+    def _pick(self, candidates: List[str], source_dir: str) -> str:
+        if len(candidates) == 1:
+            return candidates[0]
+        same = [c for c in candidates if posixpath.dirname(c) == source_dir]
+        return (same or sorted(candidates, key=lambda c: (c.count("/"), c.lower())))[0]
+
+    def _lookup(self, target: str, source_dir: str) -> Optional[str]:
+        low = target.lower()
+        if "/" not in low:
+            hits = self.by_name.get(low)
+            return self._pick(hits, source_dir) if hits else None
+        for cand in (low.lstrip("/"), posixpath.normpath(posixpath.join(source_dir.lower(), low))):
+            hit = self.by_path.get(cand)
+            if hit is not None:
+                return hit
+        # Teilpfad ("Ordner/Notiz") -> Dateiname nachschlagen und Suffix prüfen
+        hits = [c for c in self.by_name.get(posixpath.basename(low), ())
+                if c.lower().endswith("/" + low)]
+        return self._pick(hits, source_dir) if hits else None
+
+    def resolve(self, target: str, source: str = "") -> Optional[str]:
+        """Löst ein Rohziel auf (zuerst als Notiz "Ziel.md", dann wörtlich)."""
+        return self.resolve_in(target, posixpath.dirname(source))
+
+    def resolve_in(self, target: str, source_dir: str) -> Optional[str]:
+        """Wie resolve(), aber mit bereits bestimmtem Ordner der Quelle."""
+        hit = self._memo.get(target, _MISS)
+        if hit is not _MISS:
+            return hit
+        hit = self._resolve(target, source_dir)
+        if "/" not in target and "\\" not in target and self._unambiguous(target):
+            self._memo[target] = hit
+        return hit
+
+    def _unambiguous(self, target: str) -> bool:
+        low = target.strip().lower()
+        return all(len(self.by_name.get(n, ())) <= 1 for n in (low, low + ".md"))
+
+    def _resolve(self, target: str, source_dir: str) -> Optional[str]:
+        target = target.replace("\\", "/").strip()
+        if target.startswith("./"):
+            target = target[2:]
+        if not target.lower().endswith(".md"):
+            hit = self._lookup(target + ".md", source_dir)
+            if hit is not None:
+                return hit
+        return self._lookup(target, source_dir)
+
+
+class LinkGraph:
+    """
+    Persistenter Link-Graph: notes[rel] = (mtime_ns, size, [Rohziele]).
+    update() gleicht mit dem aktuellen Dateibestand ab und parst nur neue/geänderte Notizen.
+    """
+
+    def __init__(self, root: Path, path: Path):
+        self.root = root
+        self.path = path
+        self.notes: Dict[str, Tuple[int, int, List[str]]] = {}
+        self.files: List[str] = []  # alle Dateien des letzten update() (für NameIndex)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, root: Path, path: Path) -> "LinkGraph":
+        graph = cls(root, path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return graph
+        if data.get("version") != GRAPH_VERSION:
+            return graph
+        targets = data.get("targets", [])
+        for rel, (mtime, size, ids) in data.get("notes", {}).items():
+            graph.notes[rel] = (mtime, size, [sys.intern(targets[i]) for i in ids])
+        return graph
+
+    def update(self, excluded: Iterable[str], ignore_dot: bool = True, workers: int = 4,
+               skip_names: Iterable[str] = ()) -> int:
+        """Synchronisiert den Graphen mit dem Vault; liefert die Zahl neu geparster Notizen."""
+        skip = set(skip_names)
+        self.files = []
+        current: Dict[str, Sig] = {}
+        for rel, sig in iter_vault_files(self.root, excluded, ignore_dot):
+            if posixpath.basename(rel) in skip:
+                continue
+            self.files.append(rel)
+            if is_note(rel):
+                current[rel] = sig
+
+        removed = [rel for rel in self.notes if rel not in current]
+        for rel in removed:
+            del self.notes[rel]
+        changed = [(rel, sig) for rel, sig in current.items()
+                   if self.notes.get(rel, (None, None))[:2] != sig]
+        if removed or changed:
+            self.dirty = True
+        if not changed:
+            return 0
+
+        workers = max(1, workers)
+        size = max(1, min(256, len(changed) // (workers * 4) or 1))
+        chunks = [changed[i:i + size] for i in range(0, len(changed), size)]
+        root = str(self.root)
+        if workers > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                results = list(ex.map(lambda c: _parse_chunk(root, c), chunks))
+        else:
+            results = [_parse_chunk(root, c) for c in chunks]
+        for chunk_result in results:
+            for rel, sig, targets in chunk_result:
+                self.notes[rel] = (sig[0], sig[1], [sys.intern(t) for t in targets])
+        return len(changed)
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        ids: Dict[str, int] = {}
+        notes = {}
+        for rel in sorted(self.notes):
+            mtime, size, targets = self.notes[rel]
+            notes[rel] = [mtime, size, [ids.setdefault(t, len(ids)) for t in targets]]
+        payload = {"version": GRAPH_VERSION, "targets": list(ids), "notes": notes}
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")),
+                       encoding="utf-8")
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    def name_index(self) -> NameIndex:
+        return NameIndex(self.files or self.notes)
+
+    def references(self) -> Iterator[Tuple[str, str]]:
+        """(Quelle, Rohziel) für jeden Link."""
+        for rel, (_, _, targets) in self.notes.items():
+            for t in targets:
+                yield rel, t
+
+    def edges(self, index: Optional[NameIndex] = None) -> Iterator[Tuple[str, Optional[str], str]]:
+        """(Quelle, aufgelöstes Ziel oder None, Rohziel) für jeden Link."""
+        index = index or self.name_index()
+        for rel, (_, _, targets) in self.notes.items():
+            source_dir = posixpath.dirname(rel)
+            for t in targets:
+                yield rel, index.resolve_in(t, source_dir), t
+
+    def backlinks_by_dir(self, index: Optional[NameIndex] = None) -> Dict[str, List[str]]:
+        """
+        Ordner (relativ, "" = Root) -> sortierte Notizen *außerhalb* des Ordners, die auf
+        eine Datei direkt in diesem Ordner verweisen.
+        """
+        result: Dict[str, Set[str]] = {}
+        for source, target, _ in self.edges(index):
+            if target is None:
+                continue
+            target_dir = posixpath.dirname(target)
+            if posixpath.dirname(source) != target_dir:
+                result.setdefault(target_dir, set()).add(source)
+        return {d: sorted(s, key=str.lower) for d, s in result.items()}
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ObisPipeline – Umbenennen → Frontmatter → Index in *einem* Durchlauf.
+
+Statt ObisRenamer.py, ObisDatabase.py und P25ObisLinks.py nacheinander laufen zu lassen
+(drei Traversierungen, dreimal stat, dieselben Notizen mehrfach gelesen), wird der Vault
+hier einmal per scandir gelesen. Je Ordner:
+
+1) Renamer-Plan (levelN-Pattern der Tiefe) anwenden; das Listing im Speicher wird
+   nachgeführt, nicht neu gelesen.
+2) Frontmatter aller .md des Ordners setzen – bereits unter dem neuen Namen, d. h.
+   %data% ist der neue Dateiname.
+3) Index des Ordners aus demselben Listing erzeugen (P25ObisLinks.process_dir).
+
+Jedes Tool behält seine eigenen Regeln (Excludes, Selektion, Dot-Items); abgestiegen
+wird in jeden Ordner, den mindestens eines der Tools besuchen würde. Da alle drei Stufen
+nur innerhalb des aktuellen Ordners schreiben, ist das Ergebnis dasselbe wie bei drei
+getrennten Läufen. Das Listing liest ein eigener Thread, der der Verarbeitung
+höchstens QUEUE_DIRS Ordner vorausläuft (Speicher ~ größter Ordner). Mit
+RECURSIVE_STATS/MOC_FILENAME werden die Ordner wie in P25ObisLinks bottom-up
+(tiefste zuerst) verarbeitet – dafür wird der ganze Baum gelesen.
+
+Nicht unterstützt: BACKLINKS (braucht den umbenannten Stand des *ganzen* Vaults) –
+dafür P25ObisLinks.py --backlinks separat ausführen.
+
+Pipeline(..., fs=...) arbeitet auf einem anderen Dateisystem-Backend
+(P25ObisCore/fsbackend.py, z. B. MemoryFileSystem); es gilt während des Laufs für
+alle drei Tools.
+
+--dry-run: alle Stufen laufen wirklich, aber auf einem OverlayFileSystem über dem Vault
+(Copy-on-Write im Speicher). Frontmatter und Index sehen daher bereits die umbenannten
+Dateien, die Platte wird nur gelesen. Am Ende steht die Differenz Overlay ↔ Vault
+(neu/geändert/umbenannt/gelöscht, mit --diff als Unified Diff).
+"""
+
+import argparse
+import fnmatch
+import os
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# Geschwister-Module (eigene Ordner, keine Pakete) importierbar machen
+_BASE = Path(__file__).resolve().parent.parent
+for _sub in ("P25ObisRenamer", "P25ObisDatabase", "P25ObisLinks"):
+    if str(_BASE / _sub) not in sys.path:
+        sys.path.insert(0, str(_BASE / _sub))
+
+import ObisDatabase as database  # noqa: E402
+import ObisRenamer as renamer  # noqa: E402
+import P25ObisLinks as links  # noqa: E402
+from fsbackend import FileSystem, OverlayFileSystem  # noqa: E402  (P25ObisCore, von den Tools in den Pfad gelegt)
+from loaders import load_bounded  # noqa: E402
+from safewrite import is_scratch  # noqa: E402
+
+
+@dataclass
+class DirListing:
+    """Ein Ordner aus *einem* scandir-Durchlauf, gemeinsam genutzt von allen drei Stufen."""
+    path: Path
+    depth: int
+    dirs: List[Tuple[str, bool]] = field(default_factory=list)  # (Name, Symlink?)
+    files: List[str] = field(default_factory=list)  # alle Nicht-Ordner (wie os.walk)
+    regular: Set[str] = field(default_factory=set)  # davon reguläre Dateien
+    sigs: Dict[str, Tuple[int, int]] = field(default_factory=dict)  # (mtime_ns, size)
+    rename: bool = False  # vom Renamer besucht
+    frontmatter: bool = False  # nicht durch ObisDatabase-Excludes ausgeschlossen
+    index: bool = False  # von P25ObisLinks traversiert
+
+    def apply_renames(self, renames: List[Tuple[Path, Path]]) -> None:
+        mapping = {src.name: dst.name for src, dst in renames}
+        self.files = [mapping.get(n, n) for n in self.files]
+        self.regular = {mapping.get(n, n) for n in self.regular}
+        self.sigs = {mapping.get(n, n): sig for n, sig in self.sigs.items()}
+
+
+@dataclass
+class PipelineStats:
+    renamed: int = 0
+    notes: int = 0
+    frontmatter: int = 0
+    conflicts: int = 0  # Notizen, die wegen gleichzeitiger Änderung übersprungen wurden
+    index: links.RunStats = field(default_factory=links.RunStats)
+
+    def summary(self) -> str:
+        skipped = f", übersprungen (gleichzeitig geändert): {self.conflicts}" if self.conflicts else ""
+        return (f"Umbenannt: {self.renamed}, Frontmatter geändert: {self.frontmatter} von "
+                f"{self.notes} Notizen{skipped}; {self.index.summary()}")
+
+
+def scan(fs: FileSystem, path: Path, depth: int, with_stat: bool) -> DirListing:
+    listing = DirListing(path=path, depth=depth)
+    for entry in fs.scandir(path):
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            listing.dirs.append((entry.name, entry.is_symlink()))
+            continue
+        listing.files.append(entry.name)
+        try:
+            if entry.is_file():
+                listing.regular.add(entry.name)
+                if with_stat:
+                    st = entry.stat()
+                    listing.sigs[entry.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            continue
+    return listing
+
+
+def _db_excluded(name: str, patterns) -> bool:
+    return any(fnmatch.fnmatch(name, pat) for pat in patterns)
+
+
+def iter_listings(fs: FileSystem, root: Path, rename_excluded: set, db_patterns, link_excluded: set,
+                  with_stat: bool) -> Iterator[DirListing]:
+    """
+    Pre-Order (Unterordner sortiert wie P25ObisLinks). Jeder Ordner trägt, welches Tool ihn
+    besucht; abgestiegen wird, solange mindestens eines zuständig ist (nie in Symlinks).
+    """
+    hidden = links.SETTINGS["IGNORE_DOT_ITEMS"]
+    skip = set(links.tool_files())
+    db_root = not any(_db_excluded(d.name, db_patterns) for d in (root, *root.parents))
+    stack = [(root, 0, True, db_root, True)]
+    while stack:
+        path, depth, ren, db, idx = stack.pop()
+        try:
+            listing = scan(fs, path, depth, with_stat and idx)
+        except OSError:
+            continue  # unlesbar -> wie os.walk überspringen
+        listing.rename, listing.frontmatter, listing.index = ren, db, idx
+        yield listing
+        children = []
+        for name, is_link in sorted(listing.dirs, key=lambda d: d[0].lower()):
+            if is_link:
+                continue
+            c_ren = ren and not renamer.should_skip_dir(name, rename_excluded)
+            c_db = db and not _db_excluded(name, db_patterns)
+            c_idx = (idx and not (hidden and name.startswith("."))
+                     and name not in link_excluded and name not in skip)
+            if c_ren or c_db or c_idx:
+                children.append((path / name, depth + 1, c_ren, c_db, c_idx))
+        stack.extend(reversed(children))
+
+
+def to_snapshot(listing: DirListing, excluded: set) -> links.DirSnapshot:
+    """DirSnapshot wie P25ObisLinks.scan_dir, aber aus dem (nachgeführten) Listing."""
+    hidden = links.SETTINGS["IGNORE_DOT_ITEMS"]
+    skip = set(links.tool_files())
+    snap = links.DirSnapshot(path=listing.path, depth=listing.depth)
+    for name, is_link in listing.dirs:
+        if (hidden and name.startswith(".")) or name in skip or name in excluded:
+            continue
+        snap.subs.append(listing.path / name)
+        if not is_link:
+            snap.walk_subs.append(listing.path / name)
+    for name in listing.files:
+        if ((hidden and name.startswith(".")) or name in skip or is_scratch(name)
+                or name not in listing.regular):
+            continue
+        if os.path.splitext(name)[1].lower() == ".md":
+            snap.mds.append(listing.path / name)
+        else:
+            snap.files.append(listing.path / name)
+        if name in listing.sigs:
+            snap.sigs[name] = listing.sigs[name]
+    for lst in (snap.subs, snap.mds, snap.files, snap.walk_subs):
+        lst.sort(key=lambda p: p.name.lower())
+    return snap
+
+
+class Pipeline:
+    def __init__(self, root: Path, renamer_cfg: "renamer.Config", dry_run: bool = False,
+                 incremental: bool = False, fs: Optional[FileSystem] = None):
+        self.root = root
+        self.renamer_cfg = renamer_cfg
+        self.dry_run = dry_run
+        # Trockenlauf: echte Stufen, aber geschrieben wird nur in ein Overlay über dem Vault
+        base = fs if fs is not None else links.FS
+        self.overlay: Optional[OverlayFileSystem] = OverlayFileSystem(base) if dry_run else None
+        self.fs = self.overlay if self.overlay is not None else base
+        with self.backend():
+            db_config = database.load_config(root)
+            self.state = links.LinkState.load(root) if incremental else None
+            self.headers = links.HeaderCache.load(root) if links.uses_headers() else None
+        self.db_settings, self.template = db_config.settings, db_config.template
+        self.excluded = set(links.SETTINGS["EXCLUDE_FOLDERS"])
+        self.tree: Optional[Dict[Path, links.TreeStats]] = (
+            {} if links.SETTINGS["RECURSIVE_STATS"] else None)
+        self.stats = PipelineStats()
+
+    @contextmanager
+    def backend(self) -> Iterator[None]:
+        """self.fs als Dateisystem aller drei Tools (danach wieder das vorherige)."""
+        saved = renamer.FS, database.FS, links.FS
+        renamer.FS = database.FS = links.FS = self.fs
+        try:
+            yield
+        finally:
+            renamer.FS, database.FS, links.FS = saved
+
+    def rename(self, listing: DirListing) -> None:
+        pattern = self.renamer_cfg.patterns.get(listing.depth, "").strip()
+        if not listing.rename or not pattern:
+            return
+        plan = renamer.plan_dir(self.root, listing.path, listing.files, pattern, self.renamer_cfg)
+        if not plan:
+            return
+        self.stats.renamed += len(plan)
+        for src, dst in plan:
+            tag = "[DRY][RENAME]" if self.dry_run else "[RENAME]"
+            print(f"{tag} {src.relative_to(self.root)}  ->  {dst.name}")
+        renamer.two_phase_rename(plan)
+        listing.apply_renames(plan)
+
+    def frontmatter(self, listing: DirListing) -> None:
+        if not listing.frontmatter or not database.dir_selected(listing.path, self.db_settings):
+            return
+        # wie rglob("*.md") in ObisDatabase: Endung case-sensitiv, auch versteckte Dateien
+        for name in sorted(n for n in listing.regular if n.endswith(".md") and not is_scratch(n)):
+            md = listing.path / name
+            self.stats.notes += 1
+            try:
+                changed = database.process_md(md, self.template, exec_base=self.root,
+                                              settings=self.db_settings, dry_run=False)
+            except database.WriteConflict as e:
+                self.stats.conflicts += 1
+                print(f"[KONFLIKT] {e.reason}: {md}")
+                continue
+            if not changed:
+                continue
+            self.stats.frontmatter += 1
+            print(f"{'[DRY][FM] würde aktualisieren' if self.dry_run else '[FM]   aktualisiert'}: {md}")
+            if name in listing.sigs:
+                st = self.fs.stat(md)
+                listing.sigs[name] = (st.st_mtime_ns, st.st_size)
+
+    def index(self, snap: links.DirSnapshot) -> None:
+        if links.is_skipped_dir(snap.path, self.excluded):
+            return  # Start-Root selbst ausgeschlossen/versteckt -> nur abgestiegen
+        links.process_dir(snap.path, self.excluded, snapshot=snap, stats=self.stats.index,
+                          state=self.state, log=self.log_action, tree=self.tree, headers=self.headers)
+
+    def log_action(self, action: object) -> None:
+        if isinstance(action, links.FileAction):
+            action.dry_run = self.dry_run  # im Trockenlauf nur ins Overlay geschrieben
+        print(action)
+
+    def process(self, listing: DirListing) -> Optional[links.DirSnapshot]:
+        self.rename(listing)
+        self.frontmatter(listing)
+        if not listing.index:
+            return None
+        snap = to_snapshot(listing, self.excluded)
+        self.index(snap)
+        return snap
+
+    def run(self) -> PipelineStats:
+        with self.backend():
+            return self._run()
+
+    def _run(self) -> PipelineStats:
+        links.reset_autogen_cache()
+        if links.SETTINGS["BACKLINKS"]:
+            print("[HINWEIS] BACKLINKS wird in der Pipeline nicht erzeugt – "
+                  "danach P25ObisLinks.py --backlinks ausführen.")
+        with_stat = bool(links.SETTINGS["RECURSIVE_STATS"]) or links.uses_headers()
+        listings = iter_listings(
+            self.fs, self.root, set(self.renamer_cfg.exclude_folders),
+            self.db_settings.exclude_folders, self.excluded, with_stat)
+
+        if links.SETTINGS["RECURSIVE_STATS"] or links.SETTINGS["MOC_FILENAME"]:
+            # Bottom-up: tiefste Ordner zuerst, innerhalb einer Tiefe in Pre-Order
+            ordered = list(listings)
+            by_depth: Dict[int, List[DirListing]] = {}
+            for listing in ordered:
+                by_depth.setdefault(listing.depth, []).append(listing)
+            snaps: Dict[Path, links.DirSnapshot] = {}
+            for depth in sorted(by_depth, reverse=True):
+                for listing in by_depth[depth]:
+                    snap = self.process(listing)
+                    if snap is not None:
+                        snaps[listing.path] = snap
+            if links.SETTINGS["MOC_FILENAME"]:
+                pre_order = [snaps[l.path] for l in ordered if l.path in snaps]
+                links.write_moc(self.root, pre_order, self.tree or {}, self.excluded,
+                                False, self.stats.index, self.log_action)
+        else:
+            # Ordnerweise: der Durchlauf läuft höchstens QUEUE_DIRS Ordner voraus
+            for listing in load_bounded()(listings, links.SETTINGS["QUEUE_DIRS"]):
+                self.process(listing)
+
+        if self.state is not None:
+            self.state.save()
+        if self.headers is not None:
+            self.headers.save()
+        return self.stats
+
+
+PREVIEW_MARKS = {"created": "A", "modified": "M", "deleted": "D", "renamed": "R"}
+
+
+def print_preview(overlay: OverlayFileSystem, root: Path, with_diff: bool = False) -> None:
+    """Differenz des Trockenlauf-Overlays zum Vault (wie `git status`, optional mit Diffs)."""
+    changes = overlay.changes()
+    counts = {kind: sum(1 for c in changes if c.kind == kind) for kind in PREVIEW_MARKS}
+    print(f"\n[VORSCHAU] Änderungen gegenüber dem Vault (nichts geschrieben): "
+          f"{counts['created']} neu, {counts['modified']} geändert, "
+          f"{counts['renamed']} umbenannt, {counts['deleted']} gelöscht")
+    for change in changes:
+        rel = os.path.relpath(change.path, root)
+        if change.kind == "renamed":
+            edited = " (+ Inhalt geändert)" if change.changed else ""
+            print(f"  R  {os.path.relpath(change.old_path, root)} -> {rel}{edited}")
+        else:
+            print(f"  {PREVIEW_MARKS[change.kind]}  {rel}")
+        if with_diff and change.changed:
+            print(overlay.diff(change, root), end="")
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Umbenennen (ObisRenamer) → Frontmatter (ObisDatabase) → Index (P25ObisLinks) "
+                    "in einem einzigen Durchlauf über den Vault."
+    )
+    parser.add_argument("root", nargs="?", default=Path("."), type=Path,
+                        help="Startordner (Default: aktuelles Verzeichnis '.'); ObisDatabase.ini o. ä. liegt hier.")
+    parser.add_argument("--config", type=Path, default=Path("ObisRenamer.ini"),
+                        help="INI des Renamers (Standard: ObisRenamer.ini)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Nichts schreiben: alle Stufen laufen verkettet in einem Overlay im Speicher, "
+                             "am Ende die Änderungsliste.")
+    parser.add_argument("--diff", action="store_true",
+                        help="Mit --dry-run: zu jeder geänderten Datei den Unified Diff zeigen.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Index nur für Ordner mit geändertem Listing neu erzeugen (wie P25ObisLinks).")
+    links.add_layout_args(parser)
+    args = parser.parse_args(argv)
+    if args.diff and not args.dry_run:
+        parser.error("--diff geht nur zusammen mit --dry-run")
+
+    root = args.root.resolve()
+    if not root.exists() or not root.is_dir():
+        print(f"Root nicht gefunden: {root}", file=sys.stderr)
+        return 2
+    links.apply_layout_args(args)
+
+    try:
+        pipeline = Pipeline(root, renamer.load_config(args.config.resolve()), dry_run=args.dry_run,
+                            incremental=args.incremental)
+    except (renamer.ConfigError, database.DatabaseError) as e:
+        print(e, file=sys.stderr)
+        return 2
+    try:
+        stats = pipeline.run()
+    except (renamer.ConfigError, database.DatabaseError, links.LinksError) as e:
+        print(e, file=sys.stderr)
+        return 2
+    except (renamer.RenamerError, OSError) as e:  # z. B. RenameConflictError
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 1
+    if pipeline.overlay is not None:
+        print_preview(pipeline.overlay, root, with_diff=args.diff)
+    prefix = "Trockenlauf abgeschlossen." if args.dry_run else "Fertig."
+    print(f"\n{prefix} {stats.summary()}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,16 @@ Platzhalter-/Ebenen-Rendering via placeholders.py (expand()).
 - Platzhalter: %rootN%, %rootN()%, %rootNB%, %root%, %root()%, %folder..., %N%, %date%, %datum%, %wert%.
 - Nummerierung pro Ordner + Dateiendung (01, 02, …), Breite konfigurierbar.
 - Excludes: Ordner (rekursiv), Dateiendungen, exakte Basenames.
+- --changed-since REV: nur Ordner neu nummerieren, deren Dateibestand sich seit REV
+  geändert hat (Git, lokal; bei %date%/%datum%-Ebenen auch Ordner mit geänderten Dateien).
+- Ordnerweise Pipeline Durchlauf → Plan → Umbenennen mit begrenzten Queues dazwischen
+  (P25ObisCore/stages.py): Speicherbedarf ~ größter Ordner, nicht Größe des Vaults.
+
+Als Bibliothek: run(root, Config(...)) gibt ein RunResult zurück (je Datei alter/neuer
+Pfad) und gibt nichts aus; Fehler kommen als RenamerError (ConfigError, ChangesError,
+RenameConflictError) bzw. OSError. main() ist nur die CLI-Hülle.
+Dateizugriffe laufen über das Backend FS (P25ObisCore/fsbackend.py); run(..., fs=...)
+tauscht es für einen Lauf, z. B. gegen MemoryFileSystem oder LatencyFileSystem.
 """
 
 from __future__ import annotations
@@ -16,12 +26,68 @@ import configparser
 import os
 import re
 import sys
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import placeholders  # erwartet placeholders.py im Suchpfad (gleicher Ordner oder PYTHONPATH)
 
 
+def _use_core() -> None:
+    """P25ObisCore (gemeinsame Module) in den Suchpfad."""
+    core = str(Path(__file__).resolve().parent.parent / "P25ObisCore")
+    if core not in sys.path:
+        sys.path.insert(0, core)
+
+
+_use_core()
+from fsbackend import OS, FileSystem  # noqa: E402
+from loaders import load_bounded, load_changes  # noqa: E402
+from safewrite import is_scratch  # noqa: E402
+
+# Dateisystem-Backend aller Zugriffe (run(..., fs=...) setzt es für die Dauer eines Laufs)
+FS: FileSystem = OS
+
+# Ordner je Queue zwischen Durchlauf, Plan und Umbenennen (0 = alles im Haupt-Thread)
+QUEUE_DIRS = 8
+
+
+# ------------------------- Fehler -------------------------
+
+class RenamerError(Exception):
+    """Basis aller Fehler von ObisRenamer."""
+
+class ConfigError(RenamerError):
+    """INI fehlt/ist ungültig oder Root nicht gefunden."""
+
+class ChangesError(RenamerError):
+    """Änderungen seit einer Git-Revision nicht ermittelbar (--changed-since)."""
+
+class RenameConflictError(RenamerError):
+    """Ziel- oder temporärer Name existiert bereits; der Ordner ist evtl. nur teilweise umbenannt."""
+
+
+# ------------------------- Konfiguration -------------------------
+
+@dataclass
+class Config:
+    """Inhalt der Renamer-INI; patterns: Tiefe (1 = erste Ebene unter Root) -> Pattern."""
+    patterns: Dict[int, str] = field(default_factory=dict)
+    numbering_width: int = 2
+    use_birthtime: bool = False
+    dry_run_note_limit: int = 2000  # nur CLI: Zeilen im Trockenlauf
+    exclude_folders: List[str] = field(default_factory=list)
+    exclude_filetypes: List[str] = field(default_factory=list)
+    exclude_filenames: List[str] = field(default_factory=list)
+    path: Optional[Path] = None  # Herkunft (None = im Code erzeugt)
+
+    def __post_init__(self) -> None:
+        # Dateiendungen wie in der INI tolerant: "pdf", ".PDF" -> ".pdf"
+        self.exclude_filetypes = [s.lower() if s.startswith(".") else f".{s.lower()}"
+                                  for s in self.exclude_filetypes]
+
+
 # ------------------------- Hilfsfunktionen -------------------------
 
 def normalize_list(v: str) -> List[str]:
@@ -35,10 +101,14 @@ def normalize_list(v: str) -> List[str]:
                 items.append(s)
     return items
 
-def load_config(path: Path) -> dict:
+def load_config(path: Path) -> Config:
+    if not FS.is_file(path):
+        raise ConfigError(f"INI nicht gefunden: {path}")
     cp = configparser.ConfigParser(interpolation=None, strict=False)
-    with path.open("r", encoding="utf-8") as f:
-        cp.read_file(f)
+    try:
+        cp.read_string(FS.read_text(path, encoding="utf-8"), source=str(path))
+    except configparser.Error as e:
+        raise ConfigError(f"{path.name} ist keine gültige INI: {e}") from e
 
     # Patterns aus INI laden
     patterns: Dict[int, str] = {}
@@ -79,15 +149,21 @@ def load_config(path: Path) -> dict:
             "filetypes",
             fallback=cp.get("excludes", "exclude_datatyp", fallback="")
         )
-        excludes["filetypes"] = [
-            s.lower() if s.startswith(".") else f".{s.lower()}"
-            for s in normalize_list(raw_ft)
-        ]
+        excludes["filetypes"] = normalize_list(raw_ft)
         excludes["filenames"] = normalize_list(
             cp.get("excludes", "filenames", fallback=cp.get("excludes", "exclude_data", fallback=""))
         )
 
-    return {"patterns": patterns, "options": opt, "excludes": excludes}
+    return Config(
+        patterns=patterns,
+        numbering_width=opt["numbering_width"],
+        use_birthtime=opt["use_birthtime"],
+        dry_run_note_limit=opt["dry_run_note_limit"],
+        exclude_folders=excludes["folders"],
+        exclude_filetypes=excludes["filetypes"],
+        exclude_filenames=excludes["filenames"],
+        path=path,
+    )
 
 def rel_parts(root: Path, p: Path) -> List[str]:
     rel = p.relative_to(root)
@@ -115,14 +191,14 @@ def two_phase_rename(renames: List[Tuple[Path, Path]]) -> None:
         if src == dst:
             continue
         tmp = src.with_name(f"__obis_tmp__{src.name}__{os.getpid()}__")
-        if tmp.exists():
-            raise RuntimeError(f"Temporärer Name existiert bereits: {tmp}")
-        src.rename(tmp)
+        if FS.exists(tmp):
+            raise RenameConflictError(f"Temporärer Name existiert bereits: {tmp}")
+        FS.rename(src, tmp)
         tmps.append((tmp, dst))
     for tmp, dst in tmps:
-        if dst.exists():
-            raise FileExistsError(f"Ziel existiert bereits: {dst}")
-        tmp.rename(dst)
+        if FS.exists(dst):
+            raise RenameConflictError(f"Ziel existiert bereits: {dst}")
+        FS.rename(tmp, dst)
 
 
 # ------------------------- Hauptlogik -------------------------
@@ -130,127 +206,260 @@ def two_phase_rename(renames: List[Tuple[Path, Path]]) -> None:
 def should_skip_dir(dir_name: str, exclude_dirs: List[str]) -> bool:
     return dir_name in exclude_dirs
 
-def run(root: Path, cfg: dict, dry_run: bool) -> int:
-    patterns: Dict[int, str] = cfg["patterns"]
-    opts = cfg["options"]
-    excl = cfg["excludes"]
-
-    numbering_width = int(opts.get("numbering_width", 2))
-
-    exclude_dirs = set(excl.get("folders", []))
-    exclude_exts = set(excl.get("filetypes", []))          # .ext in lower()
-    base_exclude_names = set(excl.get("filenames", []))
-
-    total_renamed = 0
-    printed = 0
-    note_limit = int(opts.get("dry_run_note_limit", 2000))
-
-    for curr_dir, dirs, files in os.walk(root, topdown=True):
-        # Ordner-Ausschlüsse
-        dirs[:] = [d for d in dirs if not should_skip_dir(d, list(exclude_dirs))]
-
-        curr = Path(curr_dir)
-        depth = len(rel_parts(root, curr))
-        pattern = patterns.get(depth, "").strip()
-        if not pattern:
-            continue  # Ebene ignorieren
-
-        # Dateien filtern
-        entries: List[str] = []
-        for name in files:
-            if name in base_exclude_names:
-                continue
-            ext = Path(name).suffix.lower()
-            if ext in exclude_exts:
-                continue
-            entries.append(name)
-
-        if not entries:
+def changed_dirs(cfg: Config, change) -> List[Path]:
+    """
+    Ordner, die neu nummeriert werden müssen: geänderter Dateibestand; auf Ebenen mit
+    Datums-Platzhalter zusätzlich Ordner mit geänderten Dateien (mtime fließt in den Namen).
+    """
+    rels = change.membership_dirs()
+    date_levels = {lvl for lvl, pat in cfg.patterns.items()
+                   if re.search(r"%(date|datum)%", pat, flags=re.IGNORECASE)}
+    if date_levels:
+        rels |= {d for d in change.parent_dirs()
+                 if (d.count("/") + 1 if d else 0) in date_levels}
+    return change.paths(rels)
+
+def _listed_dirs(root: Path, only_dirs: Iterable[Path],
+                 exclude_dirs: set) -> Iterator[Tuple[str, List[str], List[str]]]:
+    """Wie os.walk, aber nur für die angegebenen Ordner (ohne Abstieg)."""
+    for d in sorted(only_dirs):
+        if any(should_skip_dir(part, list(exclude_dirs)) for part in rel_parts(root, d)):
+            continue
+        try:
+            files = [e.name for e in FS.scandir(d) if not e.is_dir()]
+        except OSError:
+            continue  # Ordner existiert nicht mehr
+        yield str(d), [], files
+
+def plan_dir(root: Path, curr: Path, files: List[str], pattern: str, cfg: Config) -> List[Tuple[Path, Path]]:
+    """
+    Umbenennungsplan für genau einen Ordner: [(alt, neu)] nur für Dateien, deren Name
+    sich ändert. files = Dateinamen des Ordners (wie os.walk sie liefert).
+    """
+    numbering_width = cfg.numbering_width
+    exclude_exts = set(cfg.exclude_filetypes)          # .ext in lower()
+    base_exclude_names = set(cfg.exclude_filenames)
+
+    # Dateien filtern (Sperr-/Temp-Dateien laufender Schreibvorgänge nie anfassen)
+    entries: List[str] = []
+    for name in files:
+        if name in base_exclude_names or is_scratch(name):
+            continue
+        ext = Path(name).suffix.lower()
+        if ext in exclude_exts:
             continue
+        entries.append(name)
 
-        # Gruppierung nach Erweiterung
-        by_ext: Dict[str, List[str]] = {}
-        for name in entries:
-            by_ext.setdefault(Path(name).suffix.lower(), []).append(name)
-        for ext in by_ext:
-            by_ext[ext].sort(key=natural_key)
-
-        existing_now = set(entries) | base_exclude_names
-        renames: List[Tuple[Path, Path]] = []
-        reserved_targets: set = set()
-
-        for ext, names in by_ext.items():
-            counter = 1
-            for old_name in names:
-                src = curr / old_name
-
-                # Präfix via placeholders.expand() – mit ()-Logik, %N%, %rootN% etc.
-                ctx = placeholders.Context(start_root=root, file_path=src)
-                prefix = placeholders.expand(pattern, ctx)
-
-                # Separator-Logik
-                sep = ""
-                if prefix and not re.search(r"[-_. ]$", prefix):
-                    sep = "-"
-
-                target_basename = f"{prefix}{sep}{counter:0{numbering_width}d}{ext}"
-                target_basename = ensure_unique(target_basename, reserved_targets, existing_now)
-                dst = curr / target_basename
-                if src.name != dst.name:
-                    renames.append((src, dst))
-                counter += 1
+    if not entries:
+        return []
 
+    # Gruppierung nach Erweiterung
+    by_ext: Dict[str, List[str]] = {}
+    for name in entries:
+        by_ext.setdefault(Path(name).suffix.lower(), []).append(name)
+    for ext in by_ext:
+        by_ext[ext].sort(key=natural_key)
+
+    existing_now = set(entries) | base_exclude_names
+    renames: List[Tuple[Path, Path]] = []
+    reserved_targets: set = set()
+
+    for ext, names in by_ext.items():
+        counter = 1
+        for old_name in names:
+            src = curr / old_name
+
+            # Präfix via placeholders.expand() – mit ()-Logik, %N%, %rootN% etc.
+            ctx = placeholders.Context(start_root=root, file_path=src, stat=FS.stat)
+            prefix = placeholders.expand(pattern, ctx)
+
+            # Separator-Logik
+            sep = ""
+            if prefix and not re.search(r"[-_. ]$", prefix):
+                sep = "-"
+
+            target_basename = f"{prefix}{sep}{counter:0{numbering_width}d}{ext}"
+            target_basename = ensure_unique(target_basename, reserved_targets, existing_now)
+            dst = curr / target_basename
+            if src.name != dst.name:
+                renames.append((src, dst))
+            counter += 1
+    return renames
+
+@dataclass
+class FileResult:
+    old_path: Path
+    path: Path  # neuer Pfad (im Trockenlauf: geplanter)
+    dry_run: bool = False
+    action: str = "renamed"
+    changed: bool = True
+
+    def __str__(self) -> str:
+        return f"{'[DRY]' if self.dry_run else '[RENAME]'} {self.old_path}  ->  {self.path.name}"
+
+@dataclass
+class RunResult:
+    root: Path
+    dry_run: bool = False
+    files: List[FileResult] = field(default_factory=list)  # nur Dateien, deren Name sich ändert (keep_files)
+    notes: List[str] = field(default_factory=list)  # Hinweise (z. B. zu --changed-since)
+    dirs: int = 0  # Ordner mit Pattern (geplant)
+    renamed: int = 0  # Dateien, deren Name sich ändert (zählt auch ohne keep_files)
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        return "Trockenlauf abgeschlossen." if self.dry_run else f"Fertig. Umbenannte Dateien: {self.renamed}"
+
+def changed_plan_dirs(root: Path, cfg: Config, rev: str) -> Optional[List[Path]]:
+    """Ordner mit Änderungen seit rev; None, wenn sich die INI selbst (im Vault) geändert hat."""
+    try:
+        change = load_changes(root, rev)
+    except RuntimeError as e:
+        raise ChangesError(str(e)) from e
+    ini_path = FS.resolve(cfg.path) if cfg.path is not None else None
+    if ini_path is not None and root in ini_path.parents and change.touches(ini_path.relative_to(root).as_posix()):
+        return None
+    return changed_dirs(cfg, change)
+
+def run(root: Path, cfg: Config, *, dry_run: bool = False, only_dirs: Optional[Iterable[Path]] = None,
+        changed_since: Optional[str] = None, log: Optional[Callable[[Any], None]] = None,
+        keep_files: bool = True, queue_dirs: int = QUEUE_DIRS,
+        fs: Optional[FileSystem] = None) -> RunResult:
+    """
+    Benennt rekursiv ab root um (Trockenlauf: nur planen).
+    only_dirs: nur diese Ordner bearbeiten (ohne Abstieg); changed_since: nur Ordner mit
+    Änderungen seit der Git-Revision (ersetzt only_dirs).
+    log: erhält jedes FileResult und jeden Hinweis (str) sofort, z. B. print.
+
+    Ordnerweise Pipeline: Durchlauf → Plan → Umbenennen, je Stufe ein Ordner, dazwischen
+    Queues mit queue_dirs Plätzen. keep_files=False sammelt keine FileResults (nur Zähler,
+    log bekommt sie trotzdem) – der Speicherbedarf hängt dann nur vom größten Ordner ab.
+
+    fs: Dateisystem-Backend für diesen Lauf (Standard: FS). FS ist modulweit – parallele
+    Läufe mit verschiedenen Backends im selben Prozess sind nicht vorgesehen.
+    """
+    global FS
+    saved = FS
+    FS = fs if fs is not None else FS
+    try:
+        root = FS.resolve(Path(root))  # absolut wie die Pfade aus gitchanges
+        return _run(root, cfg, dry_run=dry_run, only_dirs=only_dirs, changed_since=changed_since,
+                    log=log, keep_files=keep_files, queue_dirs=queue_dirs)
+    finally:
+        FS = saved
+
+def _run(root: Path, cfg: Config, *, dry_run: bool, only_dirs: Optional[Iterable[Path]],
+         changed_since: Optional[str], log: Optional[Callable[[Any], None]],
+         keep_files: bool, queue_dirs: int) -> RunResult:
+    t0 = time.perf_counter()
+    if not FS.is_dir(root):
+        raise ConfigError(f"Root nicht gefunden: {root}")
+    result = RunResult(root=root, dry_run=dry_run)
+
+    def note(text: str) -> None:
+        result.notes.append(text)
+        if log is not None:
+            log(text)
+
+    if changed_since:
+        only_dirs = changed_plan_dirs(root, cfg, changed_since)
+        if only_dirs is None:
+            note(f"INI geändert seit {changed_since} – vollständiger Lauf.")
+        else:
+            note(f"Geänderte Ordner seit {changed_since}: {len(only_dirs)}")
+
+    patterns = cfg.patterns
+    exclude_dirs = set(cfg.exclude_folders)
+
+    def walked() -> Iterator[Tuple[Path, str, List[str]]]:
+        # Stufe 1: (Ordner, Pattern, Dateinamen) je Ordner mit Pattern
+        walk = FS.walk(root) if only_dirs is None else _listed_dirs(root, only_dirs, exclude_dirs)
+        for curr_dir, dirs, files in walk:
+            # Ordner-Ausschlüsse
+            dirs[:] = [d for d in dirs if not should_skip_dir(d, list(exclude_dirs))]
+
+            curr = Path(curr_dir)
+            depth = len(rel_parts(root, curr))
+            pattern = patterns.get(depth, "").strip()
+            if pattern:  # sonst Ebene ignorieren
+                yield curr, pattern, files
+
+    def planned(listed: Iterable[Tuple[Path, str, List[str]]]) -> Iterator[List[Tuple[Path, Path]]]:
+        # Stufe 2: Umbenennungsplan je Ordner
+        for curr, pattern, files in listed:
+            yield plan_dir(root, curr, files, pattern, cfg)
+
+    bounded = load_bounded()
+    plans = planned(bounded(walked(), queue_dirs))
+    # Stufe 3 (Haupt-Thread): umbenennen und berichten
+    for renames in bounded(plans, queue_dirs):
+        result.dirs += 1
         if not renames:
             continue
 
-        if dry_run:
-            for src, dst in renames:
-                line = f"[DRY] {src.relative_to(root)}  ->  {dst.name}"
-                print(line)
-                printed += 1
-                if printed >= note_limit:
-                    print("… (gekürzt)")
-                    break
-        else:
+        if not dry_run:
             two_phase_rename(renames)
-            total_renamed += len(renames)
+        for src, dst in renames:
+            file_result = FileResult(old_path=src, path=dst, dry_run=dry_run)
+            result.renamed += 1
+            if keep_files:
+                result.files.append(file_result)
+            if log is not None:
+                log(file_result)
 
-    if dry_run:
-        return 0
-    return total_renamed
+    result.seconds = time.perf_counter() - t0
+    return result
 
 
 # ------------------------- CLI -------------------------
 
-def main(argv: List[str]) -> int:
-    ap = argparse.ArgumentParser(description="ObisRenamer – Umbenennen nach INI-Vorlagen (placeholders.py)")
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    ap = argparse.ArgumentParser(prog=prog, description="ObisRenamer – Umbenennen nach INI-Vorlagen (placeholders.py)")
+    ap.add_argument("root_arg", nargs="?", type=Path, default=None, metavar="ROOT",
+                    help="Start-Root (wie --root; einheitlich mit den anderen Tools)")
     ap.add_argument("--root", type=Path, default=Path.cwd(), help="Start-Root (Standard: aktuelles Verzeichnis)")
     ap.add_argument("--config", type=Path, default=Path("ObisRenamer.ini"), help="INI-Datei (Standard: ObisRenamer.ini)")
-    ap.add_argument("--dry", action="store_true", help="Nur anzeigen, nichts umbenennen")
+    ap.add_argument("--dry", "--dry-run", dest="dry", action="store_true", help="Nur anzeigen, nichts umbenennen")
+    ap.add_argument("--changed-since", metavar="REV", default=None,
+                    help="Nur Ordner mit Änderungen seit Git-Revision REV bearbeiten (z. B. HEAD~1)")
     args = ap.parse_args(argv)
 
-    root = args.root.resolve()
-    if not root.exists():
-        print(f"Root nicht gefunden: {root}", file=sys.stderr)
+    root = (args.root_arg or args.root).resolve()
+    try:
+        cfg = load_config(args.config.resolve())
+    except ConfigError as e:
+        print(e, file=sys.stderr)
         return 2
 
-    ini_path = args.config.resolve()
-    if not ini_path.exists():
-        print(f"INI nicht gefunden: {ini_path}", file=sys.stderr)
-        return 2
+    shown = 0
+
+    def show(item: Any) -> None:
+        # Im Trockenlauf jede geplante Umbenennung (bis dry_run_note_limit), sonst nur Hinweise
+        nonlocal shown
+        if isinstance(item, str):
+            print(item)
+        elif args.dry:
+            if shown < cfg.dry_run_note_limit:
+                print(f"[DRY] {item.old_path.relative_to(root)}  ->  {item.path.name}")
+            elif shown == cfg.dry_run_note_limit:
+                print("… (gekürzt)")
+            shown += 1
 
-    cfg = load_config(ini_path)
     try:
-        changed = run(root, cfg, dry_run=args.dry)
-        if args.dry:
-            print("Trockenlauf abgeschlossen.")
-        else:
-            print(f"Fertig. Umbenannte Dateien: {changed}")
-        return 0
-    except Exception as e:
+        result = run(root, cfg, dry_run=args.dry, changed_since=args.changed_since, log=show,
+                     keep_files=False)
+    except ConfigError as e:
+        print(e, file=sys.stderr)
+        return 2
+    except ChangesError as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return 2
+    except (RenamerError, OSError) as e:
         print(f"Fehler: {e}", file=sys.stderr)
         return 1
+    print(result.summary())
+    return 0
 
 
 if __name__ == "__main__":
-    sys.exit(main(sys.argv[1:]))
+    sys.exit(main())
@@ -27,7 +27,7 @@ Unterstützte Platzhalter (case-insensitive):
 from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Any, Callable, List, Tuple, Optional
 import re
 import time
 import os
@@ -40,6 +40,7 @@ __all__ = ["Context", "expand"]
 class Context:
     start_root: Path   # Root/Anker
     file_path: Path    # konkrete Datei innerhalb eines Ordners (aktueller Ordner = file_path.parent)
+    stat: Optional[Callable[[Path], Any]] = None  # für %date%/%datum% (None = Path.stat; sonst z. B. fs.stat)
 
     @property
     def current_dir(self) -> Path:
@@ -99,7 +100,7 @@ def _replace_N_blocks(text: str, folder_name: str) -> str:
     return _RE_N_BLOCK.sub(repl, text)
 
 def _file_timestamp(ctx: Context) -> float:
-    st = ctx.file_path.stat()
+    st = ctx.stat(ctx.file_path) if ctx.stat is not None else ctx.file_path.stat()
     # birthtime wenn vorhanden, sonst mtime
     ts = getattr(st, "st_birthtime", None)
     if ts:
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+obis – gemeinsamer Einstieg für die Obis Tools.
+
+    python obis.py rename   [ROOT] [--config INI] [--dry-run] ...
+    python obis.py database [ROOT] [--dry-run] ...
+    python obis.py links    [ROOT] [--dry-run] [--incremental] ...
+    python obis.py pipeline [ROOT] [--config INI] [--dry-run] ...
+    python obis.py bench run --sizes 1k,10k
+
+Das Modul eines Unterbefehls wird erst beim Aufruf geladen; alle weiteren Argumente
+gehen unverändert an dessen main(). Alle Tools nehmen ROOT als erstes Argument und
+kennen --dry-run. Da die Tools als Module importiert werden (nicht als Skript
+ausgeführt), nutzt Python ihren Bytecode-Cache – bei häufigen Aufrufen (z. B. per
+Shell-Command bei jedem Speichern) spart das die Übersetzung bei jedem Start.
+"""
+
+import sys
+
+# Unterbefehl -> (Ordner, Modul, Kurzbeschreibung)
+COMMANDS = {
+    "rename": ("P25ObisRenamer", "ObisRenamer",
+               "Dateien nach levelN-Patterns umbenennen"),
+    "database": ("P25ObisDatabase", "ObisDatabase",
+                 "YAML-Frontmatter nach Vorlage setzen"),
+    "links": ("P25ObisLinks", "P25ObisLinks",
+              "Ordner-Indexe erzeugen/aktualisieren"),
+    "linkcheck": ("P25ObisLinks", "ObisLinkCheck",
+                  "defekte Links und verwaiste Anhänge melden"),
+    "dedupe": ("P25ObisLinks", "ObisDedupe",
+               "doppelte Anhänge finden"),
+    "pipeline": ("P25ObisPipeline", "ObisPipeline",
+                 "Umbenennen → Frontmatter → Index in einem Durchlauf"),
+    "bench": ("P25ObisBench", "ObisBench",
+              "Benchmarks auf synthetischen Vaults (run/compare/startup/memory/roundtrips)"),
+}
+
+
+def usage() -> str:
+    width = max(map(len, COMMANDS))
+    lines = ["usage: obis BEFEHL [ARGUMENTE ...]", "", "Obis Tools – Befehle:"]
+    lines += [f"  {name:<{width}}  {desc}" for name, (_, _, desc) in COMMANDS.items()]
+    lines += ["", "Hilfe zu einem Befehl: obis BEFEHL -h"]
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    # Bewusst ohne argparse: der Unterbefehl bringt seinen eigenen Parser mit, und
+    # obis selbst soll beim Start nichts laden, was das Tool nicht ohnehin braucht.
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"obis: unbekannter Befehl '{command}'\n\n{usage()}", file=sys.stderr)
+        return 2
+
+    import importlib
+    import os
+
+    folder, module, _ = COMMANDS[command]
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(module).main(args, prog=f"obis {command}") or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bibliotheks-Einstieg run() mit relativem Root und --changed-since: gitchanges liefert
+absolute Pfade, run() muss den Root daher selbst auflösen (nicht nur die CLI).
+
+    python -m unittest discover -s tests
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+_BASE = Path(__file__).resolve().parent.parent
+for _sub in ("P25ObisRenamer", "P25ObisDatabase", "P25ObisLinks"):
+    if str(_BASE / _sub) not in sys.path:
+        sys.path.insert(0, str(_BASE / _sub))
+
+import ObisDatabase as database  # noqa: E402
+import ObisRenamer as renamer  # noqa: E402
+import P25ObisLinks as links  # noqa: E402
+
+RENAMER_INI = """[patterns]
+level1 = %root1%
+
+[excludes]
+folders = .git
+filetypes = .md, .ini
+"""
+
+DATABASE_INI = """_settings:
+  exclude_folders:
+    - .git
+Ordner: "%folder1%"
+"""
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+@unittest.skipIf(shutil.which("git") is None, "git nicht installiert")
+class RelativeRootTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        vault = self.tmp / "gv"
+        (vault / "SE1").mkdir(parents=True)
+        (vault / "ObisRenamer.ini").write_text(RENAMER_INI, encoding="utf-8")
+        (vault / "ObisDatabase.ini").write_text(DATABASE_INI, encoding="utf-8")
+        (vault / "SE1" / "alt.md").write_text("alt\n", encoding="utf-8")
+        _git(vault, "init", "-q")
+        _git(vault, "add", "-A")
+        _git(vault, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "init")
+        # seit HEAD geändert: neue Notiz und neuer Anhang
+        (vault / "SE1" / "neu.md").write_text("neu\n", encoding="utf-8")
+        (vault / "SE1" / "bild.png").write_bytes(b"png")
+
+        cwd = os.getcwd()
+        os.chdir(self.tmp)
+        self.addCleanup(os.chdir, cwd)
+        self.root = Path("gv")  # relativ zum Arbeitsverzeichnis
+
+    def test_links(self) -> None:
+        result = links.run(self.root, changed_since="HEAD", dry_run=True)
+        self.assertTrue(result.root.is_absolute())
+        self.assertIn((self.tmp / "gv" / "SE1" / "SE1.md").resolve(),
+                      [a.path for a in result.actions])
+
+    def test_renamer(self) -> None:
+        cfg = renamer.load_config(self.root / "ObisRenamer.ini")
+        result = renamer.run(self.root, cfg, changed_since="HEAD", dry_run=True)
+        self.assertEqual(["SE1-01.png"], [r.path.name for r in result.files])
+
+    def test_database(self) -> None:
+        result = database.run(self.root, changed_since="HEAD", dry_run=True)
+        self.assertEqual(["neu.md"], [r.path.name for r in result.files])
+
+
+if __name__ == "__main__":
+    unittest.main()